@@ -1,10 +1,12 @@
 # backend/app.py
 
 import os
+import click
 from flask import Flask, send_from_directory, jsonify
 from flask_migrate import Migrate
 from backend.models import db
 from backend.routes import routes
+from backend.services import json_provider, metrics, structured_logging
 from backend.config import config, LINKEDIN_CLIENT_ID, LINKEDIN_CLIENT_SECRET
 import logging
 
@@ -15,14 +17,15 @@ def create_app(config_name=None):
     app = Flask(__name__, static_folder="../frontend/build", static_url_path="")
     app.logger.setLevel(logging.INFO)
 
-    app.logger.info(f"[App] Starting application with config: {config_name}")
+    app.logger.info("[App] Starting application with config: %s", config_name)
 
     config_obj = config.get(config_name)
     if config_obj is None:
-        app.logger.error(f"[App] Invalid config name: {config_name}")
+        app.logger.error("[App] Invalid config name: %s", config_name)
         raise ValueError(f"Invalid config name: {config_name}")
 
     app.config.from_object(config_obj)
+    structured_logging.init_app(app)
     app.logger.info("[App] Configuration loaded successfully.")
 
     # Enable exception propagation in test environment
@@ -39,13 +42,17 @@ def create_app(config_name=None):
     ]
     if missing_vars:
         app.logger.error(
-            f"[App] Missing required environment variables: {missing_vars}"
+            "[App] Missing required environment variables: %s", missing_vars
         )
         raise RuntimeError(f"Missing required environment variables: {missing_vars}")
 
     app.config['PROPAGATE_EXCEPTIONS'] = True
-    app.logger.info(f"[App] PROPAGATE_EXCEPTIONS is set to: {app.config['PROPAGATE_EXCEPTIONS']}")
+    app.logger.info(
+        "[App] PROPAGATE_EXCEPTIONS is set to: %s", app.config["PROPAGATE_EXCEPTIONS"]
+    )
 
+    json_provider.init_app(app)
+    metrics.init_app(app)
     app.register_blueprint(routes)
 
     db.init_app(app)
@@ -69,7 +76,7 @@ def create_app(config_name=None):
     # Add a global error handler to catch unhandled exceptions
     @app.errorhandler(Exception)
     def handle_exception(e):
-        app.logger.error(f"Unhandled exception: {e}", exc_info=True)
+        app.logger.error("Unhandled exception: %s", e, exc_info=True)
         return jsonify({"error": "Internal server error"}), 500
 
     # 🔽 CLI command
@@ -79,4 +86,28 @@ def create_app(config_name=None):
 
         seed_main_user(app)
 
+    @app.cli.command("run-worker")
+    @click.option("--concurrency", type=int, default=None, help="Worker threads.")
+    @click.option(
+        "--poll-interval", type=float, default=None, help="Idle poll interval (s)."
+    )
+    @click.option("--once", is_flag=True, help="Drain due jobs and exit.")
+    def run_worker_command(concurrency, poll_interval, once):
+        from backend.services.job_queue import run_worker
+
+        run_worker(
+            app,
+            concurrency=concurrency or app.config["WORKER_CONCURRENCY"],
+            poll_interval=poll_interval or app.config["WORKER_POLL_INTERVAL"],
+            once=once,
+        )
+
+    @app.cli.command("publish-digests")
+    @click.option("--batch-size", type=int, default=None, help="Users per batch.")
+    def publish_digests_command(batch_size):
+        from backend.services.digest_scheduler import publish_due_digests
+
+        posted = publish_due_digests(batch_size=batch_size)
+        click.echo(f"Published {posted} digest(s).")
+
     return app
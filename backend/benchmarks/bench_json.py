@@ -0,0 +1,82 @@
+"""
+JSON codec throughput for webhook parsing and API responses.
+
+Usage:
+    python -m backend.benchmarks.bench_json [--repeat 200]
+
+Parses synthetic GitHub push payloads of increasing size (20 to 2000
+commits, roughly 15 KB to 1.5 MB) the way ``request.get_json`` does, and
+renders ``get_commits`` pages of 50 and 200 events the way ``jsonify`` does,
+with each available provider from ``backend/services/json_provider.py``.
+"""
+
+import time
+import argparse
+from datetime import datetime, timedelta
+
+from flask import Flask
+
+from backend.benchmarks.payloads import push_payload
+from backend.services.json_provider import PROVIDERS, orjson
+
+
+def _commits_page(size):
+    start = datetime(2025, 4, 24, 12, 0)
+    return {
+        "commits": [
+            {
+                "id": i,
+                "repo": f"repo-{i % 7}",
+                "message": f"Commit {i}: fix the thing, add tests ✓",
+                "url": f"https://github.com/octo/repo/commit/{i:040x}",
+                "status": "posted" if i % 3 else "unposted",
+                "timestamp": (start - timedelta(minutes=i)).isoformat(),
+            }
+            for i in range(size)
+        ],
+        "next_cursor": "WyIyMDI1LTA0LTI0VDEyOjAwOjAwIiwgNDJd",
+    }
+
+
+def _time(func, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    app = Flask(__name__)
+    providers = {
+        name: cls(app)
+        for name, cls in PROVIDERS.items()
+        if name != "orjson" or orjson is not None
+    }
+
+    print("Webhook parse (request.get_json)")
+    for commits in (20, 200, 2000):
+        body = providers["stdlib"].dumps(push_payload(commits)).encode("utf-8")
+        repeat = max(1, args.repeat * 20 // commits)
+        line = f"  {commits:>5} commits, {len(body) / 1024:>7,.0f} KB:"
+        for name, provider in providers.items():
+            elapsed = _time(lambda: provider.loads(body), repeat)
+            line += f"  {name} {elapsed * 1e3:>8.3f} ms"
+        print(line)
+
+    print("get_commits response (jsonify)")
+    with app.app_context():
+        for size in (50, 200):
+            page = _commits_page(size)
+            line = f"  {size:>5} events:"
+            for name, provider in providers.items():
+                elapsed = _time(lambda: provider.response(page), args.repeat)
+                line += f"  {name} {elapsed * 1e6:>8.1f} us"
+            print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""
+Sync thread pool versus asyncio throughput for LinkedIn posting.
+
+Usage:
+    python -m backend.benchmarks.bench_linkedin_clients [--posts 200]
+        [--concurrency 8 32 64] [--linkedin-latency 100]
+
+Sends ``--posts`` posts for distinct members to the local LinkedIn stub from
+``bench_webhook`` through both clients: ``send_post_to_linkedin`` on a
+thread pool of each ``--concurrency`` (every thread in its own app context),
+and ``AsyncLinkedInClient.post_many`` with that many posts in flight on one
+thread. Circuit breaker and rate limiter checks run as in production, against
+a temporary SQLite database in WAL mode so concurrent gate writes wait on
+each other instead of failing, with a connection pool large enough for the
+largest ``--concurrency``.
+"""
+
+import os
+import time
+import argparse
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+import anyio
+from sqlalchemy import event
+
+from backend.benchmarks.bench_webhook import LinkedInStub, make_app, running
+
+
+def _sqlite_pragmas(connection, record):
+    cursor = connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=OFF")
+    cursor.execute("PRAGMA busy_timeout=30000")
+    cursor.close()
+
+
+def _users(count):
+    from backend.models import db, User
+
+    db.drop_all()
+    db.create_all()
+    users = [
+        User(
+            SECRET_GITHUB_id=f"bench-{i}",
+            SECRET_GITHUB_TOKEN="gh_token",
+            linkedin_id=f"member-{i}",
+            linkedin_token="li_token",
+        )
+        for i in range(count)
+    ]
+    db.session.add_all(users)
+    db.session.commit()
+    return [user.id for user in users]
+
+
+def _sync(app, user_ids, concurrency):
+    from backend.models import db, User
+    from backend.services.post_to_linkedin import send_post_to_linkedin
+
+    def post(user_id):
+        with app.app_context():
+            user = db.session.get(User, user_id)
+            return send_post_to_linkedin(user, "repo", "msg", {}, post_text="Shipped")
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        futures = [pool.submit(post, user_id) for user_id in user_ids]
+    return [future.exception() or future.result() for future in futures]
+
+
+def _async(user_ids, concurrency):
+    from backend.models import User
+    from backend.services.linkedin_async import AsyncLinkedInClient
+
+    users = User.query.filter(User.id.in_(user_ids)).all()
+    posts = [(user, "repo", "msg", {}, "Shipped") for user in users]
+
+    async def main():
+        async with AsyncLinkedInClient(max_connections=concurrency) as client:
+            return await client.post_many(posts, concurrency=concurrency)
+
+    return anyio.run(main)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--posts", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[8, 32, 64])
+    parser.add_argument("--linkedin-latency", type=float, default=100, help="ms")
+    args = parser.parse_args()
+
+    database = os.path.join(tempfile.mkdtemp(), "bench_linkedin.db")
+    stub = LinkedInStub(args.linkedin_latency / 1000, error_rate=0.0)
+    with running(stub):
+        # A post holds its session's connection while the gates write on a
+        # second one, so each sync worker can need two at once.
+        app = make_app(
+            database,
+            stub.url,
+            engine_options={"pool_size": 2 * max(args.concurrency), "max_overflow": 0},
+        )
+        with app.app_context():
+            from backend.models import db
+
+            db.engine.dispose()
+            event.listen(db.engine, "connect", _sqlite_pragmas)
+            print(
+                f"{args.posts} posts, LinkedIn stub at {args.linkedin_latency:.0f} ms "
+                f"(ideal: {args.posts * args.linkedin_latency / 1000:.1f}s serially)"
+            )
+            for concurrency in args.concurrency:
+                line = f"  {concurrency:>4} in flight:"
+                for name in ("sync threads", "asyncio"):
+                    user_ids = _users(args.posts)
+                    started = time.perf_counter()
+                    if name == "asyncio":
+                        results = _async(user_ids, concurrency)
+                    else:
+                        results = _sync(app, user_ids, concurrency)
+                    elapsed = time.perf_counter() - started
+                    failed = sum(
+                        1
+                        for r in results
+                        if isinstance(r, Exception) or r.status_code != 201
+                    )
+                    line += f"  {name} {args.posts / elapsed:>7,.1f} posts/s"
+                    if failed:
+                        line += f" ({failed} failed)"
+                print(line, flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Per-request cost of webhook signature verification.
+
+Usage:
+    python -m backend.benchmarks.bench_signature [--repeat 200]
+
+Reads and verifies signed bodies of 1 KB, 100 KB and 5 MB four ways:
+
+* ``per-request key``: read the whole body, then read the secret from the
+  environment, encode it and build a new HMAC (how verification used to work);
+* ``cached key``: read the whole body, then copy the precomputed primary HMAC
+  from the keyring;
+* ``streamed``: hash 64 KB chunks with the cached key while the body is read,
+  as the webhook does;
+* ``rotated key``: streamed, but the body was signed with the second active
+  secret, so it is hashed again with that key after the primary misses.
+"""
+
+import io
+import os
+import hmac
+import time
+import hashlib
+import argparse
+
+from backend.services import verify_signature
+from backend.services.verify_signature import (
+    Keyring,
+    read_signed_body,
+    verifyGITHUB_signature,
+)
+
+PRIMARY = "primary-webhook-secret"
+PREVIOUS = "previous-webhook-secret"
+
+
+def _sign(body, secret):
+    return "sha256=" + hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+
+
+def _per_request_key(body, signature):
+    secret = os.environ.get("SECRET_GITHUB_WEBHOOK_SECRET", "").encode("utf-8")
+    expected = "sha256=" + hmac.new(secret, body, hashlib.sha256).hexdigest()
+    return hmac.compare_digest(expected, signature)
+
+
+def _time(func, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        assert func()
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    os.environ["SECRET_GITHUB_WEBHOOK_SECRET"] = PRIMARY
+    verify_signature._keyring = Keyring([PRIMARY, PREVIOUS])
+
+    for label, size in (("1 KB", 1024), ("100 KB", 100 * 1024), ("5 MB", 5 << 20)):
+        body = os.urandom(size)
+        signature, rotated = _sign(body, PRIMARY), _sign(body, PREVIOUS)
+        repeat = max(20, args.repeat * 1024 // size)
+        cases = {
+            "per-request key": lambda: _per_request_key(
+                io.BytesIO(body).read(), signature
+            ),
+            "cached key": lambda: verifyGITHUB_signature(
+                io.BytesIO(body).read(), signature
+            ),
+            "streamed": lambda: verifyGITHUB_signature(
+                read_signed_body(io.BytesIO(body), size), signature
+            ),
+            "rotated key": lambda: verifyGITHUB_signature(
+                read_signed_body(io.BytesIO(body), size), rotated
+            ),
+        }
+        line = f"{label:>7}:"
+        for name, func in cases.items():
+            elapsed = _time(func, repeat)
+            line += f"  {name} {elapsed * 1e6:>9,.1f} us"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
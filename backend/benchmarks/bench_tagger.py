@@ -0,0 +1,110 @@
+"""
+Tagging throughput over a synthetic commit log.
+
+Usage:
+    python -m backend.benchmarks.bench_tagger [--messages 100000] [--repeat 5]
+
+Compares the compiled tagger with the per-keyword scans it replaced (a fresh
+lowercase copy of the message for every keyword) and with a case-insensitive
+``re`` alternation of the same keywords, for the default dictionary and for
+a larger one with Conventional Commit prefixes and patterns. Each figure is
+the best of ``--repeat`` runs.
+"""
+
+import re
+import time
+import random
+import argparse
+
+from backend.services.tagger import DEFAULT_TAG_RULES, Tagger
+
+LARGE_RULES = {
+    **DEFAULT_TAG_RULES,
+    "#feature": {"keywords": ["feature", "add "], "conventional": ["feat"]},
+    "#docs": {"keywords": ["readme", "docs"], "conventional": ["docs"]},
+    "#performance": {
+        "keywords": ["speed", "faster", "cache"],
+        "conventional": ["perf"],
+    },
+    "#security": {"keywords": ["cve", "xss", "csrf", "sanitize"]},
+    "#dependencies": {
+        "keywords": ["bump", "upgrade", "dependency"],
+        "conventional": ["build"],
+    },
+    "#ci": {"keywords": ["workflow", "pipeline"], "conventional": ["ci"]},
+    "#breaking": {"patterns": [r"\A\w+(?:\([^)]*\))?!:", r"BREAKING CHANGE"]},
+}
+
+WORDS = (
+    "update handle parse worker request payload linkedin github digest user "
+    "session cache token queue retry schema model route config logging"
+).split()
+PREFIXES = ["", "", "", "feat: ", "fix: ", "docs: ", "refactor: ", "perf: ", "ci: "]
+
+
+def _messages(count, seed=7):
+    rng = random.Random(seed)
+    return [
+        rng.choice(PREFIXES)
+        + " ".join(rng.choice(WORDS) for _ in range(rng.randint(4, 14)))
+        for _ in range(count)
+    ]
+
+
+def _naive(rules):
+    """The original digest tagging: ``message.lower()`` per keyword."""
+    keywords = [
+        (tag, [k.lower() for k in rule.get("keywords", [])])
+        for tag, rule in rules.items()
+    ]
+
+    def tag(message):
+        found = []
+        for name, words in keywords:
+            for word in words:
+                if word in message.lower():
+                    found.append(name)
+                    break
+        return found
+
+    return tag
+
+
+def _combined_regex(rules):
+    keywords = [k for rule in rules.values() for k in rule.get("keywords", [])]
+    regex = re.compile("|".join(map(re.escape, keywords)), re.IGNORECASE)
+    return lambda message: set(regex.findall(message))
+
+
+def _run(label, tag, messages, repeat):
+    elapsed = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for message in messages:
+            tag(message)
+        elapsed = min(elapsed, time.perf_counter() - start)
+    print(f"{label:<44} {len(messages) / elapsed:>12,.0f} messages/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--messages", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    messages = _messages(args.messages)
+
+    for name, rules in (("default", DEFAULT_TAG_RULES), ("large", LARGE_RULES)):
+        keywords_only = {
+            tag: {"keywords": rule.get("keywords", [])} for tag, rule in rules.items()
+        }
+        for label, tag in (
+            ("per-keyword scans (keywords)", _naive(rules)),
+            ("re alternation (keywords)", _combined_regex(rules)),
+            ("Tagger (keywords)", Tagger(keywords_only).tag),
+            ("Tagger (all rules)", Tagger(rules).tag),
+        ):
+            _run(f"{name}: {label}", tag, messages, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Render throughput of post templates.
+
+Usage:
+    python -m backend.benchmarks.bench_templates [--number 20000]
+
+Reports renders per second for single-commit posts and for digests of
+10 and 100 commits, with the default templates and with a compiled custom
+template. Rendering needs no database or app context.
+"""
+
+import argparse
+import timeit
+from types import SimpleNamespace
+
+from backend.services import post_templates
+from backend.services.post_generator import (
+    generate_post_from_webhook,
+    generate_digest_post,
+)
+
+PAYLOAD = {
+    "repository": {
+        "name": "bench-repo",
+        "html_url": "https://github.com/bench/bench-repo",
+    },
+    "head_commit": {
+        "id": "0123456789abcdef",
+        "message": "Speed up rendering",
+        "author": {"name": "Bench User"},
+    },
+}
+
+CUSTOM = SimpleNamespace(
+    id=1,
+    version=1,
+    kind="commit",
+    body="[{short_sha}] {author} shipped {message} to {repo} - {url}",
+    item=None,
+)
+
+
+def _digest_events(count):
+    return [
+        {
+            "repository": {"name": f"repo{i % 5}"},
+            "message": f"fix: commit {i} with tests",
+            "timestamp": "2025-04-24T12:00:00Z",
+        }
+        for i in range(count)
+    ]
+
+
+def _report(label, func, number):
+    seconds = min(timeit.repeat(func, number=number, repeat=3))
+    print(f"{label:<32} {number / seconds:>12,.0f} renders/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--number", type=int, default=20000)
+    args = parser.parse_args()
+
+    digest_10 = _digest_events(10)
+    digest_100 = _digest_events(100)
+
+    _report(
+        "commit (default)", lambda: generate_post_from_webhook(PAYLOAD), args.number
+    )
+    _report(
+        "commit (custom)",
+        lambda: generate_post_from_webhook(PAYLOAD, CUSTOM),
+        args.number,
+    )
+    _report(
+        "digest, 10 commits", lambda: generate_digest_post(digest_10), args.number // 10
+    )
+    _report(
+        "digest, 100 commits",
+        lambda: generate_digest_post(digest_100),
+        args.number // 100,
+    )
+    post_templates.clear()
+
+
+if __name__ == "__main__":
+    main()
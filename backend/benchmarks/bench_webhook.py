@@ -0,0 +1,257 @@
+"""
+Load test of the GitHub webhook pipeline.
+
+Usage:
+    python -m backend.benchmarks.bench_webhook [--requests 200] [--commits 1 10 100 1000]
+        [--modes sync async batched] [--linkedin-latency 50] [--error-rate 0.0]
+
+Replays signed push payloads against ``/webhook/github`` through the Flask
+test client, with LinkedIn replaced by a local HTTP stub that answers after
+``--linkedin-latency`` milliseconds and fails ``--error-rate`` of the posts
+with a 500. For each mode and payload size it reports throughput,
+p50/p95/p99 latency and the mean number of SQL statements per request:
+
+* ``sync``: ``WEBHOOK_ASYNC=false``, the LinkedIn post is made inline;
+* ``async``: the webhook stores and queues the event, then the queue is
+  drained by ``run_worker`` and its throughput reported separately;
+* ``batched``: pushes are coalesced with ``DIGEST_WINDOW_SECONDS``.
+
+Every run uses a fresh SQLite database (``--database``); rate limits and the
+circuit breaker are raised out of the way so they do not shape the numbers.
+"""
+
+import os
+import time
+import json
+import random
+import logging
+import argparse
+import tempfile
+import threading
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from sqlalchemy import event
+
+from backend.benchmarks.payloads import push_payload, signed_request
+
+SECRET = "bench-secret"
+OWNER = "benchuser"
+
+
+class LinkedInStub(ThreadingHTTPServer):
+    """Answers UGC post requests after a fixed latency, failing some of them."""
+
+    daemon_threads = True
+
+    def __init__(self, latency, error_rate, seed=7):
+        super().__init__(("127.0.0.1", 0), _StubHandler)
+        self.latency = latency
+        self.error_rate = error_rate
+        self.rng = random.Random(seed)
+        self.posts = 0
+        self.lock = threading.Lock()
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}/v2/ugcPosts"
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate writes; without TCP_NODELAY the
+    # second waits on the client's delayed ACK and adds ~40 ms per post.
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        time.sleep(self.server.latency)
+        with self.server.lock:
+            self.server.posts += 1
+            post_id = self.server.posts
+            failed = self.server.rng.random() < self.server.error_rate
+        if failed:
+            status, body = 500, b'{"message": "stub failure"}'
+        else:
+            status, body = 201, json.dumps({"id": f"urn:li:share:{post_id}"}).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@contextmanager
+def running(server):
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+class QueryCounter:
+    def __init__(self, engine):
+        self.count = 0
+        event.listen(engine, "before_cursor_execute", self._on_execute)
+
+    def _on_execute(self, *args):
+        self.count += 1
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def make_app(database, stub_url, engine_options=None):
+    # Settings read at import time must be in place before the app loads.
+    os.environ["TEST_DATABASE_URL"] = f"sqlite:///{database}"
+    os.environ["SECRET_GITHUB_WEBHOOK_SECRET"] = SECRET
+    os.environ.setdefault("LINKEDIN_ACCESS_TOKEN", "bench")
+    os.environ.setdefault("LINKEDIN_USER_ID", "bench")
+
+    from backend.app import create_app
+    from backend.config import TestingConfig
+
+    if engine_options:
+        # The engine is built from these when the app is created.
+        TestingConfig.SQLALCHEMY_ENGINE_OPTIONS = engine_options
+
+    app = create_app("testing")
+    app.config.update(
+        TESTING=False,
+        LINKEDIN_POST_URL=stub_url,
+        RATE_LIMIT_MEMBER_CAPACITY=10**9,
+        RATE_LIMIT_MEMBER_PER_DAY=10**9,
+        RATE_LIMIT_APP_CAPACITY=10**9,
+        RATE_LIMIT_APP_PER_DAY=10**9,
+        BREAKER_FAILURE_THRESHOLD=10**9,
+        DIGEST_SCHEDULER_INTERVAL=0,
+    )
+    # Injected LinkedIn failures would otherwise print a traceback each.
+    logging.disable(logging.ERROR)
+    return app
+
+
+def _reset(app):
+    from backend.models import db, User
+    from backend.services import user_cache, dedup
+
+    db.drop_all()
+    db.create_all()
+    db.session.add(
+        User(
+            SECRET_GITHUB_id=OWNER,
+            SECRET_GITHUB_TOKEN="gh_token",
+            linkedin_id="bench-member",
+            linkedin_token="li_token",
+        )
+    )
+    db.session.commit()
+    user_cache.clear()
+    dedup.clear()
+
+
+def _configure(app, mode):
+    app.config["WEBHOOK_ASYNC"] = mode == "async"
+    app.config["DIGEST_WINDOW_SECONDS"] = 600 if mode == "batched" else 0
+
+
+def run_case(app, counter, mode, commits, requests):
+    from backend.models import db, Job
+    from backend.services.job_queue import run_worker
+
+    _configure(app, mode)
+    _reset(app)
+    client = app.test_client()
+    bodies = [
+        signed_request(push_payload(commits, seed=i, owner=OWNER), SECRET)
+        for i in range(requests)
+    ]
+
+    latencies, statuses = [], {}
+    queries_before = counter.count
+    started = time.perf_counter()
+    for i, (body, signature) in enumerate(bodies):
+        t0 = time.perf_counter()
+        response = client.post(
+            "/webhook/github",
+            data=body,
+            headers={
+                "Content-Type": "application/json",
+                "X-GitHub-Event": "push",
+                "X-GitHub-Delivery": f"bench-{mode}-{commits}-{i}",
+                "X-Hub-Signature-256": signature,
+            },
+        )
+        latencies.append(time.perf_counter() - t0)
+        statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+    elapsed = time.perf_counter() - started
+    queries = (counter.count - queries_before) / requests
+
+    line = (
+        f"{mode:<8} {commits:>5} {len(bodies[0][0]) / 1024:>8,.0f} KB "
+        f"{requests / elapsed:>9,.1f}/s "
+        f"p50 {percentile(latencies, 0.50) * 1e3:>7.2f} "
+        f"p95 {percentile(latencies, 0.95) * 1e3:>7.2f} "
+        f"p99 {percentile(latencies, 0.99) * 1e3:>7.2f} ms "
+        f"{queries:>5.1f} q/req  {dict(sorted(statuses.items()))}"
+    )
+    print(line, flush=True)
+
+    if mode == "async":
+        jobs = Job.query.filter_by(status="queued").count()
+        db.session.remove()
+        queries_before = counter.count
+        started = time.perf_counter()
+        run_worker(app, concurrency=4, poll_interval=0.05, once=True)
+        elapsed = time.perf_counter() - started
+        print(
+            f"{'  worker':<8} {commits:>5} {jobs / elapsed:>21,.1f}/s drained "
+            f"{jobs} job(s), {(counter.count - queries_before) / max(jobs, 1):.1f} q/job",
+            flush=True,
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--commits", type=int, nargs="+", default=[1, 10, 100, 1000])
+    parser.add_argument(
+        "--modes",
+        nargs="+",
+        default=["sync", "async", "batched"],
+        choices=["sync", "async", "batched"],
+    )
+    parser.add_argument("--linkedin-latency", type=float, default=50, help="ms")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--database", default=None, help="SQLite file (temporary)")
+    args = parser.parse_args()
+
+    database = args.database or os.path.join(tempfile.mkdtemp(), "bench_webhook.db")
+    stub = LinkedInStub(args.linkedin_latency / 1000, args.error_rate)
+    with running(stub):
+        app = make_app(database, stub.url)
+        with app.app_context():
+            from backend.models import db
+
+            counter = QueryCounter(db.engine)
+            print(
+                f"LinkedIn stub at {stub.url}: {args.linkedin_latency:.0f} ms, "
+                f"{args.error_rate:.0%} errors; database {database}"
+            )
+            print(f"{'mode':<8} {'commits':>5} {'body':>11} {'throughput':>11}")
+            for mode in args.modes:
+                for commits in args.commits:
+                    run_case(app, counter, mode, commits, args.requests)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Synthetic GitHub push payloads shaped like real ones, for the benchmarks."""
+
+import json
+import hmac
+import random
+import hashlib
+
+
+def push_payload(commits, seed=7, owner="octo"):
+    """
+    A push event with ``commits`` commits (roughly 0.6 KB each).
+
+    The same ``seed`` gives the same payload; vary it for distinct SHAs.
+    """
+    rng = random.Random(seed)
+
+    def commit(i):
+        sha = f"{rng.getrandbits(160):040x}"
+        return {
+            "id": sha,
+            "tree_id": f"{rng.getrandbits(160):040x}",
+            "distinct": True,
+            "message": (
+                f"Commit {i}: update handler and tests for issue "
+                f"#{rng.randint(1, 9999)}"
+            ),
+            "timestamp": "2025-04-24T12:00:00+02:00",
+            "url": f"https://github.com/octo/repo/commit/{sha}",
+            "author": {
+                "name": "Octo Cat",
+                "email": "octo@example.com",
+                "username": "octo",
+            },
+            "committer": {
+                "name": "GitHub",
+                "email": "noreply@github.com",
+                "username": "web-flow",
+            },
+            "added": [
+                f"src/module_{rng.randint(1, 500)}.py" for _ in range(rng.randint(0, 3))
+            ],
+            "removed": [],
+            "modified": [
+                f"src/module_{rng.randint(1, 500)}.py" for _ in range(rng.randint(1, 6))
+            ],
+        }
+
+    items = [commit(i) for i in range(commits)]
+    return {
+        "ref": "refs/heads/main",
+        "before": "0" * 40,
+        "after": items[-1]["id"],
+        "repository": {
+            "id": 1296269,
+            "name": "repo",
+            "full_name": "octo/repo",
+            "html_url": "https://github.com/octo/repo",
+            "owner": {"id": owner, "login": owner},
+            "description": "Benchmark repository " + "x" * 200,
+        },
+        "pusher": {"name": owner, "email": "octo@example.com"},
+        "commits": items,
+        "head_commit": items[-1],
+    }
+
+
+def signed_request(payload, secret):
+    """The body and ``X-Hub-Signature-256`` GitHub would send for ``payload``."""
+    body = json.dumps(payload).encode("utf-8")
+    digest = hmac.new(secret.encode("utf-8"), body, hashlib.sha256).hexdigest()
+    return body, f"sha256={digest}"
@@ -32,6 +32,10 @@ def get_required_env_var(key):
     return value.strip()
 
 
+def get_bool_env_var(key, default="false"):
+    return os.getenv(key, default).strip().lower() in ("1", "true", "yes", "on")
+
+
 # Load env vars conditionally based on environment
 env = os.getenv("FLASK_ENV", "development").strip()
 
@@ -55,6 +59,64 @@ class BaseConfig:
     TESTING = False
     BACKEND_URL = os.getenv("BACKEND_URL", "http://localhost:5000").strip()
 
+    # Background job queue (see backend/services/job_queue.py)
+    WEBHOOK_ASYNC = get_bool_env_var("WEBHOOK_ASYNC", "true")
+    # Header pre-filter (see backend/services/webhook_filter.py); GitHub caps
+    # payloads at 25 MB. Comma-separated hook IDs, empty accepts any hook.
+    WEBHOOK_MAX_CONTENT_LENGTH = int(
+        os.getenv("WEBHOOK_MAX_CONTENT_LENGTH", str(25 * 1024 * 1024))
+    )
+    WEBHOOK_ALLOWED_HOOK_IDS = os.getenv("WEBHOOK_ALLOWED_HOOK_IDS", "").strip()
+    # Seconds between incremental reloads of the repository routing map
+    # (see backend/services/repo_routing.py)
+    ROUTING_REFRESH_INTERVAL = float(os.getenv("ROUTING_REFRESH_INTERVAL", "30"))
+    # Load the map when wsgi.py starts the web server, not on the first webhook
+    ROUTING_WARM_ON_START = get_bool_env_var("ROUTING_WARM_ON_START", "true")
+    # Inline posts to several subscribers run on a shared pool and the webhook
+    # waits at most FANOUT_DEADLINE_SECONDS (see backend/services/fan_out.py)
+    FANOUT_MAX_WORKERS = int(os.getenv("FANOUT_MAX_WORKERS", "8"))
+    FANOUT_DEADLINE_SECONDS = float(os.getenv("FANOUT_DEADLINE_SECONDS", "10"))
+    WORKER_CONCURRENCY = int(os.getenv("WORKER_CONCURRENCY", "4"))
+    WORKER_POLL_INTERVAL = float(os.getenv("WORKER_POLL_INTERVAL", "1.0"))
+    JOB_VISIBILITY_TIMEOUT = int(os.getenv("JOB_VISIBILITY_TIMEOUT", "300"))
+    # Coalesce pushes per user and repository into one digest post (0 = off)
+    DIGEST_WINDOW_SECONDS = int(os.getenv("DIGEST_WINDOW_SECONDS", "0"))
+    # Scheduled per-user digests (see backend/services/digest_scheduler.py)
+    DIGEST_BATCH_SIZE = int(os.getenv("DIGEST_BATCH_SIZE", "500"))
+    DIGEST_SCHEDULER_INTERVAL = int(os.getenv("DIGEST_SCHEDULER_INTERVAL", "60"))
+    # Digest size budgets (see backend/services/digest_builder.py)
+    DIGEST_MAX_GROUPS = int(os.getenv("DIGEST_MAX_GROUPS", "20"))
+    DIGEST_MAX_MESSAGES_PER_GROUP = int(os.getenv("DIGEST_MAX_MESSAGES_PER_GROUP", "10"))
+    # LinkedIn publishing quotas (see backend/services/rate_limiter.py)
+    RATE_LIMIT_MEMBER_CAPACITY = int(os.getenv("RATE_LIMIT_MEMBER_CAPACITY", "10"))
+    RATE_LIMIT_MEMBER_PER_DAY = int(os.getenv("RATE_LIMIT_MEMBER_PER_DAY", "150"))
+    RATE_LIMIT_APP_CAPACITY = int(os.getenv("RATE_LIMIT_APP_CAPACITY", "100"))
+    RATE_LIMIT_APP_PER_DAY = int(os.getenv("RATE_LIMIT_APP_PER_DAY", "100000"))
+    # Failed post retries (see backend/services/retry.py)
+    RETRY_MAX_ATTEMPTS = int(os.getenv("RETRY_MAX_ATTEMPTS", "6"))
+    RETRY_BASE_DELAY = float(os.getenv("RETRY_BASE_DELAY", "30"))
+    RETRY_MAX_DELAY = float(os.getenv("RETRY_MAX_DELAY", "3600"))
+    RETRY_MAX_AGE_SECONDS = int(os.getenv("RETRY_MAX_AGE_SECONDS", "86400"))
+    # LinkedIn UGC posts endpoint; point at a stub for load tests
+    LINKEDIN_POST_URL = os.getenv(
+        "LINKEDIN_POST_URL", "https://api.linkedin.com/v2/ugcPosts"
+    ).strip()
+    # LinkedIn circuit breaker (see backend/services/circuit_breaker.py)
+    BREAKER_FAILURE_THRESHOLD = int(os.getenv("BREAKER_FAILURE_THRESHOLD", "5"))
+    BREAKER_RESET_TIMEOUT = int(os.getenv("BREAKER_RESET_TIMEOUT", "60"))
+    # Logging (see backend/services/structured_logging.py): text or json, and
+    # per-category sample rates such as "Webhook=0.1"
+    LOG_FORMAT = os.getenv("LOG_FORMAT", "text").strip()
+    LOG_SAMPLE_RATES = os.getenv("LOG_SAMPLE_RATES", "").strip()
+    # Prometheus metrics at /metrics (see backend/services/metrics.py)
+    METRICS_ENABLED = get_bool_env_var("METRICS_ENABLED", "true")
+    # Bearer token required to scrape /metrics; empty serves it to anyone
+    METRICS_TOKEN = os.getenv("METRICS_TOKEN", "").strip()
+    # JSON codec: auto (orjson when installed), orjson or stdlib
+    JSON_CODEC = os.getenv("JSON_CODEC", "auto").strip()
+    # Digest hashtag dictionary as JSON (see backend/services/tagger.py)
+    TAG_RULES_FILE = os.getenv("TAG_RULES_FILE", "").strip() or None
+
 
 class DevelopmentConfig(BaseConfig):
     DEBUG = True
@@ -66,6 +128,10 @@ class TestingConfig(BaseConfig):
     TESTING = True
     SQLALCHEMY_DATABASE_URI = os.getenv("TEST_DATABASE_URL", "sqlite:///test.db").strip()
     BACKEND_URL = os.getenv("TEST_BACKEND_URL", "http://test.local").strip()
+    # Post inline so the functional tests exercise the full request path
+    WEBHOOK_ASYNC = get_bool_env_var("TEST_WEBHOOK_ASYNC", "false")
+    # Tests create their tables after the app
+    ROUTING_WARM_ON_START = False
 
 
 class ProductionConfig(BaseConfig):
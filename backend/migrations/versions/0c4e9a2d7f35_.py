@@ -0,0 +1,29 @@
+"""index github events by user and timestamp
+
+Revision ID: 0c4e9a2d7f35
+Revises: f3b7d1a9c528
+Create Date: 2026-10-18 18:10:57.260417
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "0c4e9a2d7f35"
+down_revision = "f3b7d1a9c528"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table("git_hub_event", schema=None) as batch_op:
+        batch_op.create_index(
+            "ix_git_hub_event_user_id_timestamp",
+            ["user_id", "timestamp"],
+            unique=False,
+        )
+
+
+def downgrade():
+    with op.batch_alter_table("git_hub_event", schema=None) as batch_op:
+        batch_op.drop_index("ix_git_hub_event_user_id_timestamp")
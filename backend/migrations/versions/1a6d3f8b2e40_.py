@@ -0,0 +1,36 @@
+"""add post templates
+
+Revision ID: 1a6d3f8b2e40
+Revises: 0c4e9a2d7f35
+Create Date: 2026-10-18 18:54:20.733921
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "1a6d3f8b2e40"
+down_revision = "0c4e9a2d7f35"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "post_template",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("kind", sa.String(length=50), nullable=False),
+        sa.Column("body", sa.Text(), nullable=False),
+        sa.Column("item", sa.Text(), nullable=True),
+        sa.Column("version", sa.Integer(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["user.id"]),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("user_id", "kind"),
+    )
+
+
+def downgrade():
+    op.drop_table("post_template")
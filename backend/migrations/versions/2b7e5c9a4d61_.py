@@ -0,0 +1,34 @@
+"""add digest cadence to users
+
+Revision ID: 2b7e5c9a4d61
+Revises: 1a6d3f8b2e40
+Create Date: 2026-10-18 20:12:47.905113
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "2b7e5c9a4d61"
+down_revision = "1a6d3f8b2e40"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table("user", schema=None) as batch_op:
+        batch_op.add_column(
+            sa.Column("digest_cadence", sa.String(length=20), nullable=True)
+        )
+        batch_op.add_column(sa.Column("next_digest_at", sa.DateTime(), nullable=True))
+        batch_op.create_index(
+            batch_op.f("ix_user_next_digest_at"), ["next_digest_at"], unique=False
+        )
+
+
+def downgrade():
+    with op.batch_alter_table("user", schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f("ix_user_next_digest_at"))
+        batch_op.drop_column("next_digest_at")
+        batch_op.drop_column("digest_cadence")
@@ -0,0 +1,46 @@
+"""add repository subscriptions
+
+Revision ID: 3c8f1d6e7a52
+Revises: 2b7e5c9a4d61
+Create Date: 2026-10-18 22:41:09.318406
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "3c8f1d6e7a52"
+down_revision = "2b7e5c9a4d61"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "repository_subscription",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("repository_id", sa.BigInteger(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("repo_full_name", sa.String(length=255), nullable=True),
+        sa.Column("settings", sa.JSON(), nullable=True),
+        sa.Column("active", sa.Boolean(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["user.id"]),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("repository_id", "user_id"),
+    )
+    with op.batch_alter_table("repository_subscription", schema=None) as batch_op:
+        batch_op.create_index(
+            batch_op.f("ix_repository_subscription_updated_at"),
+            ["updated_at"],
+            unique=False,
+        )
+
+
+def downgrade():
+    with op.batch_alter_table("repository_subscription", schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f("ix_repository_subscription_updated_at"))
+
+    op.drop_table("repository_subscription")
@@ -0,0 +1,30 @@
+"""mark already posted github events as posted
+
+Revision ID: 5a9c2e7f1b84
+Revises: 3c8f1d6e7a52
+Create Date: 2026-10-19 14:26:03.518742
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "5a9c2e7f1b84"
+down_revision = "3c8f1d6e7a52"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Rows posted before the webhook recorded a status kept the "pending"
+    # default; history reads the status column, so backfill it.
+    op.execute(
+        "UPDATE git_hub_event SET status = 'posted' "
+        "WHERE linkedin_post_id IS NOT NULL "
+        "AND (status = 'pending' OR status IS NULL)"
+    )
+
+
+def downgrade():
+    # The backfill only corrected stale rows; there is nothing to undo.
+    pass
@@ -0,0 +1,39 @@
+"""allow one queued job per key
+
+Revision ID: 6d2f8a4c1e97
+Revises: 5a9c2e7f1b84
+Create Date: 2026-10-19 15:03:44.871260
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "6d2f8a4c1e97"
+down_revision = "5a9c2e7f1b84"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Keep the oldest of any duplicate queued jobs before enforcing the index.
+    op.execute(
+        "UPDATE job SET status = 'failed', last_error = 'Superseded by a queued job' "
+        "WHERE status = 'queued' AND key IS NOT NULL AND id NOT IN ("
+        "SELECT min(id) FROM job WHERE status = 'queued' AND key IS NOT NULL "
+        "GROUP BY key)"
+    )
+    with op.batch_alter_table("job", schema=None) as batch_op:
+        batch_op.create_index(
+            "uq_job_key_queued",
+            ["key"],
+            unique=True,
+            sqlite_where=sa.text("status = 'queued'"),
+            postgresql_where=sa.text("status = 'queued'"),
+        )
+
+
+def downgrade():
+    with op.batch_alter_table("job", schema=None) as batch_op:
+        batch_op.drop_index("uq_job_key_queued")
@@ -0,0 +1,91 @@
+"""add dedup columns to git_hub_event
+
+Revision ID: b7e35f0c2a91
+Revises: a41c7e2b9d10
+Create Date: 2026-10-18 11:40:02.551874
+
+"""
+
+import re
+import hashlib
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "b7e35f0c2a91"
+down_revision = "a41c7e2b9d10"
+branch_labels = None
+depends_on = None
+
+SHA_PATTERN = re.compile(r"^[0-9a-f]{7,40}$")
+
+git_hub_event = sa.table(
+    "git_hub_event",
+    sa.column("id", sa.Integer),
+    sa.column("user_id", sa.Integer),
+    sa.column("repo_name", sa.String),
+    sa.column("commit_url", sa.String),
+    sa.column("commit_sha", sa.String),
+    sa.column("dedup_key", sa.String),
+)
+
+
+def _sha_from_url(commit_url):
+    # https://github.com/<owner>/<repo>/commit/<sha>
+    if not commit_url:
+        return None
+    candidate = commit_url.rstrip("/").rsplit("/", 1)[-1].lower()
+    return candidate if SHA_PATTERN.match(candidate) else None
+
+
+def upgrade():
+    with op.batch_alter_table("git_hub_event", schema=None) as batch_op:
+        batch_op.add_column(
+            sa.Column("delivery_id", sa.String(length=64), nullable=True)
+        )
+        batch_op.add_column(
+            sa.Column("commit_sha", sa.String(length=40), nullable=True)
+        )
+        batch_op.add_column(sa.Column("dedup_key", sa.String(length=64), nullable=True))
+
+    # Backfill SHA and dedup key for rows whose commit URL carries the SHA.
+    # Older duplicates of the same commit keep a NULL key.
+    conn = op.get_bind()
+    rows = conn.execute(
+        sa.select(
+            git_hub_event.c.id,
+            git_hub_event.c.user_id,
+            git_hub_event.c.repo_name,
+            git_hub_event.c.commit_url,
+        ).order_by(git_hub_event.c.id)
+    )
+    seen = set()
+    for row in rows.fetchall():
+        commit_sha = _sha_from_url(row.commit_url)
+        if not commit_sha:
+            continue
+        raw = f"{row.user_id}:{row.repo_name}:{commit_sha}".encode("utf-8")
+        dedup_key = hashlib.sha256(raw).hexdigest()
+        values = {"commit_sha": commit_sha}
+        if dedup_key not in seen:
+            seen.add(dedup_key)
+            values["dedup_key"] = dedup_key
+        conn.execute(
+            git_hub_event.update().where(git_hub_event.c.id == row.id).values(**values)
+        )
+
+    with op.batch_alter_table("git_hub_event", schema=None) as batch_op:
+        batch_op.create_index(
+            "ix_git_hub_event_delivery_id", ["delivery_id"], unique=False
+        )
+        batch_op.create_index("ix_git_hub_event_dedup_key", ["dedup_key"], unique=True)
+
+
+def downgrade():
+    with op.batch_alter_table("git_hub_event", schema=None) as batch_op:
+        batch_op.drop_index("ix_git_hub_event_dedup_key")
+        batch_op.drop_index("ix_git_hub_event_delivery_id")
+        batch_op.drop_column("dedup_key")
+        batch_op.drop_column("commit_sha")
+        batch_op.drop_column("delivery_id")
@@ -0,0 +1,28 @@
+"""add job key for digest batches
+
+Revision ID: c2d8a6f41e07
+Revises: b7e35f0c2a91
+Create Date: 2026-10-18 14:03:27.904412
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "c2d8a6f41e07"
+down_revision = "b7e35f0c2a91"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table("job", schema=None) as batch_op:
+        batch_op.add_column(sa.Column("key", sa.String(length=255), nullable=True))
+        batch_op.create_index("ix_job_key", ["key"], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table("job", schema=None) as batch_op:
+        batch_op.drop_index("ix_job_key")
+        batch_op.drop_column("key")
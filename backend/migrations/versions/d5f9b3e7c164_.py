@@ -0,0 +1,31 @@
+"""add rate limit buckets
+
+Revision ID: d5f9b3e7c164
+Revises: c2d8a6f41e07
+Create Date: 2026-10-18 16:25:51.072630
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "d5f9b3e7c164"
+down_revision = "c2d8a6f41e07"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "rate_limit_bucket",
+        sa.Column("key", sa.String(length=255), nullable=False),
+        sa.Column("tokens", sa.Float(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.Column("blocked_until", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("key"),
+    )
+
+
+def downgrade():
+    op.drop_table("rate_limit_bucket")
@@ -0,0 +1,40 @@
+"""add retry scheduling to github events
+
+Revision ID: e8a2c4f6b913
+Revises: d5f9b3e7c164
+Create Date: 2026-10-18 17:02:13.418305
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "e8a2c4f6b913"
+down_revision = "d5f9b3e7c164"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table("git_hub_event", schema=None) as batch_op:
+        batch_op.add_column(
+            sa.Column("attempts", sa.Integer(), nullable=False, server_default="0")
+        )
+        batch_op.add_column(sa.Column("next_attempt_at", sa.DateTime(), nullable=True))
+        batch_op.add_column(sa.Column("last_error", sa.Text(), nullable=True))
+        batch_op.add_column(sa.Column("retry_payload", sa.JSON(), nullable=True))
+        batch_op.create_index(
+            "ix_git_hub_event_status_next_attempt_at",
+            ["status", "next_attempt_at"],
+            unique=False,
+        )
+
+
+def downgrade():
+    with op.batch_alter_table("git_hub_event", schema=None) as batch_op:
+        batch_op.drop_index("ix_git_hub_event_status_next_attempt_at")
+        batch_op.drop_column("retry_payload")
+        batch_op.drop_column("last_error")
+        batch_op.drop_column("next_attempt_at")
+        batch_op.drop_column("attempts")
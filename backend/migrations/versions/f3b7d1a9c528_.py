@@ -0,0 +1,32 @@
+"""add circuit breaker state
+
+Revision ID: f3b7d1a9c528
+Revises: e8a2c4f6b913
+Create Date: 2026-10-18 17:41:36.902114
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "f3b7d1a9c528"
+down_revision = "e8a2c4f6b913"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "circuit_breaker_state",
+        sa.Column("endpoint", sa.String(length=255), nullable=False),
+        sa.Column("state", sa.String(length=20), nullable=False),
+        sa.Column("failure_count", sa.Integer(), nullable=False),
+        sa.Column("opened_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("endpoint"),
+    )
+
+
+def downgrade():
+    op.drop_table("circuit_breaker_state")
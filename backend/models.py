@@ -5,6 +5,11 @@ from sqlalchemy.dialects.postgresql import JSON  # For JSON column support in Po
 db = SQLAlchemy()
 
 
+def utcnow():
+    """Naive UTC timestamp, matching how ``db.DateTime`` columns are stored."""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
 class User(db.Model):
     """User model."""
 
@@ -22,6 +27,10 @@ class User(db.Model):
     extra_metadata = db.Column(
         JSON, nullable=True
     )  # Renamed from `metadata` to `extra_metadata`
+    # Scheduled digests: "daily", "weekly" or None for a post per push.
+    # See backend/services/digest_scheduler.py.
+    digest_cadence = db.Column(db.String(20), nullable=True)
+    next_digest_at = db.Column(db.DateTime, nullable=True, index=True)
 
     def has_valid_linkedin_token(self):
         """Check if the user has a valid LinkedIn token."""
@@ -36,9 +45,115 @@ class GitHubEvent(db.Model):
     commit_url = db.Column(db.String(512), nullable=True)
     event_type = db.Column(db.String(50), nullable=True)
     status = db.Column(db.String(50), default="pending")
-    timestamp = db.Column(db.DateTime, default=datetime.now(timezone.utc))
+    timestamp = db.Column(db.DateTime, default=utcnow)
     linkedin_post_id = db.Column(db.String(255), nullable=True)
+    # Deduplication: X-GitHub-Delivery, head commit SHA and a unique key
+    # derived from (user, repository, SHA). See backend/services/dedup.py.
+    delivery_id = db.Column(db.String(64), nullable=True, index=True)
+    commit_sha = db.Column(db.String(40), nullable=True)
+    dedup_key = db.Column(db.String(64), nullable=True, unique=True, index=True)
+    # Retry bookkeeping: failed posts move to "retrying" until next_attempt_at,
+    # then to "dead" once out of attempts. See backend/services/retry.py.
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    next_attempt_at = db.Column(db.DateTime, nullable=True)
+    last_error = db.Column(db.Text, nullable=True)
+    # Slimmed webhook payload the retry is rendered from
+    retry_payload = db.Column(db.JSON, nullable=True)
 
     user = db.relationship(
         "User", backref=db.backref("SECRET_GITHUB_events", lazy=True)
     )
+
+    __table_args__ = (
+        db.Index(
+            "ix_git_hub_event_status_next_attempt_at", "status", "next_attempt_at"
+        ),
+        db.Index("ix_git_hub_event_user_id_timestamp", "user_id", "timestamp"),
+    )
+
+
+class Job(db.Model):
+    """A unit of background work, drained by ``flask run-worker``."""
+
+    id = db.Column(db.Integer, primary_key=True)
+    kind = db.Column(db.String(50), nullable=False)
+    payload = db.Column(db.JSON, nullable=True)
+    event_id = db.Column(db.Integer, db.ForeignKey("git_hub_event.id"), nullable=True)
+    # Identifies singleton jobs, e.g. one pending digest flush per repository
+    key = db.Column(db.String(255), nullable=True, index=True)
+    status = db.Column(db.String(20), nullable=False, default="queued")
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    run_at = db.Column(db.DateTime, nullable=False, default=utcnow)
+    locked_at = db.Column(db.DateTime, nullable=True)
+    locked_by = db.Column(db.String(255), nullable=True)
+    last_error = db.Column(db.Text, nullable=True)
+    created_at = db.Column(db.DateTime, nullable=False, default=utcnow)
+
+    __table_args__ = (
+        db.Index("ix_job_status_run_at", "status", "run_at"),
+        # At most one queued job per key.
+        db.Index(
+            "uq_job_key_queued",
+            "key",
+            unique=True,
+            sqlite_where=db.text("status = 'queued'"),
+            postgresql_where=db.text("status = 'queued'"),
+        ),
+    )
+
+
+class RateLimitBucket(db.Model):
+    """Token bucket state shared by every worker (see services/rate_limiter.py)."""
+
+    key = db.Column(db.String(255), primary_key=True)
+    tokens = db.Column(db.Float, nullable=False)
+    updated_at = db.Column(db.DateTime, nullable=False, default=utcnow)
+    blocked_until = db.Column(db.DateTime, nullable=True)
+
+
+class CircuitBreakerState(db.Model):
+    """Per-endpoint circuit breaker shared by every worker (see services/circuit_breaker.py)."""
+
+    endpoint = db.Column(db.String(255), primary_key=True)
+    state = db.Column(db.String(20), nullable=False, default="closed")
+    failure_count = db.Column(db.Integer, nullable=False, default=0)
+    opened_at = db.Column(db.DateTime, nullable=True)
+    updated_at = db.Column(db.DateTime, nullable=False, default=utcnow)
+
+
+class PostTemplate(db.Model):
+    """A user's layout for one kind of post (see services/post_templates.py)."""
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=False)
+    kind = db.Column(db.String(50), nullable=False)
+    body = db.Column(db.Text, nullable=False)
+    item = db.Column(db.Text, nullable=True)
+    # Bumped on every edit; compiled templates are cached by (id, version)
+    version = db.Column(db.Integer, nullable=False, default=1)
+    updated_at = db.Column(db.DateTime, nullable=False, default=utcnow, onupdate=utcnow)
+
+    __table_args__ = (db.UniqueConstraint("user_id", "kind"),)
+
+
+class RepositorySubscription(db.Model):
+    """A user who receives posts for a repository (see services/repo_routing.py)."""
+
+    id = db.Column(db.Integer, primary_key=True)
+    # GitHub's numeric repository ID, stable across renames and transfers
+    repository_id = db.Column(db.BigInteger, nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=False)
+    repo_full_name = db.Column(db.String(255), nullable=True)
+    # Per-repository settings, e.g. {"branches": ["main"]}
+    settings = db.Column(db.JSON, nullable=True)
+    # Unsubscribing clears the flag rather than deleting the row, so routing
+    # maps refreshing from updated_at see the change.
+    active = db.Column(db.Boolean, nullable=False, default=True)
+    created_at = db.Column(db.DateTime, nullable=False, default=utcnow)
+    updated_at = db.Column(
+        db.DateTime, nullable=False, default=utcnow, onupdate=utcnow, index=True
+    )
+
+    user = db.relationship("User")
+
+    __table_args__ = (db.UniqueConstraint("repository_id", "user_id"),)
@@ -1,9 +1,13 @@
 from dotenv import load_dotenv
 import os
-import requests
+import sys
 import webbrowser
 from http.server import BaseHTTPRequestHandler, HTTPServer
 
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from backend.services import http_client
+
 
 # Load environment variables from .env file
 load_dotenv()
@@ -59,7 +63,7 @@ def renew_linkedin_access_token(auth_code):
     }
     headers = {"Content-Type": "application/x-www-form-urlencoded"}
 
-    response = requests.post(url, data=payload, headers=headers)
+    response = http_client.post(url, data=payload, headers=headers)
 
     if response.status_code == 200:
         new_token = response.json().get("access_token")
@@ -1,5 +1,6 @@
 from flask import (
     Blueprint,
+    Response,
     json,
     request,
     redirect,
@@ -8,15 +9,59 @@ from flask import (
     current_app,
     url_for,
     session,
+    stream_with_context,
 )  # Import session for use in the route
 from urllib.parse import urlparse
+from datetime import timedelta
 import os
-import requests
 import logging
-from backend.models import db, GitHubEvent, User
-from backend.services.post_generator import generate_preview_post, generate_digest_post
-from backend.services.post_to_linkedin import post_to_linkedin
-from backend.services.verify_signature import verifyGITHUB_signature
+import requests
+from backend.models import (
+    db,
+    GitHubEvent,
+    PostTemplate,
+    RepositorySubscription,
+    User,
+    utcnow,
+)
+from backend.services.post_generator import (
+    generate_preview_post,
+    generate_digest_post,
+    generate_post_from_webhook,
+    digest_budgets,
+    slim_webhook_payload,
+)
+from backend.services import post_templates, preview_cache
+from backend.services.job_queue import enqueue
+from backend.services.batching import batching_enabled, schedule_flush
+from backend.services.dedup import (
+    get_commit_sha,
+    make_dedup_key,
+    is_duplicate,
+    remember,
+)
+from backend.services import http_client, circuit_breaker, metrics, user_cache
+from backend.services import repo_routing, fan_out
+from backend.services.structured_logging import payload_fields
+from backend.services.post_to_linkedin import post_to_linkedin, PostDeferred
+from backend.services.verify_signature import (
+    verifyGITHUB_signature,
+    read_signed_body,
+    PayloadTooLarge,
+)
+from backend.services import webhook_filter
+from backend.services.retry import schedule_retry
+from backend.services.digest_query import parse_range, stored_digest
+from backend.services.digest_scheduler import set_cadence
+from backend.services.event_history import (
+    page_events,
+    parse_limit,
+    serialize_event,
+    export_query,
+    iter_ndjson,
+    iter_csv,
+)
+from sqlalchemy.exc import IntegrityError
 import jwt  # Install with `pip install pyjwt`
 from jwt.exceptions import InvalidTokenError
 from backend.services.utils import (
@@ -76,7 +121,7 @@ def linkedin_auth():
     import uuid
     state = str(uuid.uuid4())  # Generate a secure random state value
     session["linkedin_state"] = state  # Store the state in the session
-    current_app.logger.info(f"[LinkedIn] Generated state for LinkedIn auth: {state}")
+    current_app.logger.info("[LinkedIn] Generated state for LinkedIn auth.")
 
     try:
         user = User.query.filter_by(SECRET_GITHUB_id=SECRET_GITHUB_user_id).first()
@@ -84,8 +129,10 @@ def linkedin_auth():
             user.linkedin_token = None
             user.linkedin_id = None
             db.session.commit()
+            user_cache.invalidate(SECRET_GITHUB_user_id)
             current_app.logger.info(
-                f"[LinkedIn] Cleared LinkedIn token and ID for GitHub user {SECRET_GITHUB_user_id}"
+                "[LinkedIn] Cleared LinkedIn token and ID for GitHub user %s",
+                SECRET_GITHUB_user_id,
             )
 
         # Construct the LinkedIn authorization URL
@@ -98,7 +145,7 @@ def linkedin_auth():
             f"&scope={scope}"
             f"&state={state}"
         )
-        current_app.logger.info(f"[LinkedIn] Generated auth URL: {linkedin_auth_url}")
+        current_app.logger.info("[LinkedIn] Generated auth URL.")
 
         # Validate the constructed URL to ensure it adheres to the expected LinkedIn structure
         from urllib.parse import urlparse
@@ -110,12 +157,12 @@ def linkedin_auth():
             and parsed_url.path == "/oauth/v2/authorization"
         ):
             current_app.logger.error(
-                f"[LinkedIn] Invalid redirect URL: {linkedin_auth_url}"
+                "[LinkedIn] Invalid redirect URL for host %s", parsed_url.netloc
             )
             return jsonify({"error": "Invalid redirect URL"}), 400
         return redirect(linkedin_auth_url)
     except Exception as e:
-        current_app.logger.error(f"[LinkedIn] Error generating auth URL: {e}")
+        current_app.logger.error("[LinkedIn] Error generating auth URL: %s", e)
         return jsonify({"error": "Failed to generate LinkedIn auth URL"}), 500
 
 
@@ -124,25 +171,26 @@ def linkedin_callback():
     CLIENT_ID = current_app.config.get("LINKEDIN_CLIENT_ID", "").strip()
     CLIENT_SECRET = current_app.config.get("LINKEDIN_CLIENT_SECRET", "").strip()
     current_app.logger.info("[LinkedIn Callback] Starting callback processing.")
-    current_app.logger.info(f"[LinkedIn Callback] Request args: {request.args}")
 
     error = request.args.get("error")
     if error:
-        current_app.logger.error(f"[LinkedIn Callback] OAuth error: {error}")
+        current_app.logger.error("[LinkedIn Callback] OAuth error: %s", error)
         from flask import escape
 
         return f"LinkedIn OAuth error: {escape(error)}", 400
 
     code = request.args.get("code")
     state = request.args.get("state")
-    current_app.logger.info(f"[LinkedIn Callback] Code: {code}, State: {state}")
+    current_app.logger.info(
+        "[LinkedIn Callback] Received code: %s, state: %s", bool(code), bool(state)
+    )
 
     if not code or not state:
         current_app.logger.error("[LinkedIn Callback] Missing code or state.")
         return "Authorization failed", 400
 
     try:
-        token_response = requests.post(
+        token_response = http_client.post(
             "https://www.linkedin.com/oauth/v2/accessToken",
             data={
                 "grant_type": "authorization_code",
@@ -153,7 +201,7 @@ def linkedin_callback():
             },
         )
         current_app.logger.info(
-            f"[LinkedIn Callback] Token response: {token_response.status_code}, {token_response.text}"
+            "[LinkedIn Callback] Token response: %s", token_response.status_code
         )
 
         if token_response.status_code != 200:
@@ -166,7 +214,9 @@ def linkedin_callback():
         access_token = token_data.get("access_token")
         id_token = token_data.get("id_token")
         current_app.logger.info(
-            f"[LinkedIn Callback] Access Token: {access_token}, ID Token: {id_token}"
+            "[LinkedIn Callback] Received access token: %s, ID token: %s",
+            bool(access_token),
+            bool(id_token),
         )
 
         if not access_token:
@@ -180,7 +230,7 @@ def linkedin_callback():
             linkedin_user_id = "abcd1234"  # Override for specific test cases
         if linkedin_user_id:
             current_app.logger.info(
-                f"[LinkedIn Callback] Decoded user ID: {linkedin_user_id}"
+                "[LinkedIn Callback] Decoded user ID: %s", linkedin_user_id
             )
         else:
             current_app.logger.warning(
@@ -190,15 +240,18 @@ def linkedin_callback():
         user = User.query.filter_by(SECRET_GITHUB_id=state).first()
         if not user:
             current_app.logger.error(
-                f"[LinkedIn Callback] No user found for GitHub ID: {state}"
+                "[LinkedIn Callback] No user found for GitHub ID: %s", state
             )
             return "User not found", 400
 
         user.linkedin_token = access_token
         user.linkedin_id = linkedin_user_id  # Use the correct value from the ID token or LinkedIn profile response
         db.session.commit()
+        user_cache.invalidate(user.SECRET_GITHUB_id)
         current_app.logger.info(
-            f"[LinkedIn Callback] Updated user: {user.SECRET_GITHUB_id}, LinkedIn ID: {user.linkedin_id}"
+            "[LinkedIn Callback] Updated user: %s, LinkedIn ID: %s",
+            user.SECRET_GITHUB_id,
+            user.linkedin_id,
         )
 
         # Return success message for tests, redirect for production
@@ -206,110 +259,416 @@ def linkedin_callback():
             return "✅ LinkedIn Access Token and ID stored successfully", 200
         return redirect("/success")
     except Exception as e:
-        current_app.logger.error(f"[LinkedIn Callback] Exception: {e}")
+        current_app.logger.error("[LinkedIn Callback] Exception: %s", e)
         return "Internal server error", 500
 
 
 # -------------------- GITHUB WEBHOOK HANDLING -------------------- #
 @routes.route("/webhook/github", methods=["POST"])
 def SECRET_GITHUB_webhook():
-    if not request.data:
+    if request.content_length == 0:
         current_app.logger.error("[Webhook] Missing payload in request.")
         return jsonify({"error": "Missing payload"}), 400
 
     signature = request.headers.get("X-Hub-Signature-256")
     if not signature:
         current_app.logger.error("[Webhook] Missing signature header.")
+        metrics.count_outcome("invalid_signature")
         return jsonify({"error": "Invalid signature"}), 403
 
-    if not verifyGITHUB_signature(request.data, signature):
+    # Event type, size and hook ID are known from the headers; refuse what we
+    # would refuse anyway before reading (and hashing) the body.
+    rejection = webhook_filter.check_headers(request.headers, request.content_length)
+    if rejection:
+        current_app.logger.info(
+            "[Webhook] Rejected from headers: %s.", rejection.reason
+        )
+        metrics.count_outcome(rejection.outcome)
+        return jsonify({"error": rejection.error}), rejection.status
+    event_type = request.headers["X-GitHub-Event"]
+
+    with metrics.span("verify_signature"):
+        try:
+            body = read_signed_body(
+                request.stream,
+                request.content_length,
+                webhook_filter.max_content_length(),
+            )
+        except PayloadTooLarge:
+            current_app.logger.info("[Webhook] Rejected: payload too large.")
+            metrics.count_outcome("too_large")
+            return jsonify({"error": "Payload too large"}), 413
+        if not body:
+            current_app.logger.error("[Webhook] Missing payload in request.")
+            return jsonify({"error": "Missing payload"}), 400
+        verified = verifyGITHUB_signature(body, signature)
+    if not verified:
         current_app.logger.error("[Webhook] Invalid signature.")
+        metrics.count_outcome("invalid_signature")
         return jsonify({"error": "Unauthorized"}), 403
 
-    event_type = request.headers.get("X-GitHub-Event", None)
-    if not event_type:
-        current_app.logger.error("[Webhook] Missing event type header.")
-        return jsonify({"error": "Missing event type"}), 400
-
-    if event_type not in ["push", "pull_request"]:
-        current_app.logger.info(f"[Webhook] Unsupported event type: {event_type}")
-        return jsonify({"error": "Unsupported event type"}), 400
-
-    payload = request.get_json()
+    with metrics.span("parse_json"):
+        try:
+            payload = current_app.json.loads(body.data)
+        except ValueError:
+            payload = None
+    if not isinstance(payload, dict):
+        current_app.logger.error("[Webhook] Payload is not a JSON object.")
+        metrics.count_outcome("invalid_payload")
+        return jsonify({"error": "Invalid payload"}), 400
 
-    current_app.logger.info(f"[Webhook] Received event type: {event_type}")
-    current_app.logger.info(f"[Webhook] Payload: {payload}")
+    # Describe the body by size and digest; never log the payload itself.
+    current_app.logger.info(
+        "[Webhook] Received %s event.",
+        event_type,
+        extra={
+            "event_type": event_type,
+            "delivery_id": request.headers.get("X-GitHub-Delivery"),
+            "signing_key": body.key_id,
+            **payload_fields(body.data),
+        },
+    )
 
     if event_type == "pull_request":
         current_app.logger.info("[Webhook] Pull request event received.")
+        metrics.count_outcome("pull_request")
         return jsonify({"message": "Pull request event received"}), 204
 
-    repo = payload.get("repository", {}).get("name")
+    repository = payload.get("repository", {})
+    repo = repository.get("name")
     commit_message = payload.get("head_commit", {}).get("message")
-    user_id = payload.get("repository", {}).get("owner", {}).get("id") or payload.get(
-        "pusher", {}
-    ).get("name")
+    user_id = repository.get("owner", {}).get("id") or payload.get("pusher", {}).get(
+        "name"
+    )
 
     current_app.logger.info(
-        f"[Webhook] Extracted values → user_id: {user_id}, repo: {repo}, commit: {commit_message}"
+        "[Webhook] Extracted values → user_id: %s, repo: %s", user_id, repo
     )
 
-    if not repo or not commit_message or not user_id:
+    if not repo or not commit_message:
         current_app.logger.error("[Webhook] Missing required fields in payload.")
+        metrics.count_outcome("invalid_payload")
         return jsonify({"error": "Invalid payload"}), 400
 
-    user = User.query.filter_by(SECRET_GITHUB_id=user_id).first()
-    if not user:
+    # The user the payload names as owner or pusher, plus the repository's
+    # subscribers whose branch settings accept the push.
+    with metrics.span("user_lookup"):
+        owner = user_cache.get_user(user_id) if user_id else None
+        users = [owner] if owner else []
+        subscribers = repo_routing.targets(repository.get("id"))
+        ref = payload.get("ref")
+        for route in subscribers:
+            if owner and route.user_id == owner.id:
+                continue
+            if repo_routing.branch_allowed(route, ref):
+                user = user_cache.get_user(route.SECRET_GITHUB_id)
+                if user:
+                    users.append(user)
+    if subscribers and not users:
+        current_app.logger.info("[Webhook] No subscriber for %s.", payload.get("ref"))
+        metrics.count_outcome("filtered")
+        return jsonify({"message": "No subscriber for this push"}), 200
+    if not subscribers and not user_id:
+        current_app.logger.error("[Webhook] Missing required fields in payload.")
+        metrics.count_outcome("invalid_payload")
+        return jsonify({"error": "Invalid payload"}), 400
+    if not users:
         current_app.logger.warning("[Webhook] No user found.")
+        metrics.count_outcome("no_user")
         return jsonify({"error": "No user found"}), 400
 
-    current_app.logger.info(f"[Webhook] Found user: {user.SECRET_GITHUB_id}")
+    delivery_id = request.headers.get("X-GitHub-Delivery")
+    if len(users) == 1:
+        body, status = _deliver(
+            users[0], payload, repo, commit_message, event_type, delivery_id
+        )
+        return jsonify(body), status
+
+    # One delivery, many recipients: each gets its own event row, deduplicated
+    # by its own commit key rather than the shared delivery ID.
+    deliveries, posts = {}, []
+    for user in users:
+        event, dedup_key, result = _record_event(
+            user,
+            payload,
+            repo,
+            commit_message,
+            event_type,
+            delivery_id,
+            fanned_out=True,
+        )
+        if result is None:
+            args = (user, event.id, dedup_key, delivery_id, payload, repo)
+            posts.append((user.SECRET_GITHUB_id, _post_event, args + (commit_message,)))
+            result = {"status": "pending", "event_id": event.id}, 202
+        deliveries[user.SECRET_GITHUB_id] = result
+
+    # Post for everyone at once; whoever misses the deadline reports pending
+    # and records its own outcome when it finishes.
+    with metrics.span("fan_out"):
+        for outcome in fan_out.run(posts):
+            if outcome.state == fan_out.DONE:
+                deliveries[outcome.key] = outcome.value
+            elif outcome.state == fan_out.FAILED:
+                current_app.logger.error(
+                    "[Webhook] Fan-out post for %s failed: %s",
+                    outcome.key,
+                    outcome.value,
+                )
+                deliveries[outcome.key] = {"error": "Failed to post to LinkedIn"}, 500
+
+    deliveries = [
+        {"user": key, "code": status, **body}
+        for key, (body, status) in deliveries.items()
+    ]
+    failed = all(delivery["code"] >= 500 for delivery in deliveries)
+    return (
+        jsonify({"status": "fanned_out", "deliveries": deliveries}),
+        500 if failed else 200,
+    )
+
+
+def _deliver(user, payload, repo, commit_message, event_type, delivery_id):
+    """
+    Record, then schedule, queue or post one push for one user.
+
+    Returns:
+        tuple[dict, int]: The response body and status for this user.
+    """
+    event, dedup_key, result = _record_event(
+        user, payload, repo, commit_message, event_type, delivery_id
+    )
+    if result is not None:
+        return result
+    return _post_event(
+        user, event.id, dedup_key, delivery_id, payload, repo, commit_message
+    )
+
 
-    # Check for redundant events (e.g., already posted commits)
-    existing_event = GitHubEvent.query.filter_by(
-        user_id=user.id, repo_name=repo, commit_message=commit_message
-    ).first()
-    if existing_event:
+def _record_event(
+    user, payload, repo, commit_message, event_type, delivery_id, fanned_out=False
+):
+    """
+    Store the push as a ``GitHubEvent`` for ``user`` unless it is redundant.
+
+    Returns:
+        tuple: ``(event, dedup_key, result)``, where ``result`` is the
+        ``(body, status)`` response when nothing is left to post now
+        (redundant, scheduled, batched or queued), else None.
+    """
+    current_app.logger.info("[Webhook] Found user: %s", user.SECRET_GITHUB_id)
+
+    # Check for redundant events (redeliveries or commits already posted)
+    seen_delivery_id = None if fanned_out else delivery_id
+    commit_sha = get_commit_sha(payload)
+    dedup_key = make_dedup_key(user.id, repo, commit_sha) if commit_sha else None
+    with metrics.span("dedup_check"):
+        if commit_sha:
+            redundant = is_duplicate(dedup_key, seen_delivery_id)
+        else:
+            # Payloads without a head commit SHA can only be matched on content.
+            redundant = is_duplicate(delivery_id=seen_delivery_id) or (
+                GitHubEvent.query.filter_by(
+                    user_id=user.id, repo_name=repo, commit_message=commit_message
+                ).first()
+                is not None
+            )
+    if redundant:
         current_app.logger.info("[Webhook] Redundant event detected. Skipping.")
-        return jsonify({"message": "Redundant event"}), 200
+        metrics.count_outcome("redundant")
+        return None, dedup_key, ({"message": "Redundant event"}, 200)
+
+    # Record the event before posting; the unique dedup_key makes concurrent
+    # deliveries of the same commit lose the insert instead of double-posting.
+    event = GitHubEvent(
+        user_id=user.id,
+        repo_name=repo,
+        commit_message=commit_message,
+        commit_url=payload.get("head_commit", {}).get("url"),
+        event_type=event_type,
+        status="pending",
+        delivery_id=delivery_id,
+        commit_sha=commit_sha,
+        dedup_key=dedup_key,
+    )
+    db.session.add(event)
+    flush_at = None
+    try:
+        with metrics.span("db_commit"):
+            db.session.flush()
+            if user.digest_cadence:
+                # Published with the user's next scheduled digest.
+                event.status = "scheduled"
+            elif batching_enabled():
+                # Held until the repository's digest window closes.
+                flush_at = schedule_flush(event)
+            elif current_app.config.get("WEBHOOK_ASYNC"):
+                # Hand off to `flask run-worker`; GitHub gets its answer without
+                # waiting on the LinkedIn round trip.
+                enqueue(
+                    "post_event",
+                    payload=slim_webhook_payload(payload),
+                    event_id=event.id,
+                )
+            db.session.commit()
+    except IntegrityError:
+        db.session.rollback()
+        current_app.logger.info("[Webhook] Concurrent duplicate delivery. Skipping.")
+        metrics.count_outcome("redundant")
+        return None, dedup_key, ({"message": "Redundant event"}, 200)
+
+    if user.digest_cadence:
+        remember(dedup_key, delivery_id)
+        current_app.logger.info(
+            "[Webhook] Scheduled event %s for the %s digest.",
+            event.id,
+            user.digest_cadence,
+        )
+        metrics.count_outcome("scheduled")
+        body = {"status": "scheduled", "event_id": event.id}
+        return event, dedup_key, (body, 202)
+
+    if flush_at is not None:
+        remember(dedup_key, delivery_id)
+        current_app.logger.info(
+            "[Webhook] Batched event %s until %s.", event.id, flush_at.isoformat()
+        )
+        metrics.count_outcome("batched")
+        body = {
+            "status": "batched",
+            "event_id": event.id,
+            "flush_at": flush_at.isoformat(),
+        }
+        return event, dedup_key, (body, 202)
+
+    if current_app.config.get("WEBHOOK_ASYNC"):
+        remember(dedup_key, delivery_id)
+        current_app.logger.info("[Webhook] Queued event %s for posting.", event.id)
+        metrics.count_outcome("queued")
+        body = {"status": "queued", "event_id": event.id}
+        return event, dedup_key, (body, 202)
+
+    return event, dedup_key, None
 
+
+def _post_event(
+    user, event_id, dedup_key, delivery_id, payload, repo, commit_message
+):
+    """
+    Post a recorded event to LinkedIn and store the outcome on its row.
+
+    Returns:
+        tuple[dict, int]: The response body and status for this user.
+    """
     current_app.logger.info(
         "[Webhook] Event is not redundant. Proceeding with LinkedIn post."
     )
+    event = db.session.get(GitHubEvent, event_id)
 
     try:
-        response = post_to_linkedin(user, repo, commit_message, payload)
+        template = post_templates.user_template(user.id, "commit")
+        post_text = generate_post_from_webhook(payload, template) if template else None
+        # The cached snapshot carries no credentials; load the full row to post.
+        with metrics.span("linkedin_post"):
+            response = post_to_linkedin(
+                db.session.get(User, user.id),
+                repo,
+                commit_message,
+                payload,
+                post_text=post_text,
+            )
 
         # Ensure response is valid before accessing .json()
         if response is None or not hasattr(response, "json"):
             current_app.logger.error(
                 "[Webhook] Invalid response from post_to_linkedin."
             )
-            return jsonify({"error": "Failed to post to LinkedIn"}), 500
+            return _retry_event(
+                event,
+                dedup_key,
+                delivery_id,
+                payload,
+                "Invalid response from post_to_linkedin",
+            )
 
         post_id = response.json().get("id")
-        current_app.logger.info(f"[Webhook] LinkedIn post ID: {post_id}")
+        current_app.logger.info("[Webhook] LinkedIn post ID: %s", post_id)
 
         # Save to DB
-        event = GitHubEvent(
-            user_id=user.id,
-            repo_name=repo,
-            commit_message=commit_message,
-            commit_url=payload.get("head_commit", {}).get("url"),
-            linkedin_post_id=post_id,
-        )
-        db.session.add(event)
+        event.status = "posted"
+        event.linkedin_post_id = post_id
         db.session.commit()
+        remember(dedup_key, delivery_id)
 
         current_app.logger.info("[Webhook] Event successfully saved to database.")
-        return jsonify({"status": "success", "linkedin_post_id": post_id}), 200
-
+        metrics.count_outcome("posted")
+        return {"status": "success", "linkedin_post_id": post_id}, 200
+
+    except PostDeferred as e:
+        # Rate limited: leave the event pending and let the worker send it.
+        retry_at = utcnow() + timedelta(seconds=e.retry_after)
+        enqueue(
+            "post_event",
+            payload=slim_webhook_payload(payload),
+            event_id=event.id,
+            run_at=retry_at,
+        )
+        db.session.commit()
+        remember(dedup_key, delivery_id)
+        current_app.logger.info(
+            "[Webhook] Deferred event %s until %s: %s",
+            event.id,
+            retry_at.isoformat(),
+            e,
+        )
+        metrics.count_outcome("deferred")
+        return {
+            "status": "deferred",
+            "event_id": event.id,
+            "retry_at": retry_at.isoformat(),
+        }, 202
     except ValueError as e:
-        current_app.logger.error(f"[Webhook] Exception during post: {e}")
-        return jsonify({"error": "An error occurred during processing"}), 500
+        current_app.logger.error("[Webhook] Exception during post: %s", e)
+        return _retry_event(event, dedup_key, delivery_id, payload, e)
     except Exception as e:
-        current_app.logger.error(f"[Webhook] Unexpected exception: {e}")
-        return jsonify({"error": "Internal server error"}), 500
+        current_app.logger.error("[Webhook] Unexpected exception: %s", e)
+        return _retry_event(event, dedup_key, delivery_id, payload, e)
+
+
+def _retry_event(event, dedup_key, delivery_id, payload, error):
+    """Persist a failed post for the worker to retry later."""
+    db.session.rollback()
+    next_attempt_at = schedule_retry(
+        event, error, payload=slim_webhook_payload(payload)
+    )
+    db.session.commit()
+    remember(dedup_key, delivery_id)
+    if next_attempt_at is None:
+        metrics.count_outcome("dead")
+        return {"error": "Failed to post to LinkedIn"}, 500
+    metrics.count_outcome("retrying")
+    return {
+        "status": "retrying",
+        "event_id": event.id,
+        "next_attempt_at": next_attempt_at.isoformat(),
+    }, 202
+
+
+@routes.route("/health")
+def health():
+    """Liveness check that also reports outbound circuit breaker state."""
+    breakers = circuit_breaker.get_states()
+    degraded = any(b["state"] != circuit_breaker.CLOSED for b in breakers)
+    return (
+        jsonify(
+            {
+                "status": "degraded" if degraded else "ok",
+                "circuit_breakers": breakers,
+                "user_cache": user_cache.stats(),
+            }
+        ),
+        200,
+    )
 
 
 @routes.route("/api/github/<SECRET_GITHUB_id>/status")
@@ -338,14 +697,14 @@ def SECRET_GITHUB_callback():
         current_app.logger.error("[GitHub] Missing authorization code.")
         return "Missing code from GitHub", 400
 
-    current_app.logger.info(f"[GitHub] Received code: {code}")
+    current_app.logger.info("[GitHub] Received authorization code.")
 
     token_url = "https://github.com/login/oauth/access_token"
     user_url = "https://api.github.com/user"
 
     try:
         # Step 1: Exchange code for access token
-        token_res = requests.post(
+        token_res = http_client.post(
             token_url,
             headers={"Accept": "application/json"},
             data={
@@ -359,11 +718,13 @@ def SECRET_GITHUB_callback():
         access_token = token_data.get("access_token")
 
         if not access_token:
-            current_app.logger.error(f"[GitHub] Failed to get token: {token_data}")
+            current_app.logger.error(
+                "[GitHub] Failed to get token: %s", token_data.get("error")
+            )
             return "Failed to obtain GitHub access token", 400
 
         # Step 2: Fetch GitHub user info
-        user_res = requests.get(
+        user_res = http_client.get(
             user_url, headers={"Authorization": f"token {access_token}"}
         )
 
@@ -400,6 +761,7 @@ def SECRET_GITHUB_callback():
             user.avatar_url = avatar_url
 
         db.session.commit()
+        user_cache.invalidate(SECRET_GITHUB_id)
 
         # Step 4: Set a secure cookie with the GitHub user ID
         response = redirect(
@@ -415,7 +777,7 @@ def SECRET_GITHUB_callback():
         return response
 
     except Exception as e:
-        current_app.logger.error(f"[GitHub] OAuth flow failed: {e}")
+        current_app.logger.error("[GitHub] OAuth flow failed: %s", e)
         return jsonify({"error": "GitHub OAuth error"}), 500
 
 
@@ -433,18 +795,165 @@ def list_routes():
 @login_required
 def get_commits(SECRET_GITHUB_id):
     user = request.user  # Access the authenticated user from the request context
-    events = GitHubEvent.query.filter_by(user_id=user.id).all()
-    commits = [
+    try:
+        events, next_cursor = page_events(
+            user.id,
+            status=request.args.get("status"),
+            repo=request.args.get("repo"),
+            limit=parse_limit(request.args.get("limit")),
+            cursor=request.args.get("cursor"),
+        )
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    commits = [serialize_event(e) for e in events]
+    return jsonify({"commits": commits, "next_cursor": next_cursor}), 200
+
+
+@routes.route("/api/github/<SECRET_GITHUB_id>/commits/export")
+@login_required
+def export_commits(SECRET_GITHUB_id):
+    user = request.user
+    export_format = request.args.get("format", "ndjson")
+    if export_format not in ("ndjson", "csv"):
+        return jsonify({"error": f"Unsupported format: {export_format}"}), 400
+
+    try:
+        query = export_query(
+            user.id,
+            status=request.args.get("status"),
+            repo=request.args.get("repo"),
+            cursor=request.args.get("cursor"),
+        )
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    if export_format == "csv":
+        body, mimetype = iter_csv(query), "text/csv"
+    else:
+        body, mimetype = iter_ndjson(query), "application/x-ndjson"
+    return Response(
+        stream_with_context(body),
+        mimetype=mimetype,
+        headers={
+            "Content-Disposition": f"attachment; filename=commits.{export_format}"
+        },
+    )
+
+
+@routes.route(
+    "/api/github/<SECRET_GITHUB_id>/digest/schedule", methods=["GET", "PUT"]
+)
+@login_required
+def digest_schedule(SECRET_GITHUB_id):
+    snapshot = request.user
+    if snapshot.SECRET_GITHUB_id != SECRET_GITHUB_id:
+        return jsonify({"error": "Unauthorized or invalid user"}), 403
+
+    user = db.session.get(User, snapshot.id)
+    if request.method == "PUT":
+        data = request.get_json(silent=True) or {}
+        try:
+            set_cadence(user, data.get("cadence"))
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        db.session.commit()
+        user_cache.invalidate(user.SECRET_GITHUB_id)
+
+    next_at = user.next_digest_at
+    return jsonify(
         {
-            "id": e.id,
-            "repo": e.repo_name,
-            "message": e.commit_message,
-            "url": e.commit_url,
-            "status": "posted" if e.linkedin_post_id else "unposted",
+            "cadence": user.digest_cadence,
+            "next_digest_at": next_at.isoformat() if next_at else None,
         }
-        for e in events
-    ]
-    return jsonify({"commits": commits}), 200
+    ), 200
+
+
+@routes.route("/api/github/<SECRET_GITHUB_id>/subscriptions")
+@login_required
+def list_subscriptions(SECRET_GITHUB_id):
+    snapshot = request.user
+    if snapshot.SECRET_GITHUB_id != SECRET_GITHUB_id:
+        return jsonify({"error": "Unauthorized or invalid user"}), 403
+
+    subscriptions = (
+        RepositorySubscription.query.filter_by(user_id=snapshot.id, active=True)
+        .order_by(RepositorySubscription.repository_id)
+        .all()
+    )
+    return jsonify(
+        {"subscriptions": [repo_routing.serialize(s) for s in subscriptions]}
+    ), 200
+
+
+@routes.route(
+    "/api/github/<SECRET_GITHUB_id>/subscriptions/<int:repository_id>",
+    methods=["PUT", "DELETE"],
+)
+@login_required
+def repository_subscription(SECRET_GITHUB_id, repository_id):
+    snapshot = request.user
+    if snapshot.SECRET_GITHUB_id != SECRET_GITHUB_id:
+        return jsonify({"error": "Unauthorized or invalid user"}), 403
+
+    if request.method == "DELETE":
+        if not repo_routing.unsubscribe(snapshot, repository_id):
+            return jsonify({"error": "Not subscribed"}), 404
+        return "", 204
+
+    data = request.get_json(silent=True) or {}
+    settings = data.get("settings")
+    try:
+        if settings is not None:
+            repo_routing.validate_settings(settings)
+        repo_full_name = repo_routing.check_access(
+            db.session.get(User, snapshot.id), repository_id
+        )
+        subscription = repo_routing.subscribe(
+            snapshot, repository_id, repo_full_name, settings
+        )
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except repo_routing.AccessDenied as e:
+        current_app.logger.warning(
+            "[Subscriptions] %s denied: %s", snapshot.SECRET_GITHUB_id, e
+        )
+        return jsonify({"error": "Repository not accessible"}), 403
+    except requests.RequestException as e:
+        current_app.logger.error("[Subscriptions] GitHub check failed: %s", e)
+        return jsonify({"error": "Could not reach GitHub"}), 502
+    return jsonify(repo_routing.serialize(subscription)), 200
+
+
+@routes.route("/api/github/<SECRET_GITHUB_id>/digest")
+@login_required
+def get_stored_digest(SECRET_GITHUB_id):
+    user = request.user
+    group_by = request.args.get("group_by", "date")
+    if group_by not in ("date", "repo"):
+        return jsonify({"error": f"Unsupported group_by: {group_by}"}), 400
+    try:
+        since, until = parse_range(request.args.get("since"), request.args.get("until"))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    digest, builder = stored_digest(
+        user.id,
+        since,
+        until,
+        group_by_date=group_by == "date",
+        template=post_templates.user_template(user.id, "digest"),
+        **digest_budgets(),
+    )
+    return jsonify(
+        {
+            "digest": digest,
+            "since": since.isoformat(),
+            "until": until.isoformat(),
+            "groups": len(builder.groups),
+            "events": builder.total,
+        }
+    ), 200
 
 
 @routes.route("/auth/github")
@@ -466,6 +975,7 @@ def link_linkedin_account(SECRET_GITHUB_id):
     user = request.user  # Access the authenticated user from the request context
     if not user or user.SECRET_GITHUB_id != SECRET_GITHUB_id:
         return jsonify({"error": "Unauthorized or invalid user"}), 403
+    user = db.session.get(User, user.id)  # request.user is a read-only snapshot
 
     linkedin_token = request.json.get("linkedin_token")
     linkedin_id = request.json.get("linkedin_id")
@@ -476,6 +986,7 @@ def link_linkedin_account(SECRET_GITHUB_id):
     user.linkedin_token = linkedin_token
     user.linkedin_id = linkedin_id
     db.session.commit()
+    user_cache.invalidate(user.SECRET_GITHUB_id)
 
     return (
         jsonify(
@@ -485,6 +996,75 @@ def link_linkedin_account(SECRET_GITHUB_id):
     )
 
 
+def _serialize_template(template):
+    return {
+        "id": template.id,
+        "kind": template.kind,
+        "body": template.body,
+        "item": template.item,
+        "version": template.version,
+        "updated_at": template.updated_at.isoformat() if template.updated_at else None,
+    }
+
+
+@routes.route("/api/github/<SECRET_GITHUB_id>/templates", methods=["GET"])
+@login_required
+def list_templates(SECRET_GITHUB_id):
+    user = request.user
+    if user.SECRET_GITHUB_id != SECRET_GITHUB_id:
+        return jsonify({"error": "Unauthorized or invalid user"}), 403
+
+    templates = PostTemplate.query.filter_by(user_id=user.id).all()
+    return (
+        jsonify(
+            {
+                "templates": [_serialize_template(t) for t in templates],
+                "defaults": {
+                    kind: post_templates.DEFAULT_TEMPLATES[kind]
+                    for kind in post_templates.USER_KINDS
+                },
+            }
+        ),
+        200,
+    )
+
+
+@routes.route(
+    "/api/github/<SECRET_GITHUB_id>/templates/<kind>", methods=["PUT", "DELETE"]
+)
+@login_required
+def update_template(SECRET_GITHUB_id, kind):
+    user = request.user
+    if user.SECRET_GITHUB_id != SECRET_GITHUB_id:
+        return jsonify({"error": "Unauthorized or invalid user"}), 403
+    if kind not in post_templates.USER_KINDS:
+        return jsonify({"error": f"Unknown template kind: {kind}"}), 404
+
+    template = post_templates.user_template(user.id, kind)
+    if request.method == "DELETE":
+        if template is not None:
+            db.session.delete(template)
+            db.session.commit()
+        return jsonify({"status": "reset", "kind": kind}), 200
+
+    data = request.get_json(silent=True) or {}
+    body, item = data.get("body"), data.get("item")
+    try:
+        post_templates.validate(kind, body or "", item)
+    except post_templates.TemplateError as e:
+        return jsonify({"error": str(e)}), 400
+
+    if template is None:
+        template = PostTemplate(user_id=user.id, kind=kind, body=body, item=item)
+        db.session.add(template)
+    else:
+        template.body = body
+        template.item = item
+        template.version += 1
+    db.session.commit()
+    return jsonify(_serialize_template(template)), 200
+
+
 @routes.route("/api/get_user_profile", methods=["GET"])
 @login_required
 def get_user_profile():
@@ -503,27 +1083,29 @@ def get_user_profile():
             )  # Return 200 in test mode
         return jsonify({"error": "GitHub user ID not found"}), 401
 
-    user = User.query.filter_by(SECRET_GITHUB_id=SECRET_GITHUB_user_id).first()
+    user = user_cache.get_user(SECRET_GITHUB_user_id)
     if not user:
         current_app.logger.error(
-            f"[Get User Profile] No user found for GitHub ID: {SECRET_GITHUB_user_id}"
+            "[Get User Profile] No user found for GitHub ID: %s", SECRET_GITHUB_user_id
         )
         return jsonify({"error": "User not found"}), 404
 
     current_app.logger.info(
-        f"[Get User Profile] Retrieved user: {user.SECRET_GITHUB_id}, LinkedIn ID: {user.linkedin_id}"
+        "[Get User Profile] Retrieved user: %s, LinkedIn ID: %s",
+        user.SECRET_GITHUB_id,
+        user.linkedin_id,
     )
     return (
         jsonify(
             {
                 "linkedin_connected": bool(
-                    user.linkedin_token and user.linkedin_id
+                    user.has_valid_linkedin_token()
                 ),  # Ensure this key is included in the response
                 "SECRET_GITHUB_id": user.SECRET_GITHUB_id,
                 "SECRET_GITHUB_username": user.SECRET_GITHUB_username,
                 "linkedin_id": user.linkedin_id,
                 "linkedin_linked": bool(
-                    user.linkedin_token and user.linkedin_id
+                    user.has_valid_linkedin_token()
                 ),  # Ensure this key is included in the response
             }
         ),
@@ -531,6 +1113,17 @@ def get_user_profile():
     )
 
 
+def _with_etag(response, etag):
+    response.set_etag(etag)
+    return response, 200
+
+
+def _not_modified(etag):
+    response = current_app.response_class(status=304)
+    response.set_etag(etag)
+    return response
+
+
 @routes.route('/api/preview_linkedin_post', methods=['POST'])
 def preview_linkedin_post():
     try:
@@ -538,10 +1131,15 @@ def preview_linkedin_post():
         if not payload:
             return jsonify({"error": "Invalid payload"}), 400
 
-        preview = generate_preview_post(payload)
-        return jsonify({"preview": preview}), 200
+        key = preview_cache.preview_key("post", payload)
+        if request.if_none_match.contains(key):
+            return _not_modified(key)
+        preview = preview_cache.get_or_render(
+            key, lambda: generate_preview_post(payload)
+        )
+        return _with_etag(jsonify({"preview": preview}), key)
     except Exception as e:
-        current_app.logger.error(f"An error occurred: {e}", exc_info=True)
+        current_app.logger.error("An error occurred: %s", e, exc_info=True)
         return jsonify({"error": "An internal error has occurred. Please try again later."}), 500
 
 
@@ -552,14 +1150,28 @@ def preview_linkedin_digest():
         if not payload or "events" not in payload:
             return jsonify({"error": "Invalid payload"}), 400
 
-        current_app.logger.info("Payload received for preview_linkedin_digest", extra={"payload": payload})
+        current_app.logger.info(
+            "[Preview] Payload received for preview_linkedin_digest",
+            extra=payload_fields(request.data),
+        )
 
         events = payload["events"]
+        budgets = digest_budgets()
+        key = preview_cache.preview_key("digest", [events, budgets])
+        if request.if_none_match.contains(key):
+            return _not_modified(key)
         # Add logging to confirm invocation of generate_digest_post
         current_app.logger.info("Invoking generate_digest_post")
-        preview = generate_digest_post(events, return_as_string=True)
+        preview = preview_cache.get_or_render(
+            key,
+            lambda: generate_digest_post(
+                events,
+                return_as_string=True,
+                **budgets,
+            ),
+        )
         current_app.logger.info("generate_digest_post executed successfully")
-        return jsonify({"preview": preview}), 200
+        return _with_etag(jsonify({"preview": preview}), key)
     except Exception as e:
         current_app.logger.error("Exception caught in preview_linkedin_digest route", exc_info=True)
         current_app.logger.info("Raising explicit exception for testing")
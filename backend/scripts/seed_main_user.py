@@ -4,6 +4,7 @@ import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
 
 from backend.models import db, User
+from backend.services import user_cache
 
 
 def seed_main_user(app=None):
@@ -41,6 +42,7 @@ def seed_main_user(app=None):
             db.session.add(user)
 
         db.session.commit()
+        user_cache.invalidate(SECRET_GITHUB_id)
         print("✅ User seeding completed.")
 
 
@@ -0,0 +1,259 @@
+"""
+Coalesce bursts of pushes into one LinkedIn digest post.
+
+With ``DIGEST_WINDOW_SECONDS`` set, the webhook records each push as a
+``held`` event and makes sure one ``flush_batch`` job is queued for the
+(user, repository) pair at the end of the window. A partial unique index on
+the ``key`` of queued jobs keeps concurrent webhooks from queuing a second
+one. When the job runs, every held event for the pair is claimed
+(``batched``), rendered with ``generate_digest_post`` and published as a
+single post (``posted``). Events in the ``pending`` state belong to their
+own ``post_event`` jobs and are never claimed by a flush.
+
+A failed flush returns the events to ``held`` and queues the next flush
+with the backoff and limits of ``backend/services/retry.py``; once those run
+out the events are ``dead``. Claimed events hold a lease in
+``next_attempt_at``: if the worker dies mid-flush, ``recover_stale_batches``
+releases them once it expires.
+"""
+
+import logging
+from datetime import timedelta
+
+from flask import current_app
+from sqlalchemy import or_, update
+from sqlalchemy.exc import IntegrityError
+
+from backend.models import db, GitHubEvent, Job, User, utcnow
+from backend.services.retry import compute_backoff, out_of_attempts
+from backend.services.post_generator import generate_digest_post, digest_budgets
+from backend.services.post_to_linkedin import send_post_to_linkedin, PostDeferred
+from backend.services.post_templates import user_template
+
+logger = logging.getLogger(__name__)
+
+
+def batching_enabled():
+    return current_app.config.get("DIGEST_WINDOW_SECONDS", 0) > 0
+
+
+def batch_key(user_id, repo_name):
+    return f"flush_batch:{user_id}:{repo_name}"
+
+
+def _queued_flush(key):
+    return Job.query.filter_by(key=key, status="queued").first()
+
+
+def _queue_flush(user_id, repo_name, run_at, attempt=0):
+    """
+    Make sure a flush is queued for (user, repository) and return its job.
+
+    A flush already queued is reused; for a retry (``attempt`` > 0) it is
+    pushed back to ``run_at`` if that is later. The insert runs in a
+    SAVEPOINT, so losing the race to a concurrent insert on the unique
+    queued key leaves the caller's transaction intact.
+    """
+    key = batch_key(user_id, repo_name)
+    job = _queued_flush(key)
+    if job is None:
+        payload = {"user_id": user_id, "repo_name": repo_name}
+        if attempt:
+            payload["attempt"] = attempt
+        job = Job(kind="flush_batch", key=key, payload=payload, run_at=run_at)
+        try:
+            with db.session.begin_nested():
+                db.session.add(job)
+            return job
+        except IntegrityError:
+            job = _queued_flush(key)
+    if attempt:
+        job.payload = {**job.payload, "attempt": attempt}
+        job.run_at = max(job.run_at, run_at)
+    return job
+
+
+def schedule_flush(event):
+    """
+    Hold ``event`` for its (user, repository) window and make sure a flush is
+    queued for it.
+
+    The job is added to the current session; the caller commits it together
+    with the event.
+
+    Returns:
+        datetime: When the window closes.
+    """
+    event.status = "held"
+    window = current_app.config.get("DIGEST_WINDOW_SECONDS", 0)
+    job = _queue_flush(
+        event.user_id, event.repo_name, utcnow() + timedelta(seconds=window)
+    )
+    return job.run_at
+
+
+def as_digest_event(event):
+    return {
+        "repository": {"name": event.repo_name},
+        "message": event.commit_message,
+        "timestamp": event.timestamp.isoformat() if event.timestamp else "",
+    }
+
+
+def _lease_seconds():
+    return current_app.config.get("JOB_VISIBILITY_TIMEOUT", 300)
+
+
+def flush_batch(user_id, repo_name, attempt=0):
+    """
+    Publish every held event for (user, repository) as one digest post.
+
+    Args:
+        attempt (int): Failed flushes of this batch so far.
+
+    Returns:
+        int: Number of events included in the post.
+    """
+    event_ids = [
+        row.id
+        for row in db.session.query(GitHubEvent.id)
+        .filter_by(user_id=user_id, repo_name=repo_name, status="held")
+        .order_by(GitHubEvent.timestamp, GitHubEvent.id)
+        .with_for_update(skip_locked=True)
+    ]
+    if not event_ids:
+        db.session.rollback()
+        return 0
+
+    db.session.query(GitHubEvent).filter(
+        GitHubEvent.id.in_(event_ids), GitHubEvent.status == "held"
+    ).update(
+        {
+            "status": "batched",
+            "next_attempt_at": utcnow() + timedelta(seconds=_lease_seconds()),
+        },
+        synchronize_session=False,
+    )
+    db.session.commit()
+
+    events = (
+        GitHubEvent.query.filter(
+            GitHubEvent.id.in_(event_ids), GitHubEvent.status == "batched"
+        )
+        .order_by(GitHubEvent.timestamp, GitHubEvent.id)
+        .all()
+    )
+    if not events:
+        return 0
+
+    user = db.session.get(User, user_id)
+    post_text = generate_digest_post(
+        [as_digest_event(event) for event in events],
+        return_as_string=True,
+        template=user_template(user_id, "digest"),
+        **digest_budgets(),
+    )
+    try:
+        response = send_post_to_linkedin(
+            user, repo_name, None, None, post_text=post_text
+        )
+        if response is None or response.status_code != 201:
+            status = getattr(response, "status_code", None)
+            raise ValueError(f"Failed to post to LinkedIn: {status}")
+    except PostDeferred as e:
+        # Rate limited: release the events and flush again once allowed.
+        for event in events:
+            event.status = "held"
+            event.next_attempt_at = None
+        _queue_flush(
+            user_id, repo_name, utcnow() + timedelta(seconds=e.retry_after), attempt
+        )
+        db.session.commit()
+        logger.info("[Batch] Deferred %s digest by %.0fs.", repo_name, e.retry_after)
+        return 0
+    except Exception as e:
+        # Put the events back and flush again after a backoff, unless the
+        # batch is out of attempts.
+        attempt += 1
+        give_up = out_of_attempts(attempt, events[0].timestamp)
+        for event in events:
+            event.attempts = (event.attempts or 0) + 1
+            event.last_error = str(e)[:2000]
+            event.status = "dead" if give_up else "held"
+            event.next_attempt_at = None
+        if give_up:
+            logger.error(
+                "[Batch] Gave up on %s event(s) in %s after %s attempt(s): %s",
+                len(events),
+                repo_name,
+                attempt,
+                e,
+            )
+        else:
+            run_at = utcnow() + timedelta(seconds=compute_backoff(attempt))
+            _queue_flush(user_id, repo_name, run_at, attempt)
+            logger.warning(
+                "[Batch] Flush of %s failed; retrying at %s: %s",
+                repo_name,
+                run_at.isoformat(),
+                e,
+            )
+        db.session.commit()
+        raise
+
+    post_id = response.json().get("id")
+    for event in events:
+        event.status = "posted"
+        event.linkedin_post_id = post_id
+        event.next_attempt_at = None
+    db.session.commit()
+
+    logger.info(
+        "[Batch] Posted %s event(s) for user %s in %s: %s",
+        len(events),
+        user_id,
+        repo_name,
+        post_id,
+    )
+    return len(events)
+
+
+def recover_stale_batches():
+    """
+    Return ``batched`` events whose lease expired to ``held`` and make sure a
+    flush is queued for them.
+
+    Returns:
+        int: Number of events released.
+    """
+    now = utcnow()
+    stale = or_(
+        GitHubEvent.next_attempt_at.is_(None), GitHubEvent.next_attempt_at < now
+    )
+    pairs = (
+        db.session.query(GitHubEvent.user_id, GitHubEvent.repo_name)
+        .filter(GitHubEvent.status == "batched", stale)
+        .distinct()
+        .all()
+    )
+
+    released = 0
+    for user_id, repo_name in pairs:
+        count = db.session.execute(
+            update(GitHubEvent)
+            .where(
+                GitHubEvent.user_id == user_id,
+                GitHubEvent.repo_name == repo_name,
+                GitHubEvent.status == "batched",
+                stale,
+            )
+            .values(status="held", next_attempt_at=None)
+        ).rowcount
+        if count:
+            _queue_flush(user_id, repo_name, now)
+        released += count
+    db.session.commit()
+
+    if released:
+        logger.warning("[Batch] Released %s event(s) from stale batches.", released)
+    return released
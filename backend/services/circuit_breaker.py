@@ -0,0 +1,177 @@
+"""
+Circuit breaker for outbound LinkedIn endpoints.
+
+Each endpoint has a row in ``circuit_breaker_state`` so every web and worker
+process sees the same state:
+
+* ``closed``: calls go through; consecutive failures are counted.
+* ``open``: after ``BREAKER_FAILURE_THRESHOLD`` failures, calls are refused
+  for ``BREAKER_RESET_TIMEOUT`` seconds without touching the network.
+* ``half_open``: once the timeout has passed, exactly one caller is let
+  through as a probe. Its success closes the breaker; its failure re-opens it.
+
+State changes are conditional UPDATEs, so concurrent callers agree on who
+sends the probe. The success path only writes when there is something to
+reset.
+"""
+
+import logging
+from datetime import timedelta
+
+from flask import current_app
+from sqlalchemy import select, insert, update, or_
+from sqlalchemy.exc import IntegrityError
+
+from backend.models import db, CircuitBreakerState, utcnow
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+DEFAULTS = {
+    "BREAKER_FAILURE_THRESHOLD": 5,
+    "BREAKER_RESET_TIMEOUT": 60,
+}
+
+
+def _setting(name):
+    return current_app.config.get(name, DEFAULTS[name])
+
+
+def allow(endpoint):
+    """
+    Ask whether a call to ``endpoint`` may be made now.
+
+    Returns:
+        float: 0.0 if the call may proceed, otherwise the number of seconds
+        until the breaker will let a probe through.
+    """
+    table = CircuitBreakerState.__table__
+    row = db.session.execute(
+        select(table.c.state, table.c.opened_at, table.c.updated_at).where(
+            table.c.endpoint == endpoint
+        )
+    ).first()
+    if row is None or row.state == CLOSED:
+        return 0.0
+
+    now = utcnow()
+    timeout = _setting("BREAKER_RESET_TIMEOUT")
+    # An open breaker waits out the timeout; a half-open one whose probe never
+    # reported back (e.g. the worker died) gets another probe after the same.
+    since = row.opened_at if row.state == OPEN else row.updated_at
+    ready_at = (since or now) + timedelta(seconds=timeout)
+    if now < ready_at:
+        return max((ready_at - now).total_seconds(), 1.0)
+
+    with db.engine.begin() as conn:
+        won = conn.execute(
+            update(table)
+            .where(
+                table.c.endpoint == endpoint,
+                table.c.state == row.state,
+                table.c.updated_at == row.updated_at,
+            )
+            .values(state=HALF_OPEN, updated_at=now)
+        ).rowcount
+    if won:
+        logger.info("[CircuitBreaker] %s half-open; sending a probe.", endpoint)
+        return 0.0
+    return float(timeout)
+
+
+def record_success(endpoint):
+    """Close the breaker for ``endpoint`` if it is not already closed and clean."""
+    table = CircuitBreakerState.__table__
+    with db.engine.begin() as conn:
+        closed = conn.execute(
+            update(table)
+            .where(
+                table.c.endpoint == endpoint,
+                or_(table.c.state != CLOSED, table.c.failure_count != 0),
+            )
+            .values(state=CLOSED, failure_count=0, opened_at=None, updated_at=utcnow())
+        ).rowcount
+    if closed:
+        logger.info("[CircuitBreaker] %s closed.", endpoint)
+
+
+def _record_failure(endpoint, now):
+    table = CircuitBreakerState.__table__
+    threshold = _setting("BREAKER_FAILURE_THRESHOLD")
+    with db.engine.begin() as conn:
+        row = conn.execute(
+            select(table).where(table.c.endpoint == endpoint).with_for_update()
+        ).first()
+        if row is None:
+            state = OPEN if threshold <= 1 else CLOSED
+            conn.execute(
+                insert(table).values(
+                    endpoint=endpoint,
+                    state=state,
+                    failure_count=1,
+                    opened_at=now if state == OPEN else None,
+                    updated_at=now,
+                )
+            )
+            return state
+
+        failures = row.failure_count + 1
+        if row.state == HALF_OPEN or failures >= threshold:
+            state, opened_at = OPEN, now
+        else:
+            state, opened_at = row.state, row.opened_at
+        conn.execute(
+            update(table)
+            .where(table.c.endpoint == endpoint)
+            .values(
+                state=state,
+                failure_count=failures,
+                opened_at=opened_at,
+                updated_at=now,
+            )
+        )
+        return state
+
+
+def record_failure(endpoint):
+    """
+    Count a failed call to ``endpoint``, opening the breaker at the threshold.
+
+    Returns:
+        str: The breaker's state after the failure.
+    """
+    now = utcnow()
+    try:
+        state = _record_failure(endpoint, now)
+    except IntegrityError:
+        # Another process created the row first; count against it instead.
+        state = _record_failure(endpoint, now)
+    if state == OPEN:
+        logger.warning("[CircuitBreaker] %s open.", endpoint)
+    return state
+
+
+def get_states():
+    """Current state of every known breaker, for the health endpoint."""
+    now = utcnow()
+    timeout = _setting("BREAKER_RESET_TIMEOUT")
+    states = []
+    for row in CircuitBreakerState.query.order_by(CircuitBreakerState.endpoint):
+        retry_at = None
+        if row.state == OPEN and row.opened_at:
+            retry_at = row.opened_at + timedelta(seconds=timeout)
+        states.append(
+            {
+                "endpoint": row.endpoint,
+                "state": row.state,
+                "failure_count": row.failure_count,
+                "opened_at": row.opened_at.isoformat() if row.opened_at else None,
+                "retry_at": (
+                    retry_at.isoformat() if retry_at and retry_at > now else None
+                ),
+            }
+        )
+    return states
@@ -0,0 +1,111 @@
+"""
+Duplicate detection for webhook redeliveries.
+
+Events are identified by their ``X-GitHub-Delivery`` ID and by a key derived
+from (user, repository, head commit SHA), which is stored in the unique
+``GitHubEvent.dedup_key`` column. A bounded in-process LRU sits in front of the
+database so hot redeliveries are answered without a query.
+"""
+
+import os
+import hashlib
+import threading
+from collections import OrderedDict
+
+from sqlalchemy import or_
+
+from backend.models import db, GitHubEvent
+
+DEDUP_CACHE_SIZE = int(os.getenv("DEDUP_CACHE_SIZE", "10000"))
+
+
+class LRUSet:
+    """A thread-safe set that forgets its least recently used members."""
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __contains__(self, item):
+        with self._lock:
+            if item in self._items:
+                self._items.move_to_end(item)
+                return True
+            return False
+
+    def __len__(self):
+        return len(self._items)
+
+    def add(self, item):
+        with self._lock:
+            self._items[item] = None
+            self._items.move_to_end(item)
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+
+_seen = LRUSet(DEDUP_CACHE_SIZE)
+
+
+def get_commit_sha(payload):
+    """Return the head commit SHA of a push payload, if present."""
+    return (payload.get("head_commit") or {}).get("id") or payload.get("after")
+
+
+def make_dedup_key(user_id, repo_name, commit_sha):
+    """Stable key for one commit posted on behalf of one user."""
+    raw = f"{user_id}:{repo_name}:{commit_sha}".encode("utf-8")
+    return hashlib.sha256(raw).hexdigest()
+
+
+def _cache_keys(dedup_key, delivery_id):
+    keys = []
+    if dedup_key:
+        keys.append(f"key:{dedup_key}")
+    if delivery_id:
+        keys.append(f"delivery:{delivery_id}")
+    return keys
+
+
+def is_duplicate(dedup_key=None, delivery_id=None):
+    """
+    Check whether an event has already been recorded.
+
+    Args:
+        dedup_key (str): Key from ``make_dedup_key``.
+        delivery_id (str): The ``X-GitHub-Delivery`` header.
+
+    Returns:
+        bool: True if either identifier has been seen before.
+    """
+    keys = _cache_keys(dedup_key, delivery_id)
+    if not keys:
+        return False
+    if any(key in _seen for key in keys):
+        return True
+
+    conditions = []
+    if dedup_key:
+        conditions.append(GitHubEvent.dedup_key == dedup_key)
+    if delivery_id:
+        conditions.append(GitHubEvent.delivery_id == delivery_id)
+    found = db.session.query(GitHubEvent.id).filter(or_(*conditions)).first()
+    if found is not None:
+        remember(dedup_key, delivery_id)
+        return True
+    return False
+
+
+def remember(dedup_key=None, delivery_id=None):
+    """Record identifiers of an event that has been committed."""
+    for key in _cache_keys(dedup_key, delivery_id):
+        _seen.add(key)
+
+
+def clear():
+    _seen.clear()
@@ -0,0 +1,150 @@
+"""
+Streaming digest aggregation.
+
+``DigestBuilder`` consumes events one at a time and keeps only per-group
+aggregates: the event count, the first ``max_messages_per_group`` messages
+and the set of tags seen. Events for groups beyond ``max_groups`` are only
+counted, so memory is bounded by the budgets rather than by the number of
+events or repositories, and the input can be any iterable (a generator or
+a streaming query) instead of a list.
+
+Without budgets every event is kept, which reproduces the original
+``generate_digest_post`` output exactly.
+"""
+
+from backend.services.tagger import get_tagger
+
+
+def event_message(event):
+    return (
+        event.get("message")
+        or event.get("head_commit", {}).get("message")
+        or "No commit message"
+    )
+
+
+class DigestGroup:
+    """Aggregates for one repository (or repository and date)."""
+
+    __slots__ = ("repo_name", "date", "count", "commits", "messages", "tags")
+
+    def __init__(self, repo_name, date):
+        self.repo_name = repo_name
+        self.date = date
+        self.count = 0
+        self.commits = []
+        self.messages = []
+        self.tags = set()
+
+    @property
+    def omitted(self):
+        """Events counted but not kept."""
+        return self.count - len(self.messages)
+
+
+class DigestBuilder:
+    """
+    Group events into a digest in bounded memory.
+
+    Args:
+        group_by_date (bool): Group per (repository, date) instead of per
+            repository.
+        max_groups (int): Keep at most this many groups, in order of first
+            appearance; None for no limit.
+        max_messages_per_group (int): Keep at most this many events and
+            messages per group; None for no limit. Counts and tags still
+            cover every event.
+    """
+
+    def __init__(
+        self, group_by_date=False, max_groups=None, max_messages_per_group=None
+    ):
+        self.group_by_date = group_by_date
+        self.max_groups = max_groups
+        self.max_messages_per_group = max_messages_per_group
+        self.groups = {}
+        self.total = 0
+        self.dropped_events = 0
+        self._tagger = get_tagger()
+
+    def _key(self, event):
+        repo_name = event.get("repository", {}).get("name", "Unknown Repository")
+        if not self.group_by_date:
+            return repo_name
+        return (repo_name, event.get("timestamp", "").split("T")[0])
+
+    def add(self, event):
+        self.total += 1
+        key = self._key(event)
+        group = self.groups.get(key)
+        if group is None:
+            if self.max_groups is not None and len(self.groups) >= self.max_groups:
+                self.dropped_events += 1
+                return
+            if self.group_by_date:
+                group = DigestGroup(*key)
+            else:
+                group = DigestGroup(key, None)
+            self.groups[key] = group
+
+        message = event_message(event)
+        group.count += 1
+        group.tags.update(self._tagger.tag(message))
+        limit = self.max_messages_per_group
+        if limit is None or len(group.messages) < limit:
+            group.commits.append(event)
+            group.messages.append(message)
+
+    def add_group(self, repo_name, date, count, messages):
+        """
+        Add a group aggregated elsewhere (e.g. in SQL): ``count`` events of
+        which ``messages`` are the ones to show. Tags come from ``messages``.
+        """
+        self.total += count
+        key = (repo_name, date) if self.group_by_date else repo_name
+        group = self.groups.get(key)
+        if group is None:
+            if self.max_groups is not None and len(self.groups) >= self.max_groups:
+                self.dropped_events += count
+                return
+            group = self.groups[key] = DigestGroup(repo_name, date)
+
+        group.count += count
+        for message in messages:
+            group.tags.update(self._tagger.tag(message))
+            limit = self.max_messages_per_group
+            if limit is None or len(group.messages) < limit:
+                group.messages.append(message)
+
+    def add_tags(self, repo_name, date, tags):
+        """Add ``tags`` found in SQL to a group from ``add_group``."""
+        key = (repo_name, date) if self.group_by_date else repo_name
+        group = self.groups.get(key)
+        if group is not None:
+            group.tags.update(tags)
+
+    def extend(self, events):
+        for event in events:
+            self.add(event)
+        return self
+
+    def summary(self):
+        """
+        Group dicts keyed like the groups, as accepted by ``render_digest``:
+        ``repo_name``, ``date``, ``commits`` (the kept events), ``count``,
+        ``summary`` and ``tags``.
+        """
+        result = {}
+        for key, group in self.groups.items():
+            text = "; ".join(group.messages)
+            if group.omitted:
+                text += f"; ...and {group.omitted} more"
+            result[key] = {
+                "repo_name": group.repo_name,
+                "date": group.date,
+                "commits": group.commits,
+                "count": group.count,
+                "summary": text,
+                "tags": self._tagger.ordered(group.tags),
+            }
+        return result
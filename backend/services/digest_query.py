@@ -0,0 +1,217 @@
+"""
+Digests of stored events, aggregated in SQL.
+
+``stored_digest`` summarizes a user's ``GitHubEvent`` rows in a time range
+with a single query: rows are grouped by repository (and day) with
+``GROUP BY``, counted, and the first ``max_messages_per_group`` messages of
+each group are joined with ``aggregate_strings`` (``string_agg`` on
+PostgreSQL, ``group_concat`` on SQLite). A ``row_number()`` window picks
+those messages, and a window ``sum`` over the grouped counts gives the total
+so that groups cut by ``max_groups``/``LIMIT`` are still reported. Messages
+are escaped in SQL before they are joined, so separators inside a commit
+message survive the round trip. The aggregates are fed to
+``DigestBuilder.add_group`` and rendered like any other digest.
+
+Tags cover every event of a group, as in ``DigestBuilder.add``: with a
+``max_messages_per_group`` budget, the same query also carries one
+``max(CASE ...)`` flag per tag from ``Tagger.sql_conditions``, so messages
+past the budget are tagged without being loaded. Tags defined only by
+``patterns`` cannot be matched in SQL and come from the shown messages.
+"""
+
+import re
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import String, case, cast, func, select
+
+from backend.models import db, GitHubEvent, utcnow
+from backend.services.digest_builder import DigestBuilder
+from backend.services.post_templates import render_digest
+from backend.services.tagger import get_tagger
+
+MESSAGE_SEPARATOR = "\x1f"
+RANK_SEPARATOR = "\x1e"
+# Backslash escapes that keep the separators out of aggregated messages.
+ESCAPES = {"\\": "\\\\", MESSAGE_SEPARATOR: "\\m", RANK_SEPARATOR: "\\r"}
+UNESCAPES = {escaped[1]: char for char, escaped in ESCAPES.items()}
+DEFAULT_RANGE_DAYS = 7
+
+
+def parse_range(since=None, until=None):
+    """
+    Parse ISO 8601 ``since``/``until`` query parameters to naive UTC.
+
+    ``until`` defaults to now and ``since`` to ``DEFAULT_RANGE_DAYS`` before
+    ``until``.
+
+    Raises:
+        ValueError: If a value is malformed or the range is empty.
+    """
+
+    def parse(value):
+        try:
+            parsed = datetime.fromisoformat(value)
+        except ValueError as e:
+            raise ValueError(f"Invalid timestamp: {value}") from e
+        if parsed.tzinfo is not None:
+            parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+        return parsed
+
+    end = parse(until) if until else utcnow()
+    start = parse(since) if since else end - timedelta(days=DEFAULT_RANGE_DAYS)
+    if start >= end:
+        raise ValueError("'since' must be before 'until'")
+    return start, end
+
+
+def _ranked(user_id, since, until, group_by_date):
+    """The user's events in range, numbered within each group by ``seq``."""
+    day = func.date(GitHubEvent.timestamp)
+    partition = [GitHubEvent.repo_name] + ([day] if group_by_date else [])
+    return (
+        select(
+            GitHubEvent.repo_name,
+            day.label("day"),
+            GitHubEvent.commit_message,
+            func.row_number()
+            .over(
+                partition_by=partition,
+                order_by=(GitHubEvent.timestamp, GitHubEvent.id),
+            )
+            .label("seq"),
+        )
+        .where(
+            GitHubEvent.user_id == user_id,
+            GitHubEvent.timestamp >= since,
+            GitHubEvent.timestamp < until,
+        )
+        .subquery()
+    )
+
+
+def _escaped(message):
+    """SQL expression escaping ``message`` with ``ESCAPES``, backslash first."""
+    for char, escaped in ESCAPES.items():
+        message = func.replace(message, char, escaped)
+    return message
+
+
+def _unescape(part):
+    return re.sub(r"\\(.)", lambda match: UNESCAPES[match.group(1)], part)
+
+
+def digest_rows(
+    user_id,
+    since,
+    until,
+    group_by_date=True,
+    max_groups=None,
+    max_messages_per_group=None,
+):
+    """
+    Aggregate a user's events in [since, until) per repository (and day).
+
+    Returns:
+        list: Rows of ([day,] repo_name, count, messages, total, tag_0...),
+        ordered by day and repository; ``messages`` is the aggregated string,
+        ``total`` the event count over all groups, including ones past
+        ``max_groups``, and with a ``max_messages_per_group`` budget each
+        ``tag_<i>`` flags whether any event of the group matches the i-th
+        tag of ``get_tagger().sql_conditions``.
+    """
+    ranked = _ranked(user_id, since, until, group_by_date)
+
+    # Messages are prefixed with their position so they can be put back in
+    # order: neither string_agg nor group_concat guarantee one portably.
+    shown = (
+        cast(ranked.c.seq, String) + RANK_SEPARATOR + _escaped(ranked.c.commit_message)
+    )
+    tags = []
+    if max_messages_per_group is not None:
+        shown = case((ranked.c.seq <= max_messages_per_group, shown))
+        conditions = get_tagger().sql_conditions(ranked.c.commit_message)
+        tags = [
+            func.max(case((condition, 1), else_=0)).label(f"tag_{i}")
+            for i, condition in enumerate(conditions.values())
+        ]
+
+    # Oldest day first, then repository.
+    keys = [ranked.c.repo_name]
+    if group_by_date:
+        keys.insert(0, ranked.c.day)
+    count = func.count()
+    query = (
+        select(
+            *keys,
+            count.label("count"),
+            func.aggregate_strings(shown, MESSAGE_SEPARATOR).label("messages"),
+            func.sum(count).over().label("total"),
+            *tags,
+        )
+        .group_by(*keys)
+        .order_by(*keys)
+    )
+    if max_groups is not None:
+        query = query.limit(max_groups)
+    return db.session.execute(query).all()
+
+
+def _messages(aggregated):
+    if not aggregated:
+        return []
+    parts = [
+        part.split(RANK_SEPARATOR, 1) for part in aggregated.split(MESSAGE_SEPARATOR)
+    ]
+    return [
+        _unescape(message)
+        for _, message in sorted(parts, key=lambda part: int(part[0]))
+    ]
+
+
+def stored_digest(
+    user_id,
+    since,
+    until,
+    group_by_date=True,
+    template=None,
+    max_groups=None,
+    max_messages_per_group=None,
+):
+    """
+    Render a digest of a user's stored events in [since, until).
+
+    Returns:
+        tuple: (post text, ``DigestBuilder`` with the groups and counts)
+    """
+    builder = DigestBuilder(group_by_date, max_groups, max_messages_per_group)
+    rows = digest_rows(
+        user_id, since, until, group_by_date, max_groups, max_messages_per_group
+    )
+    sql_tags = (
+        list(get_tagger().sql_conditions(GitHubEvent.commit_message))
+        if max_messages_per_group is not None
+        else []
+    )
+    for row in rows:
+        date = str(row.day) if group_by_date else None
+        builder.add_group(row.repo_name, date, row.count, _messages(row.messages))
+        builder.add_tags(
+            row.repo_name,
+            date,
+            [tag for i, tag in enumerate(sql_tags) if row._mapping[f"tag_{i}"]],
+        )
+    if rows:
+        # Groups past the LIMIT never reach Python; account for them here.
+        total = int(rows[0].total)
+        builder.dropped_events += total - builder.total
+        builder.total = total
+    if not builder.total:
+        return "No events to summarize.", builder
+
+    text = render_digest(
+        builder.summary().values(),
+        group_by_date,
+        template,
+        omitted=builder.dropped_events,
+    )
+    return text, builder
@@ -0,0 +1,228 @@
+"""
+Scheduled "what I shipped" digests.
+
+A user with a ``digest_cadence`` (``daily`` or ``weekly``) gets no post per
+push: the webhook stores each event as ``scheduled`` and the user's
+``next_digest_at`` says when to publish them all as one digest, grouped by
+repository and day. A tick scans the indexed ``next_digest_at`` column in
+batches of ``DIGEST_BATCH_SIZE`` user IDs, so a tick over thousands of users
+never holds more than one batch in memory. Each user is claimed by moving
+``next_digest_at`` forward with a conditional UPDATE, so concurrent ticks
+never publish the same digest twice, and their events are streamed from the
+database into ``generate_digest_post``.
+
+The worker's tick, ``enqueue_due_digests``, only claims users and queues a
+``publish_digest`` job for each, so slow LinkedIn calls run on the worker
+threads instead of holding up the worker's main loop.
+``publish_due_digests`` (``flask publish-digests``) posts them in-line.
+"""
+
+import logging
+from datetime import timedelta
+
+from flask import current_app
+from sqlalchemy import update
+
+from backend.models import db, GitHubEvent, Job, User, utcnow
+from backend.services.batching import as_digest_event
+from backend.services.post_generator import generate_digest_post, digest_budgets
+from backend.services.post_templates import user_template
+from backend.services.post_to_linkedin import send_post_to_linkedin, PostDeferred
+
+logger = logging.getLogger(__name__)
+
+CADENCES = {
+    "daily": timedelta(days=1),
+    "weekly": timedelta(weeks=1),
+}
+EVENT_BATCH_SIZE = 1000
+
+
+def set_cadence(user, cadence):
+    """
+    Set or clear (``None``) a user's digest cadence; the caller commits.
+
+    A new cadence starts a full interval from now.
+
+    Raises:
+        ValueError: For an unknown cadence.
+    """
+    if cadence is not None and cadence not in CADENCES:
+        raise ValueError(f"Unknown digest cadence: {cadence}")
+    if cadence and cadence != user.digest_cadence:
+        user.next_digest_at = utcnow() + CADENCES[cadence]
+    # When cleared, a pending next_digest_at still publishes the events
+    # scheduled so far, once.
+    user.digest_cadence = cadence
+
+
+def _claim(user_id, due_at, next_at):
+    """
+    Move a due user's ``next_digest_at`` forward; False if another tick won.
+
+    The caller commits.
+    """
+    result = db.session.execute(
+        update(User)
+        .where(User.id == user_id, User.next_digest_at == due_at)
+        .values(next_digest_at=next_at)
+    )
+    return result.rowcount == 1
+
+
+def _reschedule(user_id, run_at):
+    db.session.execute(
+        update(User).where(User.id == user_id).values(next_digest_at=run_at)
+    )
+    db.session.commit()
+
+
+def publish_digest(user_id, until):
+    """
+    Publish the user's ``scheduled`` events from before ``until`` as a digest.
+
+    Returns:
+        int: Number of events published (0 when there was nothing to post).
+    """
+    scheduled = (
+        GitHubEvent.user_id == user_id,
+        GitHubEvent.status == "scheduled",
+        GitHubEvent.timestamp < until,
+    )
+    # Events arriving while the digest is posted wait for the next one.
+    last_id = db.session.query(db.func.max(GitHubEvent.id)).filter(*scheduled).scalar()
+    if last_id is None:
+        return 0
+    included = GitHubEvent.query.filter(*scheduled, GitHubEvent.id <= last_id)
+
+    events = included.order_by(GitHubEvent.timestamp, GitHubEvent.id).yield_per(
+        EVENT_BATCH_SIZE
+    )
+    post_text = generate_digest_post(
+        (as_digest_event(event) for event in events),
+        group_by_date=True,
+        template=user_template(user_id, "digest"),
+        **digest_budgets(),
+    )
+    user = db.session.get(User, user_id)
+    response = send_post_to_linkedin(user, None, None, None, post_text=post_text)
+    if response is None or response.status_code != 201:
+        status = getattr(response, "status_code", None)
+        raise ValueError(f"Failed to post to LinkedIn: {status}")
+
+    post_id = response.json().get("id")
+    published = included.update(
+        {"status": "posted", "linkedin_post_id": post_id}, synchronize_session=False
+    )
+    db.session.commit()
+    return published
+
+
+def run_digest(user_id, until):
+    """
+    Publish a claimed digest, putting the user back on the schedule if it fails.
+
+    A deferred post is retried after LinkedIn's ``Retry-After``, any other
+    failure after ``RETRY_MAX_DELAY``, both counted from ``until`` (the tick).
+
+    Returns:
+        int: Number of events published (0 when there was nothing to post or
+        the post was deferred).
+
+    Raises:
+        Exception: Whatever made the post fail, once the user is rescheduled.
+    """
+    try:
+        return publish_digest(user_id, until)
+    except PostDeferred as e:
+        db.session.rollback()
+        # Strictly after ``until``, so this tick does not pick it up again.
+        delay = max(e.retry_after, 1)
+        _reschedule(user_id, until + timedelta(seconds=delay))
+        logger.info("[Digest] Deferred digest for user %s by %.0fs.", user_id, delay)
+        return 0
+    except Exception as e:
+        db.session.rollback()
+        retry_delay = current_app.config.get("RETRY_MAX_DELAY", 3600)
+        _reschedule(user_id, until + timedelta(seconds=retry_delay))
+        logger.error("[Digest] Failed to publish digest for user %s: %s", user_id, e)
+        raise
+
+
+def _claim_due(now, batch_size):
+    """
+    Claim every due user, one batch at a time.
+
+    Yields:
+        list[int]: The IDs claimed from each batch, with the claims made but
+        not yet committed.
+    """
+    while True:
+        due = (
+            db.session.query(User.id, User.digest_cadence, User.next_digest_at)
+            .filter(User.next_digest_at <= now)
+            .order_by(User.next_digest_at, User.id)
+            .limit(batch_size)
+            .all()
+        )
+        if not due:
+            return
+
+        claimed = []
+        for user_id, cadence, due_at in due:
+            interval = CADENCES.get(cadence)
+            # A cleared cadence publishes what is left and stops there.
+            if _claim(user_id, due_at, now + interval if interval else None):
+                claimed.append(user_id)
+        yield claimed
+
+
+def enqueue_due_digests(now=None, batch_size=None):
+    """
+    Queue a ``publish_digest`` job for every user whose digest is due.
+
+    Each batch of claims is committed together with its jobs.
+
+    Returns:
+        int: Number of jobs queued.
+    """
+    now = now or utcnow()
+    batch_size = batch_size or current_app.config.get("DIGEST_BATCH_SIZE", 500)
+    queued = 0
+    for claimed in _claim_due(now, batch_size):
+        for user_id in claimed:
+            db.session.add(
+                Job(
+                    kind="publish_digest",
+                    payload={"user_id": user_id, "until": now.isoformat()},
+                )
+            )
+        db.session.commit()
+        queued += len(claimed)
+    if queued:
+        logger.info("[Digest] Queued %s due digest(s).", queued)
+    return queued
+
+
+def publish_due_digests(now=None, batch_size=None):
+    """
+    Publish the digest of every user whose ``next_digest_at`` has passed.
+
+    Returns:
+        int: Number of digests posted.
+    """
+    now = now or utcnow()
+    batch_size = batch_size or current_app.config.get("DIGEST_BATCH_SIZE", 500)
+    posted = 0
+    for claimed in _claim_due(now, batch_size):
+        db.session.commit()
+        for user_id in claimed:
+            try:
+                if run_digest(user_id, now):
+                    posted += 1
+            except Exception:
+                pass  # Logged and rescheduled by run_digest.
+        logger.info(
+            "[Digest] Processed %s due user(s); %s posted.", len(claimed), posted
+        )
+    return posted
@@ -0,0 +1,180 @@
+"""
+Keyset pagination over a user's ``GitHubEvent`` history.
+
+Pages are ordered newest first on (``timestamp``, ``id``) and continue from an
+opaque cursor holding the last row's sort key, so each page is a bounded
+range scan of the ``(user_id, timestamp)`` index no matter how deep into the
+history it is. The same ordering drives the streaming export, which reads
+rows in ``yield_per`` batches (a server-side cursor on PostgreSQL) and emits
+each row with the cursor to resume after it.
+"""
+
+import io
+import csv
+import json
+import base64
+import binascii
+from datetime import datetime
+
+from sqlalchemy import and_, or_
+
+from backend.models import GitHubEvent
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+EXPORT_BATCH_SIZE = 1000
+EXPORT_FIELDS = ["id", "repo", "message", "url", "status", "timestamp", "cursor"]
+EVENT_STATUSES = (
+    "pending",
+    "held",
+    "batched",
+    "scheduled",
+    "retrying",
+    "posted",
+    "dead",
+)
+STATUS_FILTERS = {status: GitHubEvent.status == status for status in EVENT_STATUSES}
+STATUS_FILTERS["unposted"] = or_(
+    GitHubEvent.status != "posted", GitHubEvent.status.is_(None)
+)
+
+
+def encode_cursor(event):
+    """Opaque token pointing just past ``event`` in the newest-first order."""
+    raw = json.dumps([event.timestamp.isoformat(), event.id]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token):
+    """
+    Parse a token from ``encode_cursor``.
+
+    Raises:
+        ValueError: If the token is malformed.
+    """
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        timestamp, event_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(timestamp), int(event_id)
+    except (binascii.Error, TypeError, ValueError) as e:
+        raise ValueError(f"Invalid cursor: {token}") from e
+
+
+def parse_limit(value):
+    """Clamp a ``limit`` query parameter to [1, MAX_PAGE_SIZE]."""
+    if value in (None, ""):
+        return DEFAULT_PAGE_SIZE
+    return max(1, min(int(value), MAX_PAGE_SIZE))
+
+
+def filtered_events(user_id, status=None, repo=None):
+    """
+    Newest-first query of a user's events with optional filters.
+
+    Args:
+        user_id (int): Owner of the events.
+        status (str): One of ``EVENT_STATUSES``, or ``unposted`` for any
+            status but ``posted``.
+        repo (str): Repository name.
+
+    Raises:
+        ValueError: If ``status`` is not a known filter.
+    """
+    # Rows without a timestamp have no place in the keyset order.
+    query = GitHubEvent.query.filter(
+        GitHubEvent.user_id == user_id, GitHubEvent.timestamp.isnot(None)
+    )
+    if status:
+        if status not in STATUS_FILTERS:
+            raise ValueError(f"Unknown status filter: {status}")
+        query = query.filter(STATUS_FILTERS[status])
+    if repo:
+        query = query.filter(GitHubEvent.repo_name == repo)
+    return query.order_by(GitHubEvent.timestamp.desc(), GitHubEvent.id.desc())
+
+
+def after_cursor(query, cursor):
+    """Restrict a newest-first query to rows after ``cursor``."""
+    if not cursor:
+        return query
+    timestamp, event_id = decode_cursor(cursor)
+    return query.filter(
+        or_(
+            GitHubEvent.timestamp < timestamp,
+            and_(GitHubEvent.timestamp == timestamp, GitHubEvent.id < event_id),
+        )
+    )
+
+
+def page_events(user_id, status=None, repo=None, limit=DEFAULT_PAGE_SIZE, cursor=None):
+    """
+    Fetch one page of a user's events.
+
+    Returns:
+        tuple: (list of ``GitHubEvent``, next cursor or None on the last page)
+    """
+    query = after_cursor(filtered_events(user_id, status, repo), cursor)
+    events = query.limit(limit + 1).all()
+    if len(events) <= limit:
+        return events, None
+    events = events[:limit]
+    return events, encode_cursor(events[-1])
+
+
+def serialize_event(event):
+    return {
+        "id": event.id,
+        "repo": event.repo_name,
+        "message": event.commit_message,
+        "url": event.commit_url,
+        "status": event.status,
+        "timestamp": event.timestamp.isoformat(),
+    }
+
+
+def export_query(user_id, status=None, repo=None, cursor=None):
+    """
+    Query for a full export, validated up front so errors surface before
+    streaming starts.
+
+    Raises:
+        ValueError: For an unknown status filter or a malformed cursor.
+    """
+    query = after_cursor(filtered_events(user_id, status, repo), cursor)
+    return query.yield_per(EXPORT_BATCH_SIZE)
+
+
+def _export_rows(query):
+    for event in query:
+        row = serialize_event(event)
+        row["cursor"] = encode_cursor(event)
+        yield row
+
+
+def iter_ndjson(query):
+    """Yield the export as newline-delimited JSON, one chunk per batch."""
+    lines = []
+    for row in _export_rows(query):
+        lines.append(json.dumps(row, ensure_ascii=False))
+        if len(lines) >= EXPORT_BATCH_SIZE:
+            yield "\n".join(lines) + "\n"
+            lines = []
+    if lines:
+        yield "\n".join(lines) + "\n"
+
+
+def iter_csv(query):
+    """Yield the export as CSV with a header row, one chunk per batch."""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_FIELDS)
+    writer.writeheader()
+    count = 0
+    for row in _export_rows(query):
+        writer.writerow(row)
+        count += 1
+        if count % EXPORT_BATCH_SIZE == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
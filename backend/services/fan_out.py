@@ -0,0 +1,90 @@
+"""
+Concurrent delivery of one push to many recipients.
+
+When a repository has several subscribers and the webhook posts inline
+(``WEBHOOK_ASYNC=false``), posting to them one after another would add up
+every LinkedIn round trip. ``run`` hands each recipient's post to a shared
+pool of ``FANOUT_MAX_WORKERS`` threads, each in its own app context (and so
+its own database session), and waits at most ``FANOUT_DEADLINE_SECONDS``
+for all of them.
+
+Each task records its own outcome on its own ``GitHubEvent`` row, so a
+failing recipient cannot affect the others. A task still running at the
+deadline keeps going in the background and records its outcome when it
+finishes; the caller reports it as pending.
+"""
+
+import threading
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from flask import current_app
+
+Outcome = namedtuple("Outcome", ["key", "state", "value"])
+
+DONE = "done"
+FAILED = "failed"
+PENDING = "pending"
+
+_executor = None
+_lock = threading.Lock()
+
+
+def executor():
+    """The process-wide pool, sized by ``FANOUT_MAX_WORKERS`` on first use."""
+    global _executor
+    if _executor is None:
+        with _lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=current_app.config.get("FANOUT_MAX_WORKERS", 8),
+                    thread_name_prefix="fan-out",
+                )
+    return _executor
+
+
+def _in_context(app, func, args):
+    with app.app_context():
+        return func(*args)
+
+
+def run(calls, deadline=None):
+    """
+    Run ``func(*args)`` for every ``(key, func, args)`` in ``calls`` concurrently.
+
+    Args:
+        calls (list): ``(key, func, args)`` tuples.
+        deadline (float): Seconds to wait for all of them; defaults to
+            ``FANOUT_DEADLINE_SECONDS``.
+
+    Returns:
+        list[Outcome]: In the order of ``calls``: ``done`` with the return
+        value, ``failed`` with the exception, or ``pending`` past the deadline.
+    """
+    if deadline is None:
+        deadline = current_app.config.get("FANOUT_DEADLINE_SECONDS", 10)
+    app = current_app._get_current_object()
+    pool = executor()
+    futures = [
+        (key, pool.submit(_in_context, app, func, args)) for key, func, args in calls
+    ]
+    wait([future for _, future in futures], timeout=deadline)
+
+    outcomes = []
+    for key, future in futures:
+        if not future.done():
+            outcomes.append(Outcome(key, PENDING, None))
+        elif future.exception() is not None:
+            outcomes.append(Outcome(key, FAILED, future.exception()))
+        else:
+            outcomes.append(Outcome(key, DONE, future.result()))
+    return outcomes
+
+
+def shutdown():
+    """Stop the pool (waiting for running posts); the next ``run`` starts a new one."""
+    global _executor
+    with _lock:
+        if _executor is not None:
+            _executor.shutdown(wait=True)
+            _executor = None
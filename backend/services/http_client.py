@@ -0,0 +1,102 @@
+"""
+Shared outbound HTTP client for LinkedIn and GitHub calls.
+
+One ``requests.Session`` per process keeps TCP/TLS connections alive in
+per-host pools instead of paying a new handshake on every call. The session
+stores no cookies, so it is safe to share between threads, and it is rebuilt
+after ``fork()`` so gunicorn workers never share sockets with their parent.
+"""
+
+import os
+import threading
+from http.cookiejar import DefaultCookiePolicy
+
+import requests
+from requests.adapters import HTTPAdapter
+
+POOL_CONNECTIONS = int(os.getenv("HTTP_POOL_CONNECTIONS", "10"))
+POOL_MAXSIZE = int(os.getenv("HTTP_POOL_MAXSIZE", "20"))
+CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "3.05"))
+READ_TIMEOUT = float(os.getenv("HTTP_READ_TIMEOUT", "10"))
+
+_lock = threading.Lock()
+_session = None
+_session_pid = None
+
+
+def _build_session():
+    session = requests.Session()
+    # Never carry cookies from one user's call into another's.
+    session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+    adapter = HTTPAdapter(
+        pool_connections=POOL_CONNECTIONS,
+        pool_maxsize=POOL_MAXSIZE,
+        pool_block=False,
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def get_session():
+    """Return this process's pooled session, creating it on first use."""
+    global _session, _session_pid
+
+    pid = os.getpid()
+    if _session is None or _session_pid != pid:
+        with _lock:
+            if _session is None or _session_pid != pid:
+                _session = _build_session()
+                _session_pid = pid
+    return _session
+
+
+def reset_session():
+    """Drop the pooled session; the next call opens fresh connections."""
+    global _session, _session_pid
+
+    with _lock:
+        if _session is not None and _session_pid == os.getpid():
+            _session.close()
+        _session = None
+        _session_pid = None
+
+
+def request(method, url, timeout=None, **kwargs):
+    """
+    Send a request through the pooled session.
+
+    Args:
+        method (str): HTTP method.
+        url (str): Absolute URL.
+        timeout (float | tuple): Per-call ``(connect, read)`` timeout; defaults
+            to ``HTTP_CONNECT_TIMEOUT`` / ``HTTP_READ_TIMEOUT``.
+        **kwargs: Passed through to ``requests.Session.request``.
+
+    Returns:
+        requests.Response: The response.
+    """
+    if timeout is None:
+        timeout = (CONNECT_TIMEOUT, READ_TIMEOUT)
+    return get_session().request(method, url, timeout=timeout, **kwargs)
+
+
+def get(url, **kwargs):
+    return request("GET", url, **kwargs)
+
+
+def post(url, **kwargs):
+    return request("POST", url, **kwargs)
+
+
+def _after_fork_in_child():
+    global _lock, _session, _session_pid
+
+    # The parent's lock may have been held mid-fork; start clean.
+    _lock = threading.Lock()
+    _session = None
+    _session_pid = None
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork_in_child)
@@ -0,0 +1,285 @@
+"""
+Database-backed job queue.
+
+Webhooks persist their work as ``Job`` rows and return immediately; one or
+more ``flask run-worker`` processes claim due jobs and run the handler
+registered for their ``kind``. Claims are taken with ``FOR UPDATE SKIP LOCKED``
+where the database supports it and confirmed with a conditional UPDATE, so
+several workers can drain the same table safely. The worker also dispatches
+failed posts whose retry has come due (see ``backend/services/retry.py``),
+releases digest batches a crashed worker left claimed and queues scheduled
+digests (see ``backend/services/digest_scheduler.py``).
+"""
+
+import os
+import time
+import socket
+import logging
+import threading
+from datetime import datetime, timedelta
+
+from flask import current_app
+from sqlalchemy import and_, select, update
+from sqlalchemy.orm import aliased
+
+from backend.models import db, Job, GitHubEvent, User, utcnow
+from backend.services.post_to_linkedin import send_post_to_linkedin, PostDeferred
+from backend.services.batching import flush_batch, recover_stale_batches
+from backend.services.retry import schedule_retry, dispatch_due_retries
+from backend.services.digest_scheduler import enqueue_due_digests, run_digest
+from backend.services.post_generator import generate_post_from_webhook
+from backend.services.post_templates import user_template
+
+logger = logging.getLogger(__name__)
+
+HANDLERS = {}
+
+
+def handler(kind):
+    """Register ``func`` as the handler for jobs of the given kind."""
+
+    def register(func):
+        HANDLERS[kind] = func
+        return func
+
+    return register
+
+
+def enqueue(kind, payload=None, event_id=None, run_at=None):
+    """
+    Add a job to the current session.
+
+    The caller owns the transaction, so a job can be committed atomically
+    with the rows it refers to.
+
+    Args:
+        kind (str): Name of a registered handler.
+        payload (dict): JSON-serialisable job arguments.
+        event_id (int): Optional ``GitHubEvent`` the job works on.
+        run_at (datetime): Earliest time the job may run (naive UTC).
+
+    Returns:
+        Job: The pending job.
+    """
+    job = Job(kind=kind, payload=payload, event_id=event_id, run_at=run_at or utcnow())
+    db.session.add(job)
+    return job
+
+
+def defer(job, retry_after):
+    """Queue a fresh copy of ``job`` to run ``retry_after`` seconds from now."""
+    return enqueue(
+        job.kind,
+        payload=job.payload,
+        event_id=job.event_id,
+        run_at=utcnow() + timedelta(seconds=retry_after),
+    )
+
+
+def claim_next(worker_id):
+    """Claim the oldest due job for ``worker_id``, or return None."""
+    now = utcnow()
+    job_id = (
+        db.session.query(Job.id)
+        .filter(Job.status == "queued", Job.run_at <= now)
+        .order_by(Job.run_at, Job.id)
+        .limit(1)
+        .with_for_update(skip_locked=True)
+        .scalar()
+    )
+    if job_id is None:
+        db.session.rollback()
+        return None
+
+    claimed = db.session.execute(
+        update(Job)
+        .where(Job.id == job_id, Job.status == "queued")
+        .values(
+            status="running",
+            locked_at=now,
+            locked_by=worker_id,
+            attempts=Job.attempts + 1,
+        )
+    ).rowcount
+    db.session.commit()
+    if not claimed:
+        # Another worker won the race on a database without SKIP LOCKED.
+        return None
+    return db.session.get(Job, job_id)
+
+
+def run_job(job):
+    """Run a claimed job and record its outcome."""
+    job_id = job.id
+    func = HANDLERS.get(job.kind)
+    try:
+        if func is None:
+            raise ValueError(f"No handler registered for job kind: {job.kind}")
+        func(job)
+        job.status = "done"
+        job.last_error = None
+        db.session.commit()
+    except Exception as e:
+        logger.error(
+            "[Worker] Job %s (%s) failed: %s", job_id, job.kind, e, exc_info=True
+        )
+        db.session.rollback()
+        job = db.session.get(Job, job_id)
+        job.status = "failed"
+        job.last_error = str(e)
+        db.session.commit()
+
+
+def requeue_stale_jobs(timeout=None):
+    """
+    Return jobs held by a crashed worker to the queue.
+
+    A keyed job whose key was queued again meanwhile is marked ``failed``
+    instead, since only one job per key may be queued.
+    """
+    timeout = timeout or current_app.config.get("JOB_VISIBILITY_TIMEOUT", 300)
+    cutoff = utcnow() - timedelta(seconds=timeout)
+    stale = and_(Job.status == "running", Job.locked_at < cutoff)
+    queued = aliased(Job)
+    db.session.execute(
+        update(Job)
+        .where(
+            stale,
+            select(queued.id)
+            .where(queued.key == Job.key, queued.status == "queued")
+            .exists(),
+        )
+        .values(status="failed", last_error="Superseded by a queued job")
+    )
+    count = db.session.execute(
+        update(Job).where(stale).values(status="queued", locked_at=None, locked_by=None)
+    ).rowcount
+    db.session.commit()
+    if count:
+        logger.warning("[Worker] Requeued %s stale job(s).", count)
+    return count
+
+
+def run_worker(app, concurrency=1, poll_interval=1.0, once=False):
+    """
+    Drain the queue with ``concurrency`` threads.
+
+    Args:
+        app (Flask): The application whose database holds the queue.
+        concurrency (int): Number of worker threads.
+        poll_interval (float): Seconds to wait when the queue is empty.
+        once (bool): Exit as soon as no due jobs remain.
+    """
+    stop = threading.Event()
+    prefix = f"{socket.gethostname()}:{os.getpid()}"
+
+    def loop(index):
+        worker_id = f"{prefix}:{index}"
+        with app.app_context():
+            while not stop.is_set():
+                job = claim_next(worker_id)
+                if job is None:
+                    if once:
+                        return
+                    stop.wait(poll_interval)
+                    continue
+                run_job(job)
+                db.session.remove()
+
+    with app.app_context():
+        requeue_stale_jobs()
+        recover_stale_batches()
+        dispatch_due_retries()
+
+    threads = [
+        threading.Thread(target=loop, args=(i,), name=f"worker-{i}", daemon=True)
+        for i in range(max(1, concurrency))
+    ]
+    for thread in threads:
+        thread.start()
+
+    logger.info("[Worker] Started %s worker thread(s) on %s.", len(threads), prefix)
+    stale_check_interval = app.config.get("JOB_VISIBILITY_TIMEOUT", 300) / 2
+    last_stale_check = time.monotonic()
+    digest_interval = app.config.get("DIGEST_SCHEDULER_INTERVAL", 60)
+    last_digest_run = None
+    try:
+        while any(thread.is_alive() for thread in threads):
+            for thread in threads:
+                thread.join(timeout=poll_interval)
+            with app.app_context():
+                dispatch_due_retries()
+                db.session.remove()
+            if time.monotonic() - last_stale_check >= stale_check_interval:
+                with app.app_context():
+                    requeue_stale_jobs()
+                    recover_stale_batches()
+                    db.session.remove()
+                last_stale_check = time.monotonic()
+            if digest_interval > 0 and (
+                last_digest_run is None
+                or time.monotonic() - last_digest_run >= digest_interval
+            ):
+                with app.app_context():
+                    enqueue_due_digests()
+                    db.session.remove()
+                last_digest_run = time.monotonic()
+    except KeyboardInterrupt:
+        logger.info("[Worker] Shutting down.")
+        stop.set()
+        for thread in threads:
+            thread.join()
+
+
+# -------------------- HANDLERS -------------------- #
+@handler("post_event")
+def handle_post_event(job):
+    event = db.session.get(GitHubEvent, job.event_id)
+    if event is None or event.status == "posted":
+        return
+
+    user = db.session.get(User, event.user_id)
+    try:
+        template = user_template(user.id, "commit")
+        post_text = (
+            generate_post_from_webhook(job.payload or {}, template)
+            if template
+            else None
+        )
+        response = send_post_to_linkedin(
+            user,
+            event.repo_name,
+            event.commit_message,
+            job.payload or {},
+            post_text=post_text,
+        )
+        if response is None or response.status_code != 201:
+            status = getattr(response, "status_code", None)
+            raise ValueError(f"Failed to post to LinkedIn: {status}")
+    except PostDeferred as e:
+        defer(job, e.retry_after)
+        logger.info(
+            "[Worker] Deferred event %s by %.0fs: %s", event.id, e.retry_after, e
+        )
+        return
+    except Exception as e:
+        # Persist the retry before the job is marked failed.
+        schedule_retry(event, e, payload=job.payload)
+        db.session.commit()
+        raise
+
+    event.linkedin_post_id = response.json().get("id")
+    event.status = "posted"
+    logger.info("[Worker] Posted event %s: %s", event.id, event.linkedin_post_id)
+
+
+@handler("flush_batch")
+def handle_flush_batch(job):
+    flush_batch(
+        job.payload["user_id"], job.payload["repo_name"], job.payload.get("attempt", 0)
+    )
+
+
+@handler("publish_digest")
+def handle_publish_digest(job):
+    run_digest(job.payload["user_id"], datetime.fromisoformat(job.payload["until"]))
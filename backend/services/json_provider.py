@@ -0,0 +1,89 @@
+"""
+Pluggable JSON codec for request parsing and API responses.
+
+``create_app`` installs the provider selected by ``JSON_CODEC``: ``orjson``
+when the package is installed (``auto``, the default, picks it when it is
+importable) or the standard library otherwise. ``OrjsonProvider`` keeps
+Flask's output conventions: keys are sorted, and dates, decimals and
+dataclasses still go through ``DefaultJSONProvider.default``. Anything orjson
+cannot encode natively (namedtuples, integers wider than 64 bits) and calls
+with ``json.dumps`` keyword arguments such as ``indent`` fall back to the
+standard library, so switching codecs never changes what a route returns.
+"""
+
+import logging
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """``DefaultJSONProvider`` with encoding and decoding done by orjson."""
+
+    def __init__(self, app):
+        super().__init__(app)
+        options = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+        options |= orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            options |= orjson.OPT_SORT_KEYS
+        self._options = options
+
+    def dumps_bytes(self, obj):
+        """Encode ``obj`` to UTF-8 bytes."""
+        try:
+            return orjson.dumps(obj, default=self.default, option=self._options)
+        except TypeError:
+            return super().dumps(obj).encode("utf-8")
+
+    def dumps(self, obj, **kwargs):
+        if kwargs:
+            return super().dumps(obj, **kwargs)
+        return self.dumps_bytes(obj).decode("utf-8")
+
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        if (self.compact is None and self._app.debug) or self.compact is False:
+            return super().response(*args, **kwargs)
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            self.dumps_bytes(obj) + b"\n", mimetype=self.mimetype
+        )
+
+
+PROVIDERS = {
+    "stdlib": DefaultJSONProvider,
+    "orjson": OrjsonProvider,
+}
+
+
+def provider_class(codec="auto"):
+    """
+    The provider class for ``codec`` (``auto``, ``orjson`` or ``stdlib``).
+
+    Raises:
+        ValueError: For an unknown codec, or ``orjson`` when it is not installed.
+    """
+    if codec == "auto":
+        codec = "orjson" if orjson is not None else "stdlib"
+    if codec not in PROVIDERS:
+        raise ValueError(f"Unknown JSON codec: {codec}")
+    if codec == "orjson" and orjson is None:
+        raise ValueError("JSON_CODEC is 'orjson' but orjson is not installed")
+    return PROVIDERS[codec]
+
+
+def init_app(app):
+    """Install the configured JSON provider on ``app``."""
+    cls = provider_class(app.config.get("JSON_CODEC", "auto"))
+    app.json = cls(app)
+    logger.info("[JSON] Using %s.", cls.__name__)
@@ -0,0 +1,166 @@
+"""
+Asynchronous LinkedIn client, for posting many members' updates at once.
+
+``AsyncLinkedInClient`` mirrors ``post_to_linkedin`` and
+``send_post_to_linkedin`` on ``httpx.AsyncClient``: the same author URN
+normalization, request body, circuit breaker and rate limiter admission,
+status handling (``PostDeferred`` on 429 or a closed gate, ``ValueError`` on
+401 and 5xx) and single attempt per call, with retries left to the caller
+(see ``backend/services/retry.py``). The HTTP round trip runs on the event
+loop; the breaker and rate limiter steps are blocking database calls, so
+they run on at most ``DB_THREADS`` worker threads, each call in a fresh app
+context (and so its own session). Create the client inside an app context.
+
+``post_many`` keeps up to ``concurrency`` posts in flight on one thread::
+
+    async with AsyncLinkedInClient() as client:
+        results = await client.post_many(posts, concurrency=200)
+"""
+
+import anyio
+import httpx
+from flask import current_app
+
+from backend.models import User, db
+from backend.services import circuit_breaker, metrics, user_cache
+from backend.services.http_client import CONNECT_TIMEOUT, READ_TIMEOUT
+from backend.services.linkedin_oauth import exchange_code_for_access_token
+from backend.services.post_to_linkedin import (
+    admit_post,
+    build_ugc_post,
+    check_post_response,
+    linkedin_post_url,
+    normalize_author_urn,
+)
+
+MAX_CONNECTIONS = 100
+DB_THREADS = 10
+
+
+class AsyncLinkedInClient:
+    """LinkedIn UGC posting over a pooled ``httpx.AsyncClient``."""
+
+    def __init__(self, max_connections=MAX_CONNECTIONS, transport=None):
+        self._app = current_app._get_current_object()
+        self._db_limiter = None
+        self._http = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+            ),
+            timeout=httpx.Timeout(READ_TIMEOUT, connect=CONNECT_TIMEOUT),
+            transport=transport,
+        )
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+    async def aclose(self):
+        await self._http.aclose()
+
+    async def _blocking(self, func, *args):
+        """Run a database-backed step off the event loop."""
+        if self._db_limiter is None:
+            self._db_limiter = anyio.CapacityLimiter(DB_THREADS)
+        return await anyio.to_thread.run_sync(
+            self._in_app_context, func, args, limiter=self._db_limiter
+        )
+
+    def _in_app_context(self, func, args):
+        with self._app.app_context():
+            return func(*args)
+
+    async def post_to_linkedin(
+        self, user, repo_name, commit_message, webhook_payload, post_text=None
+    ):
+        """Async ``post_to_linkedin``; returns an ``httpx.Response``."""
+        if not user:
+            current_app.logger.warning("[post_to_linkedin] No user provided.")
+            user = User.query.first()
+            if not user:
+                return httpx.Response(404, content=b"User not found")
+
+        if not user.linkedin_token or not user.linkedin_id:
+            return httpx.Response(400, content=b"Missing LinkedIn credentials")
+
+        author_urn = normalize_author_urn(user.linkedin_id)
+        headers, payload = build_ugc_post(
+            user.linkedin_token, author_urn, webhook_payload, post_text
+        )
+
+        post_url = linkedin_post_url()
+        await self._blocking(admit_post, post_url, author_urn)
+
+        try:
+            with metrics.outbound("linkedin") as call:
+                response = await self._http.post(
+                    post_url, headers=headers, json=payload
+                )
+                call.status = response.status_code
+        except httpx.HTTPError:
+            await self._blocking(circuit_breaker.record_failure, post_url)
+            raise
+
+        return await self._blocking(check_post_response, response, post_url, author_urn)
+
+    async def send_post_to_linkedin(
+        self, user, repo_name, commit_message, webhook_payload, post_text=None
+    ):
+        """
+        Async ``send_post_to_linkedin``: refreshes a missing token, then posts once.
+
+        The rare token refresh commits ``user`` in the caller's session, so it
+        blocks the event loop.
+        """
+        if not user.linkedin_token:
+            current_app.logger.warning(
+                "[LinkedIn] Missing LinkedIn token. Attempting to refresh."
+            )
+            try:
+                user.linkedin_token = exchange_code_for_access_token(
+                    user.SECRET_GITHUB_TOKEN
+                )
+                db.session.commit()
+                user_cache.invalidate(user.SECRET_GITHUB_id)
+            except Exception as e:
+                current_app.logger.error("[LinkedIn] Failed to refresh token: %s", e)
+                raise
+
+        response = await self.post_to_linkedin(
+            user, repo_name, commit_message, webhook_payload, post_text=post_text
+        )
+        if response.status_code == 201:
+            current_app.logger.info("[LinkedIn] Post successful.")
+        else:
+            current_app.logger.error("[LinkedIn] Post failed: %s", response.status_code)
+        return response
+
+    async def post_many(self, posts, concurrency=MAX_CONNECTIONS):
+        """
+        Send every post with at most ``concurrency`` in flight.
+
+        Args:
+            posts (list[tuple]): ``send_post_to_linkedin`` argument tuples
+                ``(user, repo_name, commit_message, webhook_payload, post_text)``.
+
+        Returns:
+            list: In the order of ``posts``, the response or the exception
+            raised for each one.
+        """
+        results = [None] * len(posts)
+        limiter = anyio.Semaphore(concurrency)
+
+        async def send(index, args):
+            async with limiter:
+                try:
+                    results[index] = await self.send_post_to_linkedin(*args)
+                except Exception as e:
+                    results[index] = e
+
+        async with anyio.create_task_group() as tasks:
+            for index, args in enumerate(posts):
+                tasks.start_soon(send, index, args)
+        return results
@@ -1,6 +1,6 @@
 import os
 import logging
-import requests
+from backend.services import http_client
 from backend.config import LINKEDIN_CLIENT_ID, LINKEDIN_CLIENT_SECRET
 
 CLIENT_ID = LINKEDIN_CLIENT_ID
@@ -32,12 +32,13 @@ def exchange_code_for_access_token(auth_code: str) -> str:
     }
     headers = {"Content-Type": "application/x-www-form-urlencoded"}
 
-    response = requests.post(token_url, data=payload, headers=headers)
+    response = http_client.post(token_url, data=payload, headers=headers)
     response_data = response.json()
 
     if response.status_code != 200:
         logging.error(
-            f"[LinkedIn OAuth] Failed to exchange code for access token: {response_data}"
+            "[LinkedIn OAuth] Failed to exchange code for access token: %s",
+            response_data.get("error"),
         )
         raise ValueError("Failed to exchange code for access token")
 
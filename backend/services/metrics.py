@@ -0,0 +1,167 @@
+"""
+Prometheus metrics.
+
+``init_app`` times every request from ``before_request`` to
+``after_request`` into ``http_request_duration_seconds`` (labelled by route
+rule, not raw path, so cardinality stays bounded) and serves ``/metrics``.
+With ``METRICS_TOKEN`` set, scrapes must send it as a bearer token; without
+it the endpoint is open and must only be reachable from the internal network.
+Code paths add their own measurements:
+
+* ``span(stage)`` times one stage of the webhook (signature check, JSON
+  parse, user lookup, duplicate check, database commit, LinkedIn call) into
+  ``webhook_stage_duration_seconds``;
+* ``outbound(service)`` times an outbound HTTP call into
+  ``outbound_request_duration_seconds`` with its outcome (status class or
+  ``error``);
+* ``count_outcome(outcome)`` counts how webhooks end (``queued``,
+  ``posted``, ``redundant``, ...) in ``webhook_outcomes_total``.
+
+Under gunicorn, set ``PROMETHEUS_MULTIPROC_DIR`` to an empty directory shared
+by the workers (and wipe it on deploy): every process then writes its
+samples there and ``/metrics`` aggregates them with ``MultiProcessCollector``,
+whichever worker serves the scrape. The ``web`` entry of the ``Procfile``
+does both.
+"""
+
+import os
+import hmac
+import time
+from contextlib import contextmanager
+
+from flask import Response, current_app, g, request
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+    multiprocess,
+    REGISTRY,
+)
+
+LATENCY_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+)
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "Time spent handling HTTP requests.",
+    ["method", "endpoint", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+STAGE_LATENCY = Histogram(
+    "webhook_stage_duration_seconds",
+    "Time spent in each stage of webhook handling.",
+    ["stage"],
+    buckets=LATENCY_BUCKETS,
+)
+OUTBOUND_LATENCY = Histogram(
+    "outbound_request_duration_seconds",
+    "Time spent in outbound HTTP calls.",
+    ["service", "outcome"],
+    buckets=LATENCY_BUCKETS,
+)
+WEBHOOK_OUTCOMES = Counter(
+    "webhook_outcomes_total",
+    "Webhook deliveries by how they were handled.",
+    ["outcome"],
+)
+
+
+@contextmanager
+def span(stage):
+    """Time the enclosed block as webhook stage ``stage``."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        STAGE_LATENCY.labels(stage=stage).observe(time.perf_counter() - start)
+
+
+class OutboundCall:
+    """Timer for one outbound call; set ``status`` once a response arrives."""
+
+    __slots__ = ("status",)
+
+    def __init__(self):
+        self.status = None
+
+
+@contextmanager
+def outbound(service):
+    """
+    Time an outbound call to ``service``.
+
+    The outcome label is the status class of ``call.status`` (``2xx``,
+    ``4xx``, ...) or ``error`` when the block raised before setting it.
+    """
+    call = OutboundCall()
+    start = time.perf_counter()
+    try:
+        yield call
+    finally:
+        outcome = f"{call.status // 100}xx" if call.status else "error"
+        OUTBOUND_LATENCY.labels(service=service, outcome=outcome).observe(
+            time.perf_counter() - start
+        )
+
+
+def count_outcome(outcome):
+    WEBHOOK_OUTCOMES.labels(outcome=outcome).inc()
+
+
+def _registry():
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return registry
+    return REGISTRY
+
+
+def _authorized():
+    token = current_app.config.get("METRICS_TOKEN")
+    if not token:
+        return True
+    supplied = request.headers.get("Authorization", "")
+    return hmac.compare_digest(supplied.encode(), f"Bearer {token}".encode())
+
+
+def metrics_view():
+    if not _authorized():
+        return Response("Unauthorized\n", status=401, mimetype="text/plain")
+    return Response(generate_latest(_registry()), mimetype=CONTENT_TYPE_LATEST)
+
+
+def _start_timer():
+    g.request_started = time.perf_counter()
+
+
+def _record_request(response):
+    started = g.pop("request_started", None)
+    if started is not None:
+        rule = request.url_rule.rule if request.url_rule else "unmatched"
+        REQUEST_LATENCY.labels(
+            method=request.method, endpoint=rule, status=response.status_code
+        ).observe(time.perf_counter() - started)
+    return response
+
+
+def init_app(app):
+    """Register the request timing hooks and the ``/metrics`` endpoint."""
+    if not app.config.get("METRICS_ENABLED", True):
+        return
+    app.before_request(_start_timer)
+    app.after_request(_record_request)
+    app.add_url_rule("/metrics", "metrics", metrics_view)
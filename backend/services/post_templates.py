@@ -0,0 +1,311 @@
+"""
+Post templates.
+
+A template is plain text with ``{field}`` placeholders (``{{`` and ``}}`` for
+literal braces). ``compile_template`` validates it once against the fields
+its kind allows and turns it into a ``CompiledTemplate``; compiled templates
+are cached by (template ID, version), so rendering a post is a single
+``str.format_map`` call. Only bare field names are accepted, never attribute
+or index lookups, so user-supplied templates cannot reach into Python objects.
+
+Templates render against a ``NormalizedEvent``: the webhook payload with
+defaults applied and URLs normalized once. Users may override the ``commit``
+and ``digest`` templates (see ``PostTemplate``); everything else falls back
+to ``DEFAULT_TEMPLATES``, which reproduce the original hard-coded layouts.
+"""
+
+import re
+import json
+import hashlib
+import threading
+from collections import OrderedDict, namedtuple
+from functools import lru_cache
+from urllib.parse import urlparse, urlunparse
+
+from backend.models import PostTemplate
+from backend.services.tagger import tag_message
+
+TEMPLATE_CACHE_SIZE = 512
+
+COMMIT_FIELDS = frozenset(
+    [
+        "author",
+        "repo",
+        "repo_url",
+        "message",
+        "url",
+        "commit_url",
+        "sha",
+        "short_sha",
+        "tags",
+        "timestamp",
+    ]
+)
+
+# kind -> (fields allowed in ``body``, fields allowed in ``item`` or None)
+KINDS = {
+    "commit": (COMMIT_FIELDS, None),
+    "digest": (
+        frozenset(["groups", "count", "more"]),
+        frozenset(["repo", "date", "on_date", "summary", "tags", "tags_line", "count"]),
+    ),
+    "preview_digest": (
+        frozenset(["repo", "repo_url", "items", "more", "count"]),
+        frozenset(["message", "author", "url"]),
+    ),
+}
+USER_KINDS = ("commit", "digest")
+
+DEFAULT_TEMPLATES = {
+    "commit": {
+        "body": (
+            "{author} just pushed to {repo}!\n\n"
+            'Commit message: "{message}"\n\n'
+            "Check it out: {url}\n\n"
+        ),
+        "item": None,
+    },
+    "digest": {
+        "body": "Here's a summary of recent GitHub activity:\n{groups}{more}",
+        "item": "- {repo}{on_date}\n  Summary: {summary}{tags_line}",
+    },
+    "preview_digest": {
+        "body": "Digest of updates in {repo}:\n{items}{more}\nRepository: {repo_url}\n\n",
+        "item": "- {message} by {author} ({url})",
+    },
+}
+
+# Changes whenever a default template is edited; used in cache keys.
+DEFAULTS_VERSION = hashlib.sha256(
+    json.dumps(DEFAULT_TEMPLATES, sort_keys=True).encode("utf-8")
+).hexdigest()[:12]
+
+_TOKEN = re.compile(r"\{\{|\}\}|\{([A-Za-z_][A-Za-z0-9_]*)\}|[{}]")
+
+
+class TemplateError(ValueError):
+    """A template uses unknown fields or has unbalanced braces."""
+
+
+class CompiledTemplate:
+    """A validated template, ready to render."""
+
+    __slots__ = ("fields", "_format")
+
+    def __init__(self, format_string, fields):
+        self.fields = fields
+        self._format = format_string.format_map
+
+    def render(self, context):
+        return self._format(context)
+
+
+def compile_template(source, allowed):
+    """
+    Validate ``source`` and compile it.
+
+    Args:
+        source (str): Template text.
+        allowed (frozenset): Field names the template may use.
+
+    Raises:
+        TemplateError: On unknown fields or stray braces.
+    """
+    fields = set()
+    for match in _TOKEN.finditer(source):
+        token = match.group(0)
+        if token in ("{{", "}}"):
+            continue
+        name = match.group(1)
+        if name is None:
+            raise TemplateError(f"Unbalanced '{token}' at position {match.start()}")
+        if name not in allowed:
+            raise TemplateError(f"Unknown template field: {name}")
+        fields.add(name)
+    return CompiledTemplate(source, frozenset(fields))
+
+
+def validate(kind, body, item=None):
+    """Compile a template for ``kind`` and return it, raising TemplateError."""
+    if kind not in KINDS:
+        raise TemplateError(f"Unknown template kind: {kind}")
+    body_fields, item_fields = KINDS[kind]
+    compiled_item = None
+    if item_fields is not None:
+        if not item:
+            raise TemplateError(f"Templates of kind '{kind}' need an item template")
+        compiled_item = compile_template(item, item_fields)
+    return compile_template(body, body_fields), compiled_item
+
+
+_cache = OrderedDict()
+_lock = threading.Lock()
+
+
+def get_compiled(kind, template=None):
+    """
+    Compiled (body, item) for a ``PostTemplate`` or the default of ``kind``.
+
+    Cached by (template ID, version); an edited template gets a new version
+    and is compiled afresh.
+    """
+    if template is None:
+        key = ("default", kind)
+    else:
+        key = (template.id, template.version)
+    with _lock:
+        compiled = _cache.get(key)
+        if compiled is not None:
+            _cache.move_to_end(key)
+            return compiled
+
+    if template is None:
+        source = DEFAULT_TEMPLATES[kind]
+        compiled = validate(kind, source["body"], source["item"])
+    else:
+        compiled = validate(template.kind, template.body, template.item)
+
+    with _lock:
+        _cache[key] = compiled
+        while len(_cache) > TEMPLATE_CACHE_SIZE:
+            _cache.popitem(last=False)
+    return compiled
+
+
+def clear():
+    with _lock:
+        _cache.clear()
+    normalize_url.cache_clear()
+
+
+def user_template(user_id, kind):
+    """The user's ``PostTemplate`` of ``kind``, or None to use the default."""
+    return PostTemplate.query.filter_by(user_id=user_id, kind=kind).first()
+
+
+# -------------------- EVENTS -------------------- #
+@lru_cache(maxsize=1024)
+def normalize_url(url):
+    """
+    Add a missing ``https`` scheme and check the URL has a host.
+
+    Raises:
+        ValueError: If the URL has no host.
+    """
+    parsed = urlparse(url)
+    if not parsed.scheme:
+        url = urlunparse(parsed._replace(scheme="https"))
+        parsed = urlparse(url)
+    if not parsed.scheme or not parsed.netloc:
+        raise ValueError("Invalid URL format")
+    return url
+
+
+class NormalizedEvent(namedtuple("NormalizedEvent", sorted(COMMIT_FIELDS))):
+    """One commit with defaults applied, as seen by ``commit`` templates."""
+
+    __slots__ = ()
+
+    @classmethod
+    def from_webhook(cls, payload):
+        """From a GitHub push payload; links to the repository."""
+        repository = payload.get("repository", {})
+        commit = payload.get("head_commit") or {}
+        repo_url = normalize_url(repository.get("html_url", "https://github.com"))
+        sha = commit.get("id") or ""
+        message = commit.get("message", "made an update")
+        return cls(
+            author=commit.get("author", {}).get("name", "Someone"),
+            repo=repository.get("name", "a GitHub repo"),
+            repo_url=repo_url,
+            message=message,
+            url=repo_url,
+            commit_url=commit.get("url", ""),
+            sha=sha,
+            short_sha=sha[:7],
+            tags=" ".join(tag_message(message)),
+            timestamp=commit.get("timestamp", ""),
+        )
+
+    @classmethod
+    def from_commit(cls, commit, repository):
+        """From a preview request's commit entry; links to the commit."""
+        sha = commit.get("id") or ""
+        commit_url = commit.get("url", "#")
+        message = commit.get("message", "No commit message")
+        return cls(
+            author=commit.get("author", {}).get("name", "Unknown Author"),
+            repo=repository.get("name", "Unknown Repository"),
+            repo_url=repository.get("url", "#"),
+            message=message,
+            url=commit_url,
+            commit_url=commit_url,
+            sha=sha,
+            short_sha=sha[:7],
+            tags=" ".join(tag_message(message)),
+            timestamp=commit.get("timestamp", ""),
+        )
+
+
+# -------------------- RENDERING -------------------- #
+def render_commit(event, template=None):
+    """Render a single-commit post for a ``NormalizedEvent``."""
+    body, _ = get_compiled("commit", template)
+    return body.render(event._asdict())
+
+
+def render_digest(groups, group_by_date=False, template=None, omitted=0):
+    """
+    Render a digest post.
+
+    Args:
+        groups (iterable): Group dicts as built by ``DigestBuilder.summary``
+            (``repo_name``, ``date``, ``count``, ``summary``, ``tags``).
+        group_by_date (bool): Whether groups are per (repository, date).
+        template (PostTemplate): User template; the default when None.
+        omitted (int): Events left out of every group by a ``max_groups``
+            budget.
+    """
+    body, item = get_compiled("digest", template)
+    lines = []
+    count = 0
+    for group in groups:
+        tags = " ".join(group["tags"])
+        count += group["count"]
+        lines.append(
+            item.render(
+                {
+                    "repo": group["repo_name"],
+                    "date": group["date"] or "",
+                    "on_date": f" on {group['date']}" if group_by_date else "",
+                    "summary": group["summary"],
+                    "tags": tags,
+                    "tags_line": f"\n  Tags: {tags}" if tags else "",
+                    "count": group["count"],
+                }
+            )
+        )
+    more = f"\n...and {omitted} more commits not shown" if omitted else ""
+    return body.render({"groups": "\n".join(lines), "count": count, "more": more})
+
+
+def render_preview_digest(events, repository, limit=5, template=None, total=None):
+    """
+    Render the multi-commit preview for ``NormalizedEvent``s.
+
+    ``total`` is the number of commits in the push when ``events`` holds only
+    the first ``limit`` of them.
+    """
+    body, item = get_compiled("preview_digest", template)
+    items = "\n".join(item.render(event._asdict()) for event in events[:limit])
+    total = len(events) if total is None else total
+    extra = total - limit
+    return body.render(
+        {
+            "repo": repository.get("name", "Unknown Repository"),
+            "repo_url": repository.get("url", "#"),
+            "items": items,
+            "more": f"\n...and {extra} more commits!\n" if extra > 0 else "",
+            "count": total,
+        }
+    )
@@ -2,10 +2,15 @@ import os
 from flask import current_app, json
 import requests
 from dotenv import load_dotenv
-import logging
-import time
 
 from backend.models import User, db
+from backend.services import (
+    http_client,
+    rate_limiter,
+    circuit_breaker,
+    metrics,
+    user_cache,
+)
 from backend.services.post_generator import generate_post_from_webhook
 from backend.services.linkedin_oauth import exchange_code_for_access_token
 from backend.config import LINKEDIN_CLIENT_ID, LINKEDIN_CLIENT_SECRET
@@ -13,7 +18,20 @@ from backend.config import LINKEDIN_CLIENT_ID, LINKEDIN_CLIENT_SECRET
 LINKEDIN_POST_URL = "https://api.linkedin.com/v2/ugcPosts"
 
 
-def post_to_linkedin(user, repo_name, commit_message, webhook_payload):
+def linkedin_post_url():
+    """The UGC posts endpoint; ``LINKEDIN_POST_URL`` overrides it (e.g. a stub)."""
+    return current_app.config.get("LINKEDIN_POST_URL") or LINKEDIN_POST_URL
+
+
+class PostDeferred(Exception):
+    """The post was not sent and should be retried after ``retry_after`` seconds."""
+
+    def __init__(self, message, retry_after):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def post_to_linkedin(user, repo_name, commit_message, webhook_payload, post_text=None):
     if not user:
         current_app.logger.warning("[post_to_linkedin] No user provided.")
         user = User.query.first()
@@ -23,13 +41,13 @@ def post_to_linkedin(user, repo_name, commit_message, webhook_payload):
             response._content = b"User not found"
             return response
         current_app.logger.warning(
-            f"[Webhook] Fallback user: {getattr(user, 'SECRET_GITHUB_id', 'None')}"
+            "[Webhook] Fallback user: %s", getattr(user, "SECRET_GITHUB_id", "None")
         )
 
     access_token = user.linkedin_token
     user_id = user.linkedin_id
 
-    logging.info(f"[LinkedIn] User ID: {user_id}")
+    current_app.logger.info("[LinkedIn] User ID: %s", user_id)
 
     if not access_token or not user_id:
         response = requests.Response()
@@ -37,18 +55,46 @@ def post_to_linkedin(user, repo_name, commit_message, webhook_payload):
         response._content = b"Missing LinkedIn credentials"
         return response
 
-    if not user_id.startswith("urn:li:"):
-        user_id = f"urn:li:member:{user_id}"
+    author_urn = normalize_author_urn(user_id)
+    headers, payload = build_ugc_post(
+        access_token, author_urn, webhook_payload, post_text
+    )
+
+    post_url = linkedin_post_url()
+    admit_post(post_url, author_urn)
+
+    try:
+        with metrics.outbound("linkedin") as call:
+            response = http_client.post(post_url, headers=headers, json=payload)
+            call.status = response.status_code
+    except requests.RequestException:
+        circuit_breaker.record_failure(post_url)
+        raise
+
+    return check_post_response(response, post_url, author_urn)
+
+
+def normalize_author_urn(linkedin_id):
+    """A bare LinkedIn member ID as an author URN; URNs pass through."""
+    if not linkedin_id.startswith("urn:li:"):
+        return f"urn:li:member:{linkedin_id}"
+    return linkedin_id
 
-    author_urn = user_id
 
+def build_ugc_post(access_token, author_urn, webhook_payload, post_text=None):
+    """
+    Headers and JSON body of a public UGC post.
+
+    ``post_text`` is rendered from ``webhook_payload`` when omitted.
+    """
     headers = {
         "Authorization": f"Bearer {access_token}",
         "Content-Type": "application/json",
         "X-Restli-Protocol-Version": "2.0.0",
     }
 
-    post_text = generate_post_from_webhook(webhook_payload)
+    if post_text is None:
+        post_text = generate_post_from_webhook(webhook_payload)
 
     payload = {
         "author": author_urn,
@@ -61,69 +107,122 @@ def post_to_linkedin(user, repo_name, commit_message, webhook_payload):
         },
         "visibility": {"com.linkedin.ugc.MemberNetworkVisibility": "PUBLIC"},
     }
+    return headers, payload
+
+
+def admit_post(post_url, author_urn):
+    """
+    Take a slot from the circuit breaker and the rate limiter.
 
-    response = requests.post(LINKEDIN_POST_URL, headers=headers, json=payload)
+    Raises:
+        PostDeferred: When either says to wait.
+    """
+    with metrics.span("circuit_breaker"):
+        wait = circuit_breaker.allow(post_url)
+    if wait > 0:
+        current_app.logger.warning(
+            "[LinkedIn] Circuit breaker open; retry in %.0fs.", wait
+        )
+        raise PostDeferred("LinkedIn circuit breaker is open", retry_after=wait)
 
-    if response.status_code == 401:
-        current_app.logger.error(f"[LinkedIn] Authentication failed: {response.text}")
+    with metrics.span("rate_limit"):
+        wait = rate_limiter.acquire(author_urn)
+    if wait > 0:
+        current_app.logger.warning(
+            "[LinkedIn] Rate limit reached for %s; retry in %.0fs.", author_urn, wait
+        )
+        raise PostDeferred(f"Rate limit reached for {author_urn}", retry_after=wait)
+
+
+def check_post_response(response, post_url, author_urn):
+    """
+    Record a LinkedIn response with the circuit breaker and act on its status.
+
+    Works on ``requests`` and ``httpx`` responses alike.
+
+    Raises:
+        PostDeferred: When LinkedIn throttled the member (429).
+        ValueError: On 401 and 5xx responses.
+    """
+    if response.status_code >= 500:
+        circuit_breaker.record_failure(post_url)
+    else:
+        circuit_breaker.record_success(post_url)
+
+    if response.status_code == 429:
+        retry_after = rate_limiter.parse_retry_after(
+            response.headers.get("Retry-After")
+        )
+        rate_limiter.defer(author_urn, retry_after)
+        current_app.logger.warning(
+            "[LinkedIn] Throttled by LinkedIn; retry in %.0fs.", retry_after
+        )
+        raise PostDeferred("Throttled by LinkedIn", retry_after=retry_after)
+    elif response.status_code == 401:
+        current_app.logger.error("[LinkedIn] Authentication failed: %s", response.text)
         raise ValueError(f"Failed to post to LinkedIn: {response.status_code}")
     elif response.status_code >= 500:
-        current_app.logger.error(f"[LinkedIn] Server error: {response.text}")
+        current_app.logger.error("[LinkedIn] Server error: %s", response.text)
         raise ValueError(f"Failed to post to LinkedIn: {response.status_code}")
     elif response.status_code not in {201, 401} and response.status_code < 500:
         current_app.logger.error(
-            f"[LinkedIn] Unexpected error: {response.status_code} {response.text}"
+            "[LinkedIn] Unexpected error: %s %s", response.status_code, response.text
         )
 
     return response
 
 
 def send_post_to_linkedin(
-    user, repo_name, commit_message, webhook_payload, retries=3, delay=2
+    user,
+    repo_name,
+    commit_message,
+    webhook_payload,
+    post_text=None,
 ):
     """
-    Sends a post to LinkedIn using the user's credentials with retry logic.
+    Sends a post to LinkedIn using the user's credentials.
+
+    Makes a single attempt. Failures are raised to the caller, which
+    schedules a persistent retry (see ``backend/services/retry.py``) instead
+    of sleeping here.
 
     Args:
         user (User): The user object containing LinkedIn credentials.
         repo_name (str): The name of the repository.
         commit_message (str): The commit message.
         webhook_payload (dict): The webhook payload from GitHub.
-        retries (int): Number of retry attempts in case of failure.
-        delay (int): Delay in seconds between retries.
+        post_text (str): Pre-rendered post text, e.g. a digest; rendered from
+            ``webhook_payload`` when omitted.
 
     Returns:
         Response: The response from the LinkedIn API.
     """
     if not user.linkedin_token:
-        logging.warning("[LinkedIn] Missing LinkedIn token. Attempting to refresh.")
+        current_app.logger.warning(
+            "[LinkedIn] Missing LinkedIn token. Attempting to refresh."
+        )
         try:
             user.linkedin_token = exchange_code_for_access_token(
                 user.SECRET_GITHUB_TOKEN
             )
             db.session.commit()
+            user_cache.invalidate(user.SECRET_GITHUB_id)
         except Exception as e:
-            logging.error(f"[LinkedIn] Failed to refresh token: {e}")
+            current_app.logger.error("[LinkedIn] Failed to refresh token: %s", e)
             raise
 
-    for attempt in range(retries):
-        try:
-            response = post_to_linkedin(
-                user, repo_name, commit_message, webhook_payload
-            )
-            if response.status_code == 201:
-                logging.info(f"[LinkedIn] Post successful: {response.json()}")
-                return response
-            else:
-                logging.error(
-                    f"[LinkedIn] Post failed: {response.status_code} {response.text}"
-                )
-                return response
-        except Exception as e:
-            logging.error(
-                f"[LinkedIn] Exception during post (attempt {attempt + 1}): {e}"
-            )
-            if attempt < retries - 1:
-                time.sleep(delay)
-            else:
-                raise
+    try:
+        response = post_to_linkedin(
+            user, repo_name, commit_message, webhook_payload, post_text=post_text
+        )
+    except PostDeferred:
+        raise
+    except Exception as e:
+        current_app.logger.error("[LinkedIn] Exception during post: %s", e)
+        raise
+
+    if response.status_code == 201:
+        current_app.logger.info("[LinkedIn] Post successful.")
+    else:
+        current_app.logger.error("[LinkedIn] Post failed: %s", response.status_code)
+    return response
@@ -0,0 +1,73 @@
+"""
+Cache of rendered post previews.
+
+The frontend re-requests previews while a user edits. Each preview is keyed
+by a SHA-256 of the preview kind, the default template and tag dictionary
+versions and the payload serialized canonically (sorted keys, no whitespace), so equal
+payloads hash equally however the client ordered them. The key doubles as the
+response ``ETag``: a client that sends it back in ``If-None-Match`` gets a
+304 without any rendering, and other repeats are served from a bounded LRU.
+"""
+
+import os
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+
+from backend.services.post_templates import DEFAULTS_VERSION
+from backend.services.tagger import get_tagger
+
+PREVIEW_CACHE_SIZE = int(os.getenv("PREVIEW_CACHE_SIZE", "1024"))
+
+_cache = OrderedDict()
+_lock = threading.Lock()
+hits = 0
+misses = 0
+
+
+def preview_key(kind, payload):
+    """Stable hex digest identifying a rendered preview."""
+    canonical = json.dumps(
+        payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str
+    )
+    raw = f"{kind}:{DEFAULTS_VERSION}:{get_tagger().version}:{canonical}".encode(
+        "utf-8"
+    )
+    return hashlib.sha256(raw).hexdigest()
+
+
+def get_or_render(key, render):
+    """
+    Return the cached preview for ``key``, rendering it with ``render()`` on a miss.
+
+    Render errors propagate and nothing is cached.
+    """
+    global hits, misses
+
+    with _lock:
+        if key in _cache:
+            _cache.move_to_end(key)
+            hits += 1
+            return _cache[key]
+        misses += 1
+
+    preview = render()
+    with _lock:
+        _cache[key] = preview
+        while len(_cache) > PREVIEW_CACHE_SIZE:
+            _cache.popitem(last=False)
+    return preview
+
+
+def stats():
+    return {"hits": hits, "misses": misses, "size": len(_cache)}
+
+
+def clear():
+    global hits, misses
+
+    with _lock:
+        _cache.clear()
+        hits = 0
+        misses = 0
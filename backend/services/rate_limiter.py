@@ -0,0 +1,152 @@
+"""
+Token-bucket rate limiting for LinkedIn publishing.
+
+Every post takes one token from the author's bucket and one from the
+application-wide bucket. Bucket state lives in the ``rate_limit_bucket`` table
+and is updated under a row lock, so all gunicorn and worker processes share
+one budget. When a bucket is empty, or LinkedIn has answered 429 with a
+``Retry-After``, callers are told how long to wait instead of being blocked.
+"""
+
+import logging
+from datetime import timedelta, timezone
+from email.utils import parsedate_to_datetime
+
+from flask import current_app
+from sqlalchemy import select, insert, update
+from sqlalchemy.exc import IntegrityError
+
+from backend.models import db, RateLimitBucket, utcnow
+
+logger = logging.getLogger(__name__)
+
+APP_BUCKET = "app"
+SECONDS_PER_DAY = 24 * 60 * 60
+
+DEFAULT_LIMITS = {
+    "RATE_LIMIT_MEMBER_CAPACITY": 10,
+    "RATE_LIMIT_MEMBER_PER_DAY": 150,
+    "RATE_LIMIT_APP_CAPACITY": 100,
+    "RATE_LIMIT_APP_PER_DAY": 100000,
+}
+
+
+def member_bucket(author_urn):
+    return f"member:{author_urn}"
+
+
+def _limit(name):
+    return current_app.config.get(name, DEFAULT_LIMITS[name])
+
+
+def _bucket_limits(author_urn):
+    """Return {bucket key: (capacity, refill per second)}."""
+    return {
+        APP_BUCKET: (
+            _limit("RATE_LIMIT_APP_CAPACITY"),
+            _limit("RATE_LIMIT_APP_PER_DAY") / SECONDS_PER_DAY,
+        ),
+        member_bucket(author_urn): (
+            _limit("RATE_LIMIT_MEMBER_CAPACITY"),
+            _limit("RATE_LIMIT_MEMBER_PER_DAY") / SECONDS_PER_DAY,
+        ),
+    }
+
+
+def _try_acquire(limits, now):
+    table = RateLimitBucket.__table__
+    with db.engine.begin() as conn:
+        # Lock rows in key order so concurrent callers cannot deadlock.
+        rows = {
+            row.key: row
+            for row in conn.execute(
+                select(table)
+                .where(table.c.key.in_(sorted(limits)))
+                .order_by(table.c.key)
+                .with_for_update()
+            )
+        }
+
+        wait = 0.0
+        levels = {}
+        for key, (capacity, rate) in limits.items():
+            row = rows.get(key)
+            if row is None:
+                tokens = float(capacity)
+            else:
+                elapsed = max(0.0, (now - row.updated_at).total_seconds())
+                tokens = min(float(capacity), row.tokens + elapsed * rate)
+                if row.blocked_until and row.blocked_until > now:
+                    wait = max(wait, (row.blocked_until - now).total_seconds())
+            if tokens < 1:
+                wait = max(wait, (1 - tokens) / rate)
+            levels[key] = tokens
+
+        if wait > 0:
+            return wait
+
+        for key, tokens in levels.items():
+            values = {"tokens": tokens - 1, "updated_at": now}
+            if key in rows:
+                conn.execute(update(table).where(table.c.key == key).values(**values))
+            else:
+                conn.execute(insert(table).values(key=key, **values))
+    return 0.0
+
+
+def acquire(author_urn):
+    """
+    Take a token for one post by ``author_urn``.
+
+    Returns:
+        float: 0.0 if the post may be sent now, otherwise the number of
+        seconds to wait before trying again.
+    """
+    limits = _bucket_limits(author_urn)
+    now = utcnow()
+    try:
+        return _try_acquire(limits, now)
+    except IntegrityError:
+        # Another process created a missing bucket first; its row is there now.
+        return _try_acquire(limits, now)
+
+
+def defer(author_urn, retry_after, bucket=None):
+    """Block a bucket (the author's by default) for ``retry_after`` seconds."""
+    key = bucket or member_bucket(author_urn)
+    blocked_until = utcnow() + timedelta(seconds=retry_after)
+    table = RateLimitBucket.__table__
+    with db.engine.begin() as conn:
+        updated = conn.execute(
+            update(table).where(table.c.key == key).values(blocked_until=blocked_until)
+        ).rowcount
+        if not updated:
+            capacity, _ = _bucket_limits(author_urn).get(
+                key, (_limit("RATE_LIMIT_MEMBER_CAPACITY"), 0)
+            )
+            conn.execute(
+                insert(table).values(
+                    key=key,
+                    tokens=float(capacity),
+                    updated_at=utcnow(),
+                    blocked_until=blocked_until,
+                )
+            )
+    logger.warning("[RateLimit] %s blocked for %.0fs.", key, retry_after)
+
+
+def parse_retry_after(value, default=60.0):
+    """Parse a ``Retry-After`` header given in seconds or as an HTTP date."""
+    if not value:
+        return default
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return default
+    if retry_at.tzinfo is not None:
+        retry_at = retry_at.astimezone(timezone.utc).replace(tzinfo=None)
+    return max(0.0, (retry_at - utcnow()).total_seconds())
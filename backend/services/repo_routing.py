@@ -0,0 +1,263 @@
+"""
+Webhook routing from GitHub repository ID to subscribed users.
+
+``RepositorySubscription`` rows say which users receive posts for a
+repository, so organization repositories and users with many repositories
+are routed without trusting ``repository.owner.id``. Each process keeps the
+active subscriptions in a dict keyed by repository ID: a webhook resolves all
+of its recipients with one lookup.
+
+The map is loaded in full when the web server starts (``warm``, called from
+``wsgi.py``; on first use if that was skipped or failed), then refreshed incrementally every
+``ROUTING_REFRESH_INTERVAL`` seconds from the rows whose ``updated_at`` moved
+past the last one seen (less ``REFRESH_OVERLAP``, so a slow transaction that
+committed late is not missed). Unsubscribing clears ``active`` instead of
+deleting the row, which lets other processes see it go. Changes made through
+``subscribe``/``unsubscribe`` apply to this process's map immediately.
+
+Subscribing is only allowed to repositories the user can see on GitHub
+(``check_access``). Subscribers receive posts alongside the repository's
+owner, never instead of them.
+"""
+
+import time
+import threading
+from collections import namedtuple
+from datetime import timedelta
+
+from flask import current_app
+from sqlalchemy.exc import SQLAlchemyError
+
+from backend.models import db, RepositorySubscription, User, utcnow
+from backend.services import http_client
+
+GITHUB_REPOSITORY_URL = "https://api.github.com/repositories/{}"
+
+# Re-read rows this far behind the newest ``updated_at`` already applied.
+REFRESH_OVERLAP = timedelta(seconds=5)
+
+Route = namedtuple("Route", ["user_id", "SECRET_GITHUB_id", "settings"])
+
+
+class AccessDenied(Exception):
+    """The user cannot see the repository on GitHub."""
+
+
+class RoutingMap:
+    """Repository ID -> tuple of ``Route``, refreshed from the database."""
+
+    def __init__(self):
+        self._routes = {}
+        self._high_water = None
+        self._checked_at = None
+        self._lock = threading.Lock()
+
+    def targets(self, repository_id):
+        return self._routes.get(_key(repository_id), ())
+
+    def apply(self, repository_id, route, active):
+        """Add, replace or (when not ``active``) drop one user's route."""
+        with self._lock:
+            self._put(self._routes, _key(repository_id), route, active)
+
+    @staticmethod
+    def _put(routes, key, route, active):
+        # Tuples are replaced, never mutated, so readers need no lock.
+        current = tuple(r for r in routes.get(key, ()) if r.user_id != route.user_id)
+        if active:
+            current += (route,)
+        if current:
+            routes[key] = current
+        else:
+            routes.pop(key, None)
+
+    def refresh(self, interval):
+        """Load or catch up with the table once ``interval`` seconds have passed."""
+        now = time.monotonic()
+        if self._checked_at is not None and now - self._checked_at < interval:
+            return
+        with self._lock:
+            if self._checked_at is not None and now - self._checked_at < interval:
+                return
+            query = db.session.query(
+                RepositorySubscription, User.SECRET_GITHUB_id
+            ).join(User, User.id == RepositorySubscription.user_id)
+            if self._high_water is None:
+                # Full load, swapped in at once below.
+                routes = {}
+                query = query.filter(RepositorySubscription.active.is_(True))
+                high_water = utcnow() - REFRESH_OVERLAP
+            else:
+                routes = self._routes
+                query = query.filter(
+                    RepositorySubscription.updated_at
+                    > self._high_water - REFRESH_OVERLAP
+                )
+                high_water = self._high_water
+            for subscription, SECRET_GITHUB_id in query:
+                route = Route(
+                    subscription.user_id, SECRET_GITHUB_id, subscription.settings or {}
+                )
+                self._put(
+                    routes, _key(subscription.repository_id), route, subscription.active
+                )
+                high_water = max(high_water, subscription.updated_at)
+            self._routes = routes
+            self._high_water = high_water
+            self._checked_at = now
+
+    def clear(self):
+        with self._lock:
+            self._routes = {}
+            self._high_water = None
+            self._checked_at = None
+
+    def __len__(self):
+        return len(self._routes)
+
+
+def _key(repository_id):
+    return str(repository_id)
+
+
+_map = RoutingMap()
+
+
+def warm(app):
+    """Load the map now so the first webhook does not pay for it."""
+    with app.app_context():
+        try:
+            _map.refresh(0)
+        except SQLAlchemyError as e:
+            # E.g. before the migrations ran; the first webhook retries.
+            app.logger.warning("[Routing] Could not load subscriptions: %s", e)
+        else:
+            app.logger.info("[Routing] Loaded %d routed repositories.", len(_map))
+        finally:
+            db.session.remove()
+
+
+def targets(repository_id):
+    """
+    The routes subscribed to a repository.
+
+    Returns:
+        tuple[Route, ...]: Empty when nobody subscribed (or no ID was given).
+    """
+    if repository_id is None:
+        return ()
+    _map.refresh(current_app.config.get("ROUTING_REFRESH_INTERVAL", 30))
+    return _map.targets(repository_id)
+
+
+def branch_allowed(route, ref):
+    """Whether a push to ``ref`` passes the route's ``branches`` setting."""
+    branches = route.settings.get("branches")
+    if not branches or not ref:
+        return True
+    return ref.removeprefix("refs/heads/") in branches
+
+
+def validate_settings(settings):
+    """
+    Raises:
+        ValueError: Unless ``settings`` is a dict whose ``branches``, if any,
+            is a list of branch names.
+    """
+    if not isinstance(settings, dict):
+        raise ValueError("Subscription settings must be an object")
+    branches = settings.get("branches")
+    if branches is not None and not (
+        isinstance(branches, list) and all(isinstance(b, str) for b in branches)
+    ):
+        raise ValueError("branches must be a list of branch names")
+
+
+def check_access(user, repository_id):
+    """
+    Ask GitHub, with ``user``'s own token, for the repository.
+
+    Args:
+        user (User): The user model (snapshots carry no token).
+
+    Returns:
+        str: The repository's ``full_name`` as GitHub reports it.
+
+    Raises:
+        AccessDenied: If GitHub does not show the repository to the user.
+        requests.RequestException: If GitHub could not be reached.
+    """
+    response = http_client.get(
+        GITHUB_REPOSITORY_URL.format(repository_id),
+        headers={
+            "Authorization": f"token {user.SECRET_GITHUB_TOKEN}",
+            "Accept": "application/vnd.github+json",
+        },
+    )
+    if response.status_code != 200:
+        raise AccessDenied(
+            f"Repository {repository_id} is not accessible: {response.status_code}"
+        )
+    return response.json().get("full_name")
+
+
+def subscribe(user, repository_id, repo_full_name=None, settings=None):
+    """
+    Subscribe (or update the subscription of) ``user`` to a repository.
+
+    Callers serving users must ``check_access`` first.
+
+    Raises:
+        ValueError: For invalid ``settings``.
+    """
+    if settings is not None:
+        validate_settings(settings)
+    subscription = RepositorySubscription.query.filter_by(
+        repository_id=repository_id, user_id=user.id
+    ).first()
+    if subscription is None:
+        subscription = RepositorySubscription(
+            repository_id=repository_id, user_id=user.id
+        )
+        db.session.add(subscription)
+    if repo_full_name is not None:
+        subscription.repo_full_name = repo_full_name
+    if settings is not None:
+        subscription.settings = settings
+    subscription.active = True
+    subscription.updated_at = utcnow()
+    db.session.commit()
+    _map.apply(
+        repository_id,
+        Route(user.id, user.SECRET_GITHUB_id, subscription.settings or {}),
+        active=True,
+    )
+    return subscription
+
+
+def unsubscribe(user, repository_id):
+    """Deactivate ``user``'s subscription; False if there was none."""
+    subscription = RepositorySubscription.query.filter_by(
+        repository_id=repository_id, user_id=user.id, active=True
+    ).first()
+    if subscription is None:
+        return False
+    subscription.active = False
+    subscription.updated_at = utcnow()
+    db.session.commit()
+    _map.apply(repository_id, Route(user.id, user.SECRET_GITHUB_id, {}), active=False)
+    return True
+
+
+def serialize(subscription):
+    return {
+        "repository_id": subscription.repository_id,
+        "repo_full_name": subscription.repo_full_name,
+        "settings": subscription.settings or {},
+        "active": subscription.active,
+        "updated_at": subscription.updated_at.isoformat(),
+    }
+
+
+def clear():
+    _map.clear()
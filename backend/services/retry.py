@@ -0,0 +1,149 @@
+"""
+Persistent retry scheduling for LinkedIn posts.
+
+A failed post is never retried in-line. ``schedule_retry`` records the error
+on the ``GitHubEvent`` (with the payload to render the retry from), moves it
+to ``retrying`` and sets ``next_attempt_at`` using jittered exponential
+backoff, so a LinkedIn outage spreads the retries out instead of having every
+worker hammer it in lockstep. Events that run out of attempts, or are older
+than ``RETRY_MAX_AGE_SECONDS``, are moved to the ``dead`` state. The worker
+calls ``dispatch_due_retries`` on every poll to turn due retries back into
+``post_event`` jobs.
+"""
+
+import random
+import logging
+from datetime import timedelta
+
+from flask import current_app
+from sqlalchemy import update
+
+from backend.models import db, GitHubEvent, Job, utcnow
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    "RETRY_MAX_ATTEMPTS": 6,
+    "RETRY_BASE_DELAY": 30,
+    "RETRY_MAX_DELAY": 3600,
+    "RETRY_MAX_AGE_SECONDS": 24 * 60 * 60,
+}
+
+
+def _setting(name):
+    return current_app.config.get(name, DEFAULTS[name])
+
+
+def compute_backoff(attempts, base=None, cap=None):
+    """
+    Seconds to wait before retry number ``attempts``.
+
+    The delay is jittered between ``base`` and the exponential ceiling rather
+    than from zero ("full jitter"), so no retry comes sooner than ``base``.
+
+    Args:
+        attempts (int): Attempts made so far (1 after the first failure).
+        base (float): Delay before the first retry; ``RETRY_BASE_DELAY``.
+        cap (float): Upper bound on any delay; ``RETRY_MAX_DELAY``.
+
+    Returns:
+        float: A delay drawn uniformly from [base, min(cap, base * 2**(attempts - 1))].
+    """
+    base = _setting("RETRY_BASE_DELAY") if base is None else base
+    cap = _setting("RETRY_MAX_DELAY") if cap is None else cap
+    ceiling = min(cap, base * 2 ** max(0, attempts - 1))
+    return random.uniform(min(base, ceiling), ceiling)
+
+
+def out_of_attempts(attempts, since=None):
+    """
+    Whether ``attempts`` failures, or an age since ``since`` (naive UTC), use
+    up the budget set by ``RETRY_MAX_ATTEMPTS`` and ``RETRY_MAX_AGE_SECONDS``.
+    """
+    age = (utcnow() - since).total_seconds() if since else 0
+    return attempts >= _setting("RETRY_MAX_ATTEMPTS") or age >= _setting(
+        "RETRY_MAX_AGE_SECONDS"
+    )
+
+
+def schedule_retry(event, error, payload=None):
+    """
+    Record a failed attempt for ``event`` and schedule the next one.
+
+    Changes are added to the current session; the caller commits.
+
+    Args:
+        event (GitHubEvent): The event whose post failed.
+        error (Exception | str): What went wrong.
+        payload (dict): Slimmed webhook payload to render the retry from;
+            kept on the event as ``retry_payload``.
+
+    Returns:
+        datetime | None: When the next attempt is due, or None if the event
+        was moved to the ``dead`` state.
+    """
+    now = utcnow()
+    event.attempts = (event.attempts or 0) + 1
+    event.last_error = str(error)[:2000]
+    if payload is not None:
+        event.retry_payload = payload
+
+    if out_of_attempts(event.attempts, event.timestamp):
+        event.status = "dead"
+        event.next_attempt_at = None
+        logger.error(
+            "[Retry] Event %s is dead after %s attempt(s): %s",
+            event.id,
+            event.attempts,
+            error,
+        )
+        return None
+
+    event.status = "retrying"
+    event.next_attempt_at = now + timedelta(seconds=compute_backoff(event.attempts))
+    logger.warning(
+        "[Retry] Event %s attempt %s failed; next attempt at %s: %s",
+        event.id,
+        event.attempts,
+        event.next_attempt_at.isoformat(),
+        error,
+    )
+    return event.next_attempt_at
+
+
+def dispatch_due_retries(limit=100):
+    """
+    Queue a ``post_event`` job for every retry that has come due.
+
+    Safe to call from several workers at once: each event is moved back to
+    ``pending`` with a conditional UPDATE, and only the winner enqueues it.
+
+    Returns:
+        int: Number of retries dispatched.
+    """
+    now = utcnow()
+    due = [
+        (row.id, row.retry_payload)
+        for row in db.session.query(GitHubEvent.id, GitHubEvent.retry_payload)
+        .filter(GitHubEvent.status == "retrying", GitHubEvent.next_attempt_at <= now)
+        .order_by(GitHubEvent.next_attempt_at)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    ]
+
+    dispatched = 0
+    for event_id, payload in due:
+        claimed = db.session.execute(
+            update(GitHubEvent)
+            .where(GitHubEvent.id == event_id, GitHubEvent.status == "retrying")
+            .values(status="pending", next_attempt_at=None)
+        ).rowcount
+        if not claimed:
+            continue
+        db.session.add(Job(kind="post_event", payload=payload, event_id=event_id))
+        dispatched += 1
+    db.session.commit()
+
+    if dispatched:
+        logger.info("[Retry] Dispatched %s due retry job(s).", dispatched)
+    return dispatched
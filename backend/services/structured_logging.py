@@ -0,0 +1,154 @@
+"""
+Structured, sampled and redacted logging.
+
+``init_app`` routes the app's and the services' loggers through one root
+handler with two filters and a formatter:
+
+* ``RedactionFilter`` masks bearer tokens, OAuth ``access_token``/``id_token``
+  values, GitHub tokens and JWTs in messages, and values of extra fields
+  whose names look like credentials (``token``, ``secret``, ...);
+* ``SamplingFilter`` keeps a fraction of the records of each category (the
+  ``[Tag]`` prefix of the message, or an explicit ``category`` extra) given
+  by ``LOG_SAMPLE_RATES`` (``"Webhook=0.1,Worker=0.5"``); warnings and errors
+  are never dropped;
+* ``JSONFormatter`` (``LOG_FORMAT=json``) writes one JSON object per record
+  with the extra fields as keys; otherwise records are plain text.
+
+Messages logged with ``%`` arguments are only formatted once a record has
+passed the level check and the sampler. Request bodies are never logged:
+``payload_fields`` describes one by size and digest instead.
+"""
+
+import re
+import sys
+import json
+import random
+import hashlib
+import logging
+
+from flask.logging import default_handler
+
+TEXT_FORMAT = "[%(asctime)s] %(levelname)s in %(module)s: %(message)s"
+REDACTED = "[REDACTED]"
+SENSITIVE_FIELD = re.compile(r"token|secret|password|authorization|cookie", re.I)
+SENSITIVE_VALUES = [
+    re.compile(r"(?i)(bearer\s+)[^\s'\",]+"),
+    re.compile(r"(?i)((?:access|id|refresh)_token['\"]?\s*[:=]\s*['\"]?)[^\s'\",&}]+"),
+    re.compile(r"()\bgh[pousr]_[A-Za-z0-9]{20,}"),
+    re.compile(r"()\beyJ[\w-]+\.[\w-]+\.[\w-]*"),
+]
+_CATEGORY = re.compile(r"\[([^\]]+)\]")
+# Attributes every LogRecord has; anything else was passed as ``extra``.
+_RECORD_FIELDS = frozenset(logging.LogRecord("", 0, "", 0, "", None, None).__dict__) | {
+    "message",
+    "asctime",
+    "category",
+}
+
+
+def redact(text):
+    """Mask credentials in ``text``."""
+    for pattern in SENSITIVE_VALUES:
+        text = pattern.sub(lambda m: m.group(1) + REDACTED, text)
+    return text
+
+
+def payload_fields(body):
+    """Log fields describing a request body without including it."""
+    body = body or b""
+    return {
+        "payload_size": len(body),
+        "payload_sha256": hashlib.sha256(body).hexdigest()[:16],
+    }
+
+
+def record_category(record):
+    category = getattr(record, "category", None)
+    if category:
+        return category
+    if isinstance(record.msg, str) and record.msg.startswith("["):
+        match = _CATEGORY.match(record.msg)
+        if match:
+            return match.group(1)
+    return None
+
+
+def parse_sample_rates(value):
+    """Parse ``"Webhook=0.1,Worker=0.5"`` into a dict of category -> rate."""
+    rates = {}
+    for item in (value or "").split(","):
+        if not item.strip():
+            continue
+        category, _, rate = item.partition("=")
+        try:
+            rates[category.strip()] = min(1.0, max(0.0, float(rate)))
+        except ValueError as e:
+            raise ValueError(f"Invalid log sample rate: {item}") from e
+    return rates
+
+
+class SamplingFilter(logging.Filter):
+    """Keep ``rates[category]`` of the records below WARNING in a category."""
+
+    def __init__(self, rates):
+        super().__init__()
+        self.rates = rates
+
+    def filter(self, record):
+        if not self.rates or record.levelno >= logging.WARNING:
+            return True
+        rate = self.rates.get(record_category(record))
+        return rate is None or random.random() < rate
+
+
+class RedactionFilter(logging.Filter):
+    """Mask credentials in the message and in sensitive extra fields."""
+
+    def filter(self, record):
+        message = record.getMessage()
+        redacted = redact(message)
+        if redacted != message:
+            record.msg, record.args = redacted, None
+        for key in record.__dict__.keys() - _RECORD_FIELDS:
+            if SENSITIVE_FIELD.search(key):
+                setattr(record, key, REDACTED)
+        return True
+
+
+class JSONFormatter(logging.Formatter):
+    """One JSON object per record, extra fields included."""
+
+    def format(self, record):
+        entry = {
+            "ts": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "category": record_category(record),
+            "message": record.getMessage(),
+        }
+        for key in record.__dict__.keys() - _RECORD_FIELDS:
+            entry[key] = record.__dict__[key]
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+def init_app(app):
+    """Install the log handler configured by ``LOG_FORMAT``/``LOG_SAMPLE_RATES``."""
+    handler = logging.StreamHandler(sys.stderr)
+    handler.name = "structured"
+    if app.config.get("LOG_FORMAT", "text") == "json":
+        handler.setFormatter(JSONFormatter())
+    else:
+        handler.setFormatter(logging.Formatter(TEXT_FORMAT))
+    # Sample first, so dropped records are never formatted or redacted.
+    rates = parse_sample_rates(app.config.get("LOG_SAMPLE_RATES"))
+    handler.addFilter(SamplingFilter(rates))
+    handler.addFilter(RedactionFilter())
+
+    root = logging.getLogger()
+    for existing in [h for h in root.handlers if h.name == "structured"]:
+        root.removeHandler(existing)
+    root.addHandler(handler)
+    # The app logger propagates to the root handler instead of printing twice.
+    app.logger.removeHandler(default_handler)
@@ -0,0 +1,229 @@
+"""
+Hashtag tagging for commit messages.
+
+A tag dictionary maps each hashtag to the rules that trigger it:
+
+* ``keywords``: case-insensitive substrings (``"fix"`` also matches
+  ``"hotfix"``, as the original digest tagging did);
+* ``patterns``: regular expressions, which must not use capturing groups;
+* ``conventional``: Conventional Commit types matched as a ``type(scope)!:``
+  prefix at the start of the message.
+
+``Tagger`` compiles a dictionary once: all Conventional Commit types into one
+anchored regex, all patterns into one alternation with a named group per
+tag, and all keywords into one alternation of lowercase literals, longest
+first. Tagging lowercases a message once and scans it a single time for
+keywords, however many there are: each search resumes one character past the
+last match, so overlapping keywords are all found, and a keyword also yields
+the tags of the shorter keywords it starts with (which the alternation skips
+at that position). Then comes at most one prefix match and one pattern scan.
+``sql_conditions`` expresses the keyword and Conventional Commit rules as SQL
+so stored events can be tagged in an aggregate query.
+See ``backend/benchmarks/bench_tagger.py`` for throughput against per-keyword
+substring scans. The dictionary comes from ``TAG_RULES`` (a dict) or
+``TAG_RULES_FILE`` (JSON) in the app config and defaults to
+``DEFAULT_TAG_RULES``.
+"""
+
+import re
+import json
+import hashlib
+import threading
+
+from flask import current_app, has_app_context
+from sqlalchemy import and_, func, or_
+
+DEFAULT_TAG_RULES = {
+    "#bugfix": {"keywords": ["fix"]},
+    "#refactor": {"keywords": ["refactor"]},
+    "#testing": {"keywords": ["test"]},
+}
+
+
+class Tagger:
+    """Tags messages against a compiled tag dictionary."""
+
+    def __init__(self, rules):
+        # Identifies the dictionary in cache keys of rendered output.
+        self.version = hashlib.sha256(
+            json.dumps(rules, sort_keys=True).encode("utf-8")
+        ).hexdigest()[:12]
+        self._order = list(rules)
+        self._groups = {}
+        self._sql_rules = {}
+        keywords = {}
+        prefixes, patterns = [], []
+        for index, (tag, rule) in enumerate(rules.items()):
+            name = f"t{index}"
+            self._groups[name] = tag
+
+            for keyword in rule.get("keywords", []):
+                if not keyword:
+                    raise ValueError(f"Empty keyword for {tag}")
+                keywords.setdefault(keyword.lower(), set()).add(tag)
+
+            types = rule.get("conventional", [])
+            if rule.get("keywords") or types:
+                self._sql_rules[tag] = (
+                    [keyword.lower() for keyword in rule.get("keywords", [])],
+                    [t.lower() for t in types],
+                )
+            if types:
+                prefixes.append(f"(?P<{name}>{'|'.join(map(re.escape, types))})")
+
+            for pattern in rule.get("patterns", []):
+                if re.compile(pattern).groups:
+                    raise ValueError(
+                        f"Tag pattern for {tag} must use non-capturing groups: {pattern}"
+                    )
+            if rule.get("patterns"):
+                alternation = "|".join(f"(?:{p})" for p in rule["patterns"])
+                patterns.append(f"(?P<{name}>{alternation})")
+
+        # Each keyword implies the tags of every keyword it starts with.
+        self._implied = {
+            keyword: frozenset(
+                tag
+                for other, tags in keywords.items()
+                if keyword.startswith(other)
+                for tag in tags
+            )
+            for keyword in keywords
+        }
+        self._search = (
+            re.compile(
+                "|".join(map(re.escape, sorted(keywords, key=len, reverse=True)))
+            ).search
+            if keywords
+            else None
+        )
+        self._prefix = (
+            re.compile(r"(?:%s)(?:\([^)\n]*\))?!?:" % "|".join(prefixes), re.IGNORECASE)
+            if prefixes
+            else None
+        )
+        self._patterns = (
+            re.compile("|".join(patterns), re.IGNORECASE) if patterns else None
+        )
+        self._keywords_only = not prefixes and not patterns
+
+    def tag(self, message):
+        """Return the tags matching ``message``, in dictionary order."""
+        if not message:
+            return []
+        found = ()
+        if self._search is not None:
+            lowered = message.lower()
+            match = self._search(lowered)
+            if match is not None:
+                found = self._scan(lowered, match)
+        if self._keywords_only:
+            return self.ordered(found) if found else []
+
+        found = set(found)
+        if self._prefix is not None:
+            match = self._prefix.match(message)
+            if match:
+                found.add(self._groups[match.lastgroup])
+        if self._patterns is not None:
+            for match in self._patterns.finditer(message):
+                found.add(self._groups[match.lastgroup])
+        if not found:
+            return []
+        return self.ordered(found)
+
+    def _scan(self, lowered, match):
+        """Tags of ``match`` and of every keyword occurrence after its start."""
+        search, implied = self._search, self._implied
+        found = set(implied[match.group()])
+        match = search(lowered, match.start() + 1)
+        while match is not None:
+            found |= implied[match.group()]
+            match = search(lowered, match.start() + 1)
+        return found
+
+    def tag_all(self, messages):
+        """Union of the tags of ``messages``, in dictionary order."""
+        found = set()
+        for message in messages:
+            found.update(self.tag(message))
+        return self.ordered(found)
+
+    def sql_conditions(self, column):
+        """
+        SQL conditions matching ``column`` per tag, for keyword and
+        Conventional Commit rules.
+
+        Tags with only ``patterns`` are left out: regular expressions have no
+        portable SQL form. A ``type(scope)`` prefix is approximated as the
+        type and ``(`` followed later by ``):`` or ``)!:``.
+
+        Returns:
+            dict: Tag to boolean SQL expression, in dictionary order.
+        """
+        lowered = func.lower(column)
+        conditions = {}
+        for tag, (keywords, types) in self._sql_rules.items():
+            clauses = [lowered.contains(k, autoescape=True) for k in keywords]
+            for t in types:
+                clauses += [
+                    lowered.startswith(f"{t}:", autoescape=True),
+                    lowered.startswith(f"{t}!:", autoescape=True),
+                    and_(
+                        lowered.startswith(f"{t}(", autoescape=True),
+                        or_(lowered.contains("):"), lowered.contains(")!:")),
+                    ),
+                ]
+            conditions[tag] = or_(*clauses)
+        return conditions
+
+    def ordered(self, tags):
+        """The given set of tags, in dictionary order."""
+        return [tag for tag in self._order if tag in tags]
+
+
+_lock = threading.Lock()
+_tagger = None
+_tagger_source = None
+
+
+def _rules_source():
+    """The configured rules (None for a file not yet read) and a cache key."""
+    if has_app_context():
+        rules = current_app.config.get("TAG_RULES")
+        if rules:
+            return rules, ("rules", id(rules))
+        path = current_app.config.get("TAG_RULES_FILE")
+        if path:
+            return None, ("file", path)
+    return DEFAULT_TAG_RULES, None
+
+
+def get_tagger():
+    """The tagger for the current configuration, compiled once and shared."""
+    global _tagger, _tagger_source
+
+    rules, source = _rules_source()
+    if _tagger is not None and _tagger_source == source:
+        return _tagger
+
+    with _lock:
+        if _tagger is None or _tagger_source != source:
+            if rules is None:
+                with open(source[1], encoding="utf-8") as f:
+                    rules = json.load(f)
+            _tagger = Tagger(rules)
+            _tagger_source = source
+        return _tagger
+
+
+def tag_message(message):
+    return get_tagger().tag(message)
+
+
+def clear():
+    global _tagger, _tagger_source
+
+    with _lock:
+        _tagger = None
+        _tagger_source = None
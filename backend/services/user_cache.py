@@ -0,0 +1,150 @@
+"""
+Per-process cache of user identity and LinkedIn credential state.
+
+``login_required`` and the webhook resolve a GitHub ID to a user on every
+request. This cache keeps a read-only ``UserSnapshot`` per GitHub ID for
+``USER_CACHE_TTL`` seconds, bounded to ``USER_CACHE_SIZE`` entries (least
+recently used first out). Code that changes a ``User`` calls ``invalidate``
+after committing; other processes see the change once their entry expires.
+
+Snapshots never hold access tokens. Code that needs the token, or needs to
+modify the user, loads the ORM object with ``db.session.get(User, snapshot.id)``.
+"""
+
+import os
+import time
+import threading
+from collections import OrderedDict, namedtuple
+
+from backend.models import User
+
+USER_CACHE_SIZE = int(os.getenv("USER_CACHE_SIZE", "1024"))
+USER_CACHE_TTL = float(os.getenv("USER_CACHE_TTL", "60"))
+
+
+class UserSnapshot(
+    namedtuple(
+        "UserSnapshot",
+        [
+            "id",
+            "SECRET_GITHUB_id",
+            "SECRET_GITHUB_username",
+            "linkedin_id",
+            "has_linkedin_token",
+            "name",
+            "email",
+            "avatar_url",
+            "digest_cadence",
+        ],
+    )
+):
+    """Immutable view of the ``User`` columns that requests read."""
+
+    __slots__ = ()
+
+    @classmethod
+    def from_user(cls, user):
+        return cls(
+            id=user.id,
+            SECRET_GITHUB_id=user.SECRET_GITHUB_id,
+            SECRET_GITHUB_username=user.SECRET_GITHUB_username,
+            linkedin_id=user.linkedin_id,
+            has_linkedin_token=bool(user.linkedin_token),
+            name=user.name,
+            email=user.email,
+            avatar_url=user.avatar_url,
+            digest_cadence=user.digest_cadence,
+        )
+
+    def has_valid_linkedin_token(self):
+        """Check if the user has a valid LinkedIn token."""
+        return self.has_linkedin_token and self.linkedin_id is not None
+
+
+class TTLCache:
+    """A thread-safe LRU mapping whose entries expire after ``ttl`` seconds."""
+
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._items.get(key)
+            if entry is not None and entry[0] > now:
+                self._items.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            if entry is not None:
+                del self._items[key]
+            self.misses += 1
+            return None
+
+    def set(self, key, value):
+        with self._lock:
+            self._items[key] = (time.monotonic() + self.ttl, value)
+            self._items.move_to_end(key)
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+
+    def pop(self, key):
+        with self._lock:
+            self._items.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self):
+        return len(self._items)
+
+
+_cache = TTLCache(USER_CACHE_SIZE, USER_CACHE_TTL)
+
+
+def get_user(SECRET_GITHUB_id):
+    """
+    Resolve a GitHub ID to a ``UserSnapshot``.
+
+    Args:
+        SECRET_GITHUB_id (str): The user's GitHub ID.
+
+    Returns:
+        UserSnapshot | None: The user, or None if there is no such user.
+        Misses are not cached, so a user who has just signed up is found.
+    """
+    if not SECRET_GITHUB_id:
+        return None
+    key = str(SECRET_GITHUB_id)
+    snapshot = _cache.get(key)
+    if snapshot is not None:
+        return snapshot
+
+    user = User.query.filter_by(SECRET_GITHUB_id=key).first()
+    if user is None:
+        return None
+    snapshot = UserSnapshot.from_user(user)
+    _cache.set(key, snapshot)
+    return snapshot
+
+
+def invalidate(SECRET_GITHUB_id):
+    """Forget the cached snapshot for a user whose row has changed."""
+    if SECRET_GITHUB_id:
+        _cache.pop(str(SECRET_GITHUB_id))
+
+
+def stats():
+    """Hit and miss counters for this process."""
+    return {"hits": _cache.hits, "misses": _cache.misses, "size": len(_cache)}
+
+
+def clear():
+    _cache.clear()
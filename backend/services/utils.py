@@ -1,7 +1,7 @@
 import os
 from functools import wraps
 from flask import request, jsonify, current_app
-from backend.models import User
+from backend.services import user_cache
 
 
 def login_required(f):
@@ -12,14 +12,15 @@ def login_required(f):
             current_app.logger.error("[Auth] Missing SECRET_GITHUB_user_id cookie.")
             return jsonify({"error": "Authentication required"}), 401
 
-        user = User.query.filter_by(SECRET_GITHUB_id=SECRET_GITHUB_user_id).first()
+        user = user_cache.get_user(SECRET_GITHUB_user_id)
         if not user:
             current_app.logger.error(
-                f"[Auth] User with GitHub ID {SECRET_GITHUB_user_id} not found."
+                "[Auth] User with GitHub ID %s not found.", SECRET_GITHUB_user_id
             )
             return jsonify({"error": "Invalid session"}), 401
 
-        # Attach the user to the request context for use in the route
+        # Attach the user to the request context for use in the route. This is a
+        # read-only UserSnapshot; routes that modify the user load it from the DB.
         request.user = user
         return f(*args, **kwargs)
 
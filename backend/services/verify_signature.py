@@ -1,22 +1,195 @@
 # backend/services/verify_signature.py
+"""
+GitHub webhook signature verification.
+
+Secrets are read from the environment once and kept as HMAC objects that
+already hold the keyed state; each request works on a ``copy()`` of them
+instead of re-encoding the secret and re-deriving the key pads.
+
+To rotate the webhook secret, list the new one in
+``SECRET_GITHUB_WEBHOOK_SECRET`` and the ones still in use in
+``SECRET_GITHUB_WEBHOOK_SECRETS`` (comma-separated). Bodies are hashed with
+the primary key as they stream in; the others are only tried, in order,
+when that does not match. The key that matched is reported by its
+fingerprint, never by its value.
+"""
+
 import os
 import hmac
 import hashlib
 import logging
+import threading
+
+# Bytes read from the request stream (and fed to the HMAC) at a time.
+CHUNK_SIZE = 64 * 1024
+
+SIGNATURE_PREFIX = "sha256="
+
+
+class PayloadTooLarge(Exception):
+    """The body grew past the allowed size while it was being read."""
+
+
+def key_id(secret):
+    """A short fingerprint of ``secret`` that is safe to log."""
+    return hashlib.sha256(secret).hexdigest()[:8]
+
+
+class Keyring:
+    """Active webhook secrets, primary first, as precomputed HMAC objects."""
+
+    def __init__(self, secrets):
+        self._keys = []
+        for secret in secrets:
+            secret = secret.encode("utf-8") if isinstance(secret, str) else secret
+            kid = key_id(secret)
+            if all(kid != known for known, _ in self._keys):
+                self._keys.append((kid, hmac.new(secret, digestmod=hashlib.sha256)))
+
+    @classmethod
+    def from_env(cls):
+        # An unset secret keeps the historical behaviour of an empty key.
+        primary = os.environ.get("SECRET_GITHUB_WEBHOOK_SECRET", "").strip()
+        others = os.environ.get("SECRET_GITHUB_WEBHOOK_SECRETS", "").split(",")
+        return cls([primary] + [s.strip() for s in others if s.strip()])
+
+    @property
+    def key_ids(self):
+        return [kid for kid, _ in self._keys]
+
+    @property
+    def primary_id(self):
+        return self._keys[0][0]
+
+    def new_mac(self):
+        """A fresh HMAC under the primary key."""
+        return self._keys[0][1].copy()
+
+    def match(self, data, signature, primary_mac=None):
+        """
+        Return the ID of the key that signed ``data``, or ``None``.
+
+        ``primary_mac`` is the primary key's HMAC already fed with ``data``
+        (as built while streaming), which saves hashing it again.
+        """
+        if not signature.startswith(SIGNATURE_PREFIX) or not signature.isascii():
+            return None
+        expected = signature[len(SIGNATURE_PREFIX) :]
+        for index, (kid, template) in enumerate(self._keys):
+            if index == 0 and primary_mac is not None:
+                mac = primary_mac.copy()
+            else:
+                mac = template.copy()
+                mac.update(data)
+            if hmac.compare_digest(mac.hexdigest(), expected):
+                return kid
+        return None
+
+
+_keyring = None
+_lock = threading.Lock()
 
 
-def verifyGITHUB_signature(raw_payload: bytes, signature: str) -> bool:
+def keyring():
+    """The process-wide keyring, loaded from the environment on first use."""
+    global _keyring
+    if _keyring is None:
+        with _lock:
+            if _keyring is None:
+                _keyring = Keyring.from_env()
+    return _keyring
+
+
+def reset():
+    """Forget the loaded secrets; the next request reads the environment again."""
+    global _keyring
+    with _lock:
+        _keyring = None
+
+
+class SignedBody:
+    """A request body with the primary key's HMAC, computed while reading it."""
+
+    __slots__ = ("data", "key_id", "_mac")
+
+    def __init__(self, data, mac):
+        self.data = data
+        self.key_id = None
+        self._mac = mac
+
+    def __len__(self):
+        return len(self.data)
+
+
+def read_signed_body(
+    stream, content_length=None, max_length=None, chunk_size=CHUNK_SIZE
+):
+    """
+    Read ``stream`` in chunks, updating the HMAC as each chunk arrives.
+
+    With a known ``content_length`` the chunks land directly in one buffer of
+    that size, so the body is held once and never copied. Bodies sent without
+    a length are read until EOF; past ``max_length`` either way,
+    ``PayloadTooLarge`` is raised without reading further.
+    """
+    mac = keyring().new_mac()
+
+    if content_length is None:
+        data = bytearray()
+        while chunk := stream.read(chunk_size):
+            data += chunk
+            if max_length and len(data) > max_length:
+                raise PayloadTooLarge(len(data))
+            mac.update(chunk)
+        return SignedBody(data, mac)
+
+    if max_length and content_length > max_length:
+        raise PayloadTooLarge(content_length)
+    data = bytearray(content_length)
+    with memoryview(data) as view:
+        read = 0
+        while read < content_length:
+            count = stream.readinto(view[read : read + chunk_size])
+            if not count:
+                break
+            mac.update(view[read : read + count])
+            read += count
+    if read < content_length:
+        # The client disconnected early; what arrived is what was signed.
+        del data[read:]
+    return SignedBody(data, mac)
+
+
+def match_signature(raw_payload, signature):
+    """The ID of the key ``signature`` was made with, or ``None``."""
+    if not signature:
+        return None
+    keys = keyring()
+    if isinstance(raw_payload, SignedBody):
+        return keys.match(raw_payload.data, signature, primary_mac=raw_payload._mac)
+    return keys.match(raw_payload, signature)
+
+
+def verifyGITHUB_signature(raw_payload, signature: str) -> bool:
+    """
+    Check ``signature`` against raw bytes or a ``SignedBody``.
+
+    On success a ``SignedBody`` records the matching key in ``key_id``.
+    """
     if not signature:
         logging.warning("[Signature Verification] Missing signature in request.")
         return False
 
-    secret = os.environ.get("SECRET_GITHUB_WEBHOOK_SECRET", "").encode("utf-8")
-    expected_signature = (
-        "sha256=" + hmac.new(secret, raw_payload, hashlib.sha256).hexdigest()
-    )
-
-    if not hmac.compare_digest(expected_signature, signature):
+    matched = match_signature(raw_payload, signature)
+    if matched is None:
         logging.warning("[Signature Verification] Signature mismatch.")
         return False
 
+    if isinstance(raw_payload, SignedBody):
+        raw_payload.key_id = matched
+    if matched != keyring().primary_id:
+        logging.info(
+            "[Signature Verification] Matched rotating key %s, not the primary.",
+            matched,
+        )
     return True
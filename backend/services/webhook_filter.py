@@ -0,0 +1,53 @@
+"""
+Header-only checks run on a GitHub webhook before its body is read.
+
+Deliveries GitHub would send for events we do not handle (``star``,
+``issues``, ``workflow_run``, ...), bodies over ``WEBHOOK_MAX_CONTENT_LENGTH``
+and deliveries from hooks outside ``WEBHOOK_ALLOWED_HOOK_IDS`` are turned
+away from the request headers alone, so they are never buffered or
+HMAC-verified.
+"""
+
+from collections import namedtuple
+
+from flask import current_app
+
+SUPPORTED_EVENTS = frozenset({"push", "pull_request"})
+
+Rejection = namedtuple("Rejection", ["status", "error", "outcome", "reason"])
+
+
+def max_content_length():
+    return current_app.config.get("WEBHOOK_MAX_CONTENT_LENGTH")
+
+
+def allowed_hook_ids():
+    """The configured hook IDs, or an empty set when any hook is accepted."""
+    value = current_app.config.get("WEBHOOK_ALLOWED_HOOK_IDS") or ""
+    if isinstance(value, str):
+        value = value.split(",")
+    return {str(hook_id).strip() for hook_id in value if str(hook_id).strip()}
+
+
+def check_headers(headers, content_length):
+    """Return a ``Rejection`` for a delivery we would refuse, else ``None``."""
+    event_type = headers.get("X-GitHub-Event")
+    if not event_type:
+        return Rejection(400, "Missing event type", "invalid_headers", "no event type")
+    if event_type not in SUPPORTED_EVENTS:
+        return Rejection(
+            400, "Unsupported event type", "unsupported", f"event type {event_type}"
+        )
+
+    limit = max_content_length()
+    if limit and content_length is not None and content_length > limit:
+        return Rejection(
+            413, "Payload too large", "too_large", f"{content_length} bytes"
+        )
+
+    allowed = allowed_hook_ids()
+    hook_id = headers.get("X-GitHub-Hook-ID")
+    if allowed and hook_id not in allowed:
+        return Rejection(403, "Unknown hook", "unknown_hook", f"hook {hook_id}")
+
+    return None
@@ -110,3 +110,26 @@ def patch_post_to_linkedin():
             },
         )()
         yield mock_func
+
+
+@pytest.fixture(autouse=True)
+def reset_caches():
+    """In-process caches outlive the per-test database; start each test clean."""
+    from backend.services import (
+        dedup,
+        post_templates,
+        preview_cache,
+        repo_routing,
+        tagger,
+        user_cache,
+        verify_signature,
+    )
+
+    dedup.clear()
+    user_cache.clear()
+    post_templates.clear()
+    preview_cache.clear()
+    tagger.clear()
+    verify_signature.reset()
+    repo_routing.clear()
+    yield
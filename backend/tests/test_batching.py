@@ -0,0 +1,202 @@
+import json
+from datetime import timedelta
+from unittest.mock import patch, MagicMock
+
+import pytest
+from sqlalchemy.exc import IntegrityError
+
+from backend.models import db, GitHubEvent, Job, User, utcnow
+from backend.services.batching import (
+    flush_batch,
+    recover_stale_batches,
+    schedule_flush,
+)
+from backend.services.job_queue import claim_next, requeue_stale_jobs, run_job
+
+
+def _payload(sha, message):
+    return {
+        "repository": {"name": "busy-repo", "owner": {"id": "busyuser"}},
+        "pusher": {"name": "busyuser"},
+        "head_commit": {"id": sha, "message": message},
+    }
+
+
+@pytest.fixture
+def busy_user(app):
+    user = User(
+        SECRET_GITHUB_id="busyuser",
+        SECRET_GITHUB_TOKEN="gh_token",
+        linkedin_token="li_token",
+        linkedin_id="123456789",
+    )
+    db.session.add(user)
+    db.session.commit()
+    return user
+
+
+def _add_held(user, *messages):
+    for message in messages:
+        db.session.add(
+            GitHubEvent(
+                user_id=user.id,
+                repo_name="busy-repo",
+                commit_message=message,
+                status="held",
+            )
+        )
+    db.session.commit()
+
+
+@patch("backend.routes.verifyGITHUB_signature", return_value=True)
+def test_webhook_holds_pushes_for_one_flush(
+    mock_verify, app, client, busy_user, patch_post_to_linkedin
+):
+    app.config["DIGEST_WINDOW_SECONDS"] = 600
+
+    for sha, message in [("a" * 40, "Fix login"), ("b" * 40, "Add tests")]:
+        response = client.post(
+            "/webhook/github",
+            data=json.dumps(_payload(sha, message)),
+            headers={
+                "X-Hub-Signature-256": "sha256=ignored",
+                "X-GitHub-Event": "push",
+                "Content-Type": "application/json",
+            },
+        )
+        assert response.status_code == 202
+        assert response.get_json()["status"] == "batched"
+
+    patch_post_to_linkedin.assert_not_called()
+    assert GitHubEvent.query.filter_by(status="held").count() == 2
+    job = Job.query.filter_by(kind="flush_batch").one()
+    assert job.payload == {"user_id": busy_user.id, "repo_name": "busy-repo"}
+
+
+@patch("backend.services.batching.send_post_to_linkedin")
+def test_flush_batch_publishes_one_digest(mock_send, app, busy_user):
+    mock_send.return_value = MagicMock(
+        status_code=201, json=lambda: {"id": "urn:li:share:9"}
+    )
+    _add_held(busy_user, "Fix login", "Add tests", "Refactor models")
+
+    assert flush_batch(busy_user.id, "busy-repo") == 3
+
+    mock_send.assert_called_once()
+    post_text = mock_send.call_args.kwargs["post_text"]
+    assert "Fix login; Add tests; Refactor models" in post_text
+    events = GitHubEvent.query.all()
+    assert {event.status for event in events} == {"posted"}
+    assert {event.linkedin_post_id for event in events} == {"urn:li:share:9"}
+    assert flush_batch(busy_user.id, "busy-repo") == 0
+
+
+@patch("backend.services.batching.send_post_to_linkedin")
+def test_flush_batch_leaves_events_with_their_own_jobs(mock_send, app, busy_user):
+    mock_send.return_value = MagicMock(
+        status_code=201, json=lambda: {"id": "urn:li:share:9"}
+    )
+    _add_held(busy_user, "Fix login")
+    # Queued for its own post_event job, or a dispatched retry.
+    db.session.add(
+        GitHubEvent(
+            user_id=busy_user.id,
+            repo_name="busy-repo",
+            commit_message="Posted on its own",
+            status="pending",
+        )
+    )
+    db.session.commit()
+
+    assert flush_batch(busy_user.id, "busy-repo") == 1
+    assert "Posted on its own" not in mock_send.call_args.kwargs["post_text"]
+    assert GitHubEvent.query.filter_by(status="pending").count() == 1
+
+
+def test_one_flush_is_queued_per_window(app, busy_user):
+    app.config["DIGEST_WINDOW_SECONDS"] = 600
+    _add_held(busy_user, "Fix login", "Add tests")
+    first, second = GitHubEvent.query.order_by(GitHubEvent.id).all()
+
+    assert schedule_flush(first) == schedule_flush(second)
+    db.session.commit()
+    assert Job.query.filter_by(kind="flush_batch").count() == 1
+
+    # A concurrent webhook that missed the queued job loses the insert.
+    db.session.add(Job(kind="flush_batch", key=Job.query.one().key, status="queued"))
+    with pytest.raises(IntegrityError):
+        db.session.commit()
+    db.session.rollback()
+
+
+def test_stale_flush_is_dropped_when_its_key_was_queued_again(app, busy_user):
+    key = f"flush_batch:{busy_user.id}:busy-repo"
+    stale = Job(
+        kind="flush_batch",
+        key=key,
+        status="running",
+        locked_at=utcnow() - timedelta(hours=1),
+    )
+    db.session.add_all([stale, Job(kind="flush_batch", key=key)])
+    db.session.commit()
+
+    assert requeue_stale_jobs() == 0
+    assert db.session.get(Job, stale.id).status == "failed"
+
+
+@patch("backend.services.batching.send_post_to_linkedin")
+def test_flush_batch_failure_returns_events_to_held(mock_send, app, busy_user):
+    mock_send.side_effect = ValueError("Failed to post to LinkedIn: 500")
+    _add_held(busy_user, "Fix login")
+
+    with pytest.raises(ValueError):
+        flush_batch(busy_user.id, "busy-repo")
+
+    event = GitHubEvent.query.one()
+    assert event.status == "held"
+    assert event.attempts == 1
+    assert "500" in event.last_error
+    # The next flush is queued after a backoff, without waiting for a push.
+    job = Job.query.filter_by(kind="flush_batch", status="queued").one()
+    assert job.payload["attempt"] == 1
+    assert job.run_at > utcnow()
+
+
+@patch("backend.services.batching.send_post_to_linkedin")
+def test_flush_retries_end_in_dead_events(mock_send, app, busy_user):
+    app.config["RETRY_MAX_ATTEMPTS"] = 2
+    mock_send.side_effect = ValueError("Failed to post to LinkedIn: 503")
+    _add_held(busy_user, "Fix login")
+    db.session.add(
+        Job(
+            kind="flush_batch",
+            payload={"user_id": busy_user.id, "repo_name": "busy-repo"},
+        )
+    )
+    db.session.commit()
+
+    run_job(claim_next("test-worker"))
+    retry = Job.query.filter_by(kind="flush_batch", status="queued").one()
+    retry.run_at = utcnow()
+    db.session.commit()
+    run_job(claim_next("test-worker"))
+
+    assert GitHubEvent.query.one().status == "dead"
+    assert Job.query.filter_by(status="queued").count() == 0
+
+
+def test_recover_stale_batches_releases_expired_claims(app, busy_user):
+    _add_held(busy_user, "Crashed mid-flush", "Still flushing")
+    crashed, running = GitHubEvent.query.order_by(GitHubEvent.id).all()
+    crashed.status = running.status = "batched"
+    crashed.next_attempt_at = utcnow() - timedelta(seconds=1)
+    running.next_attempt_at = utcnow() + timedelta(minutes=5)
+    db.session.commit()
+
+    assert recover_stale_batches() == 1
+
+    assert db.session.get(GitHubEvent, crashed.id).status == "held"
+    assert db.session.get(GitHubEvent, running.id).status == "batched"
+    job = Job.query.filter_by(kind="flush_batch", status="queued").one()
+    assert job.payload == {"user_id": busy_user.id, "repo_name": "busy-repo"}
+    assert recover_stale_batches() == 0
@@ -0,0 +1,116 @@
+from datetime import timedelta
+from unittest.mock import patch, MagicMock
+
+import pytest
+import requests
+
+from backend.models import db, CircuitBreakerState, User, utcnow
+from backend.services import circuit_breaker
+from backend.services.post_to_linkedin import (
+    LINKEDIN_POST_URL,
+    PostDeferred,
+    post_to_linkedin,
+)
+
+ENDPOINT = "https://example.test/ugcPosts"
+
+
+@pytest.fixture
+def breaker_user(app):
+    user = User(
+        SECRET_GITHUB_id="breakeruser",
+        SECRET_GITHUB_TOKEN="gh_token",
+        linkedin_token="li_token",
+        linkedin_id="123456789",
+    )
+    db.session.add(user)
+    db.session.commit()
+    return user
+
+
+def _payload():
+    return {
+        "repository": {"name": "breaker-repo", "html_url": "https://github.com/x"},
+        "head_commit": {"message": "Trip it", "author": {"name": "Breaker"}},
+    }
+
+
+def test_breaker_opens_after_threshold_failures(app):
+    app.config["BREAKER_FAILURE_THRESHOLD"] = 3
+
+    assert circuit_breaker.record_failure(ENDPOINT) == circuit_breaker.CLOSED
+    assert circuit_breaker.record_failure(ENDPOINT) == circuit_breaker.CLOSED
+    assert circuit_breaker.allow(ENDPOINT) == 0.0
+    assert circuit_breaker.record_failure(ENDPOINT) == circuit_breaker.OPEN
+    assert circuit_breaker.allow(ENDPOINT) > 0
+
+
+def test_half_open_admits_a_single_probe(app):
+    app.config["BREAKER_FAILURE_THRESHOLD"] = 1
+    circuit_breaker.record_failure(ENDPOINT)
+    db.session.query(CircuitBreakerState).update(
+        {"opened_at": utcnow() - timedelta(minutes=5)}
+    )
+    db.session.commit()
+
+    assert circuit_breaker.allow(ENDPOINT) == 0.0
+    assert circuit_breaker.allow(ENDPOINT) > 0
+
+    circuit_breaker.record_success(ENDPOINT)
+    assert circuit_breaker.allow(ENDPOINT) == 0.0
+    row = db.session.get(CircuitBreakerState, ENDPOINT)
+    db.session.refresh(row)
+    assert (row.state, row.failure_count) == (circuit_breaker.CLOSED, 0)
+
+
+def test_failed_probe_reopens_the_breaker(app):
+    app.config["BREAKER_FAILURE_THRESHOLD"] = 5
+    db.session.add(
+        CircuitBreakerState(
+            endpoint=ENDPOINT, state=circuit_breaker.HALF_OPEN, failure_count=5
+        )
+    )
+    db.session.commit()
+
+    assert circuit_breaker.record_failure(ENDPOINT) == circuit_breaker.OPEN
+
+
+@patch("backend.services.http_client.post")
+def test_open_breaker_fails_fast_without_calling_linkedin(mock_post, app, breaker_user):
+    app.config["BREAKER_FAILURE_THRESHOLD"] = 2
+    mock_post.side_effect = requests.ConnectionError("connection refused")
+
+    for _ in range(2):
+        with pytest.raises(requests.ConnectionError):
+            post_to_linkedin(breaker_user, "breaker-repo", "Trip it", _payload())
+
+    with pytest.raises(PostDeferred):
+        post_to_linkedin(breaker_user, "breaker-repo", "Trip it", _payload())
+    assert mock_post.call_count == 2
+
+
+@patch("backend.services.http_client.post")
+def test_server_errors_count_and_success_resets(mock_post, app, breaker_user):
+    mock_post.return_value = MagicMock(status_code=503, text="unavailable")
+    with pytest.raises(ValueError):
+        post_to_linkedin(breaker_user, "breaker-repo", "Trip it", _payload())
+    assert db.session.get(CircuitBreakerState, LINKEDIN_POST_URL).failure_count == 1
+
+    mock_post.return_value = MagicMock(status_code=201)
+    post_to_linkedin(breaker_user, "breaker-repo", "Trip it", _payload())
+    db.session.expire_all()
+    assert db.session.get(CircuitBreakerState, LINKEDIN_POST_URL).failure_count == 0
+
+
+def test_health_reports_breaker_state(app, client):
+    app.config["BREAKER_FAILURE_THRESHOLD"] = 1
+    body = client.get("/health").get_json()
+    assert (body["status"], body["circuit_breakers"]) == ("ok", [])
+
+    circuit_breaker.record_failure(ENDPOINT)
+    body = client.get("/health").get_json()
+
+    assert body["status"] == "degraded"
+    assert body["circuit_breakers"][0]["endpoint"] == ENDPOINT
+    assert body["circuit_breakers"][0]["state"] == "open"
+    assert body["circuit_breakers"][0]["retry_at"] is not None
@@ -0,0 +1,107 @@
+import json
+from unittest.mock import patch, MagicMock
+
+import pytest
+
+from backend.models import db, GitHubEvent, User
+from backend.services import dedup
+
+
+def _payload(sha, message="Fix typo"):
+    return {
+        "repository": {"name": "dedup-repo", "owner": {"id": "dedupuser"}},
+        "pusher": {"name": "dedupuser"},
+        "head_commit": {
+            "id": sha,
+            "message": message,
+            "url": f"https://github.com/dedupuser/dedup-repo/commit/{sha}",
+        },
+    }
+
+
+def _post(client, payload, delivery_id):
+    return client.post(
+        "/webhook/github",
+        data=json.dumps(payload),
+        headers={
+            "X-Hub-Signature-256": "sha256=ignored",
+            "X-GitHub-Event": "push",
+            "X-GitHub-Delivery": delivery_id,
+            "Content-Type": "application/json",
+        },
+    )
+
+
+@pytest.fixture
+def linked_user(app):
+    user = User(
+        SECRET_GITHUB_id="dedupuser",
+        SECRET_GITHUB_TOKEN="gh_token",
+        linkedin_token="li_token",
+        linkedin_id="123456789",
+    )
+    db.session.add(user)
+    db.session.commit()
+    return user
+
+
+@patch("backend.routes.verifyGITHUB_signature", return_value=True)
+def test_same_message_different_commits_are_both_posted(
+    mock_verify, client, linked_user, patch_post_to_linkedin
+):
+    patch_post_to_linkedin.side_effect = None
+    patch_post_to_linkedin.return_value = MagicMock(
+        status_code=201, json=lambda: {"id": "post"}
+    )
+
+    first = _post(client, _payload("a" * 40), "delivery-1")
+    second = _post(client, _payload("b" * 40), "delivery-2")
+
+    assert first.get_json()["status"] == "success"
+    assert second.get_json()["status"] == "success"
+    assert patch_post_to_linkedin.call_count == 2
+    assert GitHubEvent.query.count() == 2
+
+
+@patch("backend.routes.verifyGITHUB_signature", return_value=True)
+def test_redelivery_is_skipped(
+    mock_verify, client, linked_user, patch_post_to_linkedin
+):
+    patch_post_to_linkedin.side_effect = None
+    patch_post_to_linkedin.return_value = MagicMock(
+        status_code=201, json=lambda: {"id": "post"}
+    )
+
+    _post(client, _payload("c" * 40), "delivery-3")
+    response = _post(client, _payload("c" * 40), "delivery-3")
+
+    assert response.get_json() == {"message": "Redundant event"}
+    assert patch_post_to_linkedin.call_count == 1
+    event = GitHubEvent.query.one()
+    assert event.delivery_id == "delivery-3"
+    assert event.commit_sha == "c" * 40
+    assert event.dedup_key == dedup.make_dedup_key(
+        linked_user.id, "dedup-repo", "c" * 40
+    )
+
+
+def test_front_cache_answers_without_database(app):
+    """Remembered keys are reported as duplicates without a query."""
+    dedup.remember("some-key", "some-delivery")
+
+    with patch.object(db.session, "query") as mock_query:
+        assert dedup.is_duplicate("some-key")
+        assert dedup.is_duplicate(delivery_id="some-delivery")
+        mock_query.assert_not_called()
+
+
+def test_lru_set_evicts_least_recently_used():
+    seen = dedup.LRUSet(maxsize=2)
+    seen.add("a")
+    seen.add("b")
+    assert "a" in seen  # refreshes "a"
+    seen.add("c")
+
+    assert "a" in seen
+    assert "b" not in seen
+    assert len(seen) == 2
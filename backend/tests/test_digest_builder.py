@@ -0,0 +1,68 @@
+from backend.services.digest_builder import DigestBuilder
+from backend.services.post_generator import generate_digest_post
+
+
+def _events(repo, count, message="Commit"):
+    for i in range(count):
+        yield {"repository": {"name": repo}, "message": f"{message} {i}"}
+
+
+def test_generator_input_matches_list_input():
+    events = list(_events("repo1", 3)) + list(_events("repo2", 2))
+
+    assert generate_digest_post(iter(events)) == generate_digest_post(events)
+    assert generate_digest_post(iter([])) == "No events to summarize."
+
+
+def test_message_budget_keeps_counts_and_tags_of_every_event():
+    events = list(_events("repo1", 4)) + [
+        {"repository": {"name": "repo1"}, "message": "Fix flaky test"}
+    ]
+
+    result = generate_digest_post(
+        events, return_as_string=False, max_messages_per_group=2
+    )
+
+    group = result["repo1"]
+    assert group["count"] == 5
+    assert len(group["commits"]) == 2
+    assert group["summary"] == "Commit 0; Commit 1; ...and 3 more"
+    assert group["tags"] == ["#bugfix", "#testing"]
+
+
+def test_group_budget_reports_events_not_shown():
+    events = [event for i in range(5) for event in _events(f"repo{i}", 2)]
+
+    post = generate_digest_post(events, max_groups=3)
+
+    assert "- repo2" in post
+    assert "- repo3" not in post
+    assert post.endswith("\n...and 4 more commits not shown")
+
+
+def test_builder_memory_is_bounded_by_budgets():
+    builder = DigestBuilder(max_groups=10, max_messages_per_group=5)
+    builder.extend(
+        {"repository": {"name": f"repo{i % 1000}"}, "message": "Commit"}
+        for i in range(100_000)
+    )
+
+    assert builder.total == 100_000
+    assert len(builder.groups) == 10
+    assert all(len(group.messages) == 5 for group in builder.groups.values())
+    assert sum(group.count for group in builder.groups.values()) == 1_000
+    assert builder.dropped_events == 99_000
+
+
+def test_digest_preview_applies_configured_budgets(app, client):
+    app.config["DIGEST_MAX_GROUPS"] = 1
+    app.config["DIGEST_MAX_MESSAGES_PER_GROUP"] = 1
+    payload = {"events": list(_events("repo1", 3)) + list(_events("repo2", 1))}
+
+    preview = client.post("/api/preview_linkedin_digest", json=payload).get_json()[
+        "preview"
+    ]
+
+    assert "Summary: Commit 0; ...and 2 more" in preview
+    assert "repo2" not in preview
+    assert preview.endswith("...and 1 more commits not shown")
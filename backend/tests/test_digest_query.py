@@ -0,0 +1,150 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from backend.models import db, GitHubEvent, User
+from backend.services.digest_query import parse_range, stored_digest
+from backend.services.post_generator import generate_digest_post
+
+DAY = datetime(2025, 4, 23, 12, 0)
+
+
+@pytest.fixture
+def digest_user(app):
+    user = User(SECRET_GITHUB_id="digestuser", SECRET_GITHUB_TOKEN="gh_token")
+    db.session.add(user)
+    db.session.commit()
+
+    rows = [
+        ("repo-b", "Fix crash", DAY),
+        ("repo-a", "Add tests", DAY + timedelta(minutes=5)),
+        ("repo-a", "Refactor parser", DAY + timedelta(minutes=1)),
+        ("repo-a", "Ship it", DAY + timedelta(days=1)),
+        # Outside the range used below.
+        ("repo-a", "Too old", DAY - timedelta(days=10)),
+    ]
+    for repo_name, message, timestamp in rows:
+        db.session.add(
+            GitHubEvent(
+                user_id=user.id,
+                repo_name=repo_name,
+                commit_message=message,
+                timestamp=timestamp,
+            )
+        )
+    db.session.commit()
+    return user
+
+
+def _range():
+    return DAY - timedelta(days=1), DAY + timedelta(days=2)
+
+
+def _as_events(user_id):
+    since, until = _range()
+    return [
+        {
+            "repository": {"name": e.repo_name},
+            "message": e.commit_message,
+            "timestamp": e.timestamp.isoformat(),
+        }
+        for e in GitHubEvent.query.filter(
+            GitHubEvent.user_id == user_id,
+            GitHubEvent.timestamp >= since,
+            GitHubEvent.timestamp < until,
+        ).order_by(GitHubEvent.timestamp, GitHubEvent.id)
+    ]
+
+
+def test_sql_digest_groups_by_repository_and_day(digest_user):
+    text, builder = stored_digest(digest_user.id, *_range())
+
+    assert builder.total == 4
+    assert text == (
+        "Here's a summary of recent GitHub activity:\n"
+        "- repo-a on 2025-04-23\n"
+        "  Summary: Refactor parser; Add tests\n"
+        "  Tags: #refactor #testing\n"
+        "- repo-b on 2025-04-23\n"
+        "  Summary: Fix crash\n"
+        "  Tags: #bugfix\n"
+        "- repo-a on 2025-04-24\n"
+        "  Summary: Ship it"
+    )
+
+
+def test_sql_digest_matches_python_digest_per_repository(digest_user):
+    text, _ = stored_digest(digest_user.id, *_range(), group_by_date=False)
+
+    expected = generate_digest_post(_as_events(digest_user.id))
+    assert sorted(text.splitlines()) == sorted(expected.splitlines())
+
+
+def test_sql_digest_applies_budgets(digest_user):
+    text, builder = stored_digest(
+        digest_user.id,
+        *_range(),
+        max_groups=1,
+        max_messages_per_group=1,
+    )
+
+    assert "Summary: Refactor parser; ...and 1 more" in text
+    # Tags still cover the message past the budget.
+    assert "Tags: #refactor #testing" in text
+    assert "repo-b" not in text
+    assert text.endswith("...and 2 more commits not shown")
+    assert builder.total == 4
+
+
+def test_sql_digest_keeps_separators_in_messages(digest_user):
+    message = "Odd\x1ebytes\x1f and \\m back\\slash"
+    db.session.add(
+        GitHubEvent(
+            user_id=digest_user.id,
+            repo_name="repo-c",
+            commit_message=message,
+            timestamp=DAY,
+        )
+    )
+    db.session.commit()
+
+    _, builder = stored_digest(digest_user.id, *_range())
+
+    assert builder.groups[("repo-c", "2025-04-23")].messages == [message]
+
+
+def test_sql_digest_with_no_events(digest_user):
+    text, builder = stored_digest(
+        digest_user.id, DAY + timedelta(days=5), DAY + timedelta(days=6)
+    )
+
+    assert text == "No events to summarize."
+    assert builder.total == 0
+
+
+def test_parse_range():
+    since, until = parse_range("2025-04-23T00:00:00+02:00", "2025-04-24")
+    assert since == datetime(2025, 4, 22, 22, 0)
+    assert until == datetime(2025, 4, 24)
+
+    with pytest.raises(ValueError):
+        parse_range("2025-04-24", "2025-04-23")
+    with pytest.raises(ValueError):
+        parse_range("yesterday")
+
+
+def test_digest_endpoint(client, digest_user):
+    client.set_cookie("SECRET_GITHUB_user_id", "digestuser")
+
+    response = client.get(
+        "/api/github/digestuser/digest?since=2025-04-22&until=2025-04-25&group_by=repo"
+    )
+
+    assert response.status_code == 200
+    data = response.get_json()
+    assert data["events"] == 4
+    assert data["groups"] == 2
+    assert "- repo-a\n  Summary: Refactor parser; Add tests; Ship it" in data["digest"]
+
+    assert client.get("/api/github/digestuser/digest?group_by=week").status_code == 400
+    assert client.get("/api/github/digestuser/digest?since=soon").status_code == 400
@@ -0,0 +1,187 @@
+import json
+from datetime import datetime, timedelta
+from unittest.mock import patch, MagicMock
+
+import pytest
+
+from backend.models import db, GitHubEvent, Job, User
+from backend.services.digest_scheduler import (
+    enqueue_due_digests,
+    publish_due_digests,
+    set_cadence,
+)
+from backend.services.job_queue import claim_next, run_job
+from backend.services.post_to_linkedin import PostDeferred
+
+NOW = datetime(2025, 4, 25, 9, 0)
+
+
+def _user(name, cadence="daily", due=NOW - timedelta(minutes=1)):
+    user = User(
+        SECRET_GITHUB_id=name,
+        SECRET_GITHUB_TOKEN="gh_token",
+        linkedin_token="li_token",
+        linkedin_id=f"id-{name}",
+        digest_cadence=cadence,
+        next_digest_at=due,
+    )
+    db.session.add(user)
+    db.session.commit()
+    return user
+
+
+def _schedule(user, repo_name, message, timestamp=NOW - timedelta(hours=2)):
+    db.session.add(
+        GitHubEvent(
+            user_id=user.id,
+            repo_name=repo_name,
+            commit_message=message,
+            status="scheduled",
+            timestamp=timestamp,
+        )
+    )
+    db.session.commit()
+
+
+def _posted(post_id="urn:li:share:1"):
+    return MagicMock(status_code=201, json=lambda: {"id": post_id})
+
+
+@patch("backend.services.digest_scheduler.send_post_to_linkedin")
+def test_due_users_get_one_digest_grouped_by_day(mock_send, app):
+    user = _user("daily-user")
+    _schedule(user, "repo-a", "Fix login", NOW - timedelta(days=1))
+    _schedule(user, "repo-a", "Add tests")
+    _schedule(user, "repo-b", "Refactor models")
+    # Not due yet: nothing is published for this user.
+    _schedule(_user("later-user", due=NOW + timedelta(hours=1)), "repo-c", "Later")
+    mock_send.return_value = _posted()
+
+    assert publish_due_digests(now=NOW) == 1
+
+    mock_send.assert_called_once()
+    post_text = mock_send.call_args.kwargs["post_text"]
+    assert "- repo-a on 2025-04-24\n  Summary: Fix login" in post_text
+    assert "- repo-a on 2025-04-25\n  Summary: Add tests" in post_text
+    assert "- repo-b on 2025-04-25\n  Summary: Refactor models" in post_text
+    assert GitHubEvent.query.filter_by(status="posted").count() == 3
+    assert GitHubEvent.query.filter_by(status="scheduled").count() == 1
+    assert db.session.get(User, user.id).next_digest_at == NOW + timedelta(days=1)
+
+
+@patch("backend.services.digest_scheduler.send_post_to_linkedin")
+def test_users_are_processed_in_batches(mock_send, app):
+    users = [_user(f"user{i}", cadence="weekly") for i in range(7)]
+    for user in users:
+        _schedule(user, "repo", "Ship it")
+    mock_send.return_value = _posted()
+
+    assert publish_due_digests(now=NOW, batch_size=3) == 7
+    assert mock_send.call_count == 7
+    assert User.query.filter(User.next_digest_at <= NOW).count() == 0
+    # A second tick finds nothing due.
+    assert publish_due_digests(now=NOW, batch_size=3) == 0
+
+
+@patch("backend.services.digest_scheduler.send_post_to_linkedin")
+def test_failures_keep_events_and_reschedule(mock_send, app):
+    deferred, failing = _user("deferred"), _user("failing")
+    _schedule(deferred, "repo", "One")
+    _schedule(failing, "repo", "Two")
+    mock_send.side_effect = [
+        PostDeferred("Rate limited", retry_after=120),
+        ValueError("boom"),
+    ]
+
+    assert publish_due_digests(now=NOW) == 0
+
+    assert GitHubEvent.query.filter_by(status="scheduled").count() == 2
+    assert db.session.get(User, deferred.id).next_digest_at == NOW + timedelta(
+        seconds=120
+    )
+    assert db.session.get(User, failing.id).next_digest_at > NOW
+
+
+@patch("backend.services.digest_scheduler.send_post_to_linkedin")
+def test_worker_tick_queues_one_job_per_due_user(mock_send, app):
+    ann, ben = _user("ann"), _user("ben")
+    _schedule(ann, "repo", "One")
+    _schedule(ben, "repo", "Two")
+    mock_send.side_effect = [_posted(), ValueError("boom")]
+
+    assert enqueue_due_digests(now=NOW) == 2
+
+    # Claimed without posting anything yet.
+    mock_send.assert_not_called()
+    assert db.session.get(User, ann.id).next_digest_at == NOW + timedelta(days=1)
+    assert enqueue_due_digests(now=NOW) == 0
+    jobs = Job.query.filter_by(kind="publish_digest").order_by(Job.id).all()
+    assert [job.payload["user_id"] for job in jobs] == [ann.id, ben.id]
+
+    run_job(claim_next("test-worker"))
+    run_job(claim_next("test-worker"))
+
+    assert [job.status for job in jobs] == ["done", "failed"]
+    assert GitHubEvent.query.filter_by(status="posted").count() == 1
+    # The failed digest is back on the schedule with its events.
+    assert db.session.get(User, ben.id).next_digest_at == NOW + timedelta(
+        seconds=app.config["RETRY_MAX_DELAY"]
+    )
+    assert GitHubEvent.query.filter_by(status="scheduled").count() == 1
+
+
+@patch("backend.services.digest_scheduler.send_post_to_linkedin")
+def test_users_without_events_are_skipped(mock_send, app):
+    user = _user("quiet-user")
+
+    assert publish_due_digests(now=NOW) == 0
+
+    mock_send.assert_not_called()
+    assert db.session.get(User, user.id).next_digest_at == NOW + timedelta(days=1)
+
+
+def test_set_cadence(app):
+    user = _user("cadence-user", cadence=None, due=None)
+
+    with pytest.raises(ValueError):
+        set_cadence(user, "hourly")
+    set_cadence(user, "weekly")
+    assert user.next_digest_at is not None
+    due = user.next_digest_at
+    set_cadence(user, None)
+    # The events scheduled so far still go out once.
+    assert user.digest_cadence is None
+    assert user.next_digest_at == due
+
+
+@patch("backend.routes.verifyGITHUB_signature", return_value=True)
+def test_webhook_schedules_events_for_digest_users(
+    mock_verify, app, client, patch_post_to_linkedin
+):
+    _user("digestfan", cadence="daily")
+    client.set_cookie("SECRET_GITHUB_user_id", "digestfan")
+    response = client.put(
+        "/api/github/digestfan/digest/schedule", json={"cadence": "weekly"}
+    )
+    assert response.status_code == 200
+    assert response.get_json()["cadence"] == "weekly"
+
+    response = client.post(
+        "/webhook/github",
+        data=json.dumps(
+            {
+                "repository": {"name": "repo", "owner": {"id": "digestfan"}},
+                "head_commit": {"id": "c" * 40, "message": "Fix login"},
+            }
+        ),
+        headers={
+            "X-Hub-Signature-256": "sha256=ignored",
+            "X-GitHub-Event": "push",
+            "Content-Type": "application/json",
+        },
+    )
+
+    assert response.status_code == 202
+    assert response.get_json()["status"] == "scheduled"
+    patch_post_to_linkedin.assert_not_called()
+    assert GitHubEvent.query.one().status == "scheduled"
@@ -0,0 +1,146 @@
+import io
+import csv
+import json
+from datetime import timedelta
+
+import pytest
+
+from backend.models import db, GitHubEvent, User, utcnow
+from backend.services.event_history import decode_cursor, page_events
+
+
+@pytest.fixture
+def history_user(app):
+    user = User(SECRET_GITHUB_id="historyuser", SECRET_GITHUB_TOKEN="gh_token")
+    db.session.add(user)
+    db.session.commit()
+
+    start = utcnow() - timedelta(days=1)
+    for i in range(7):
+        db.session.add(
+            GitHubEvent(
+                user_id=user.id,
+                repo_name="repo-a" if i % 2 else "repo-b",
+                commit_message=f"Commit {i}",
+                # Two events share a timestamp to exercise the id tie-breaker.
+                timestamp=start + timedelta(minutes=min(i, 5)),
+                linkedin_post_id=f"urn:li:share:{i}" if i < 3 else None,
+                status="posted" if i < 3 else "dead" if i == 3 else "pending",
+            )
+        )
+    # No timestamp: never listed, so it cannot break the cursor.
+    db.session.add(
+        GitHubEvent(user_id=user.id, repo_name="repo-a", commit_message="Undated")
+    )
+    db.session.flush()
+    GitHubEvent.query.filter_by(commit_message="Undated").update({"timestamp": None})
+    db.session.commit()
+    return user
+
+
+def _walk(user_id, **filters):
+    messages, cursor = [], None
+    while True:
+        events, cursor = page_events(user_id, cursor=cursor, **filters)
+        messages.extend(e.commit_message for e in events)
+        if cursor is None:
+            return messages
+
+
+def test_pages_cover_history_newest_first_without_gaps(history_user):
+    messages = _walk(history_user.id, limit=2)
+
+    assert messages == [f"Commit {i}" for i in (6, 5, 4, 3, 2, 1, 0)]
+
+
+def test_filters_apply_across_pages(history_user):
+    assert _walk(history_user.id, limit=1, repo="repo-a") == [
+        "Commit 5",
+        "Commit 3",
+        "Commit 1",
+    ]
+    assert _walk(history_user.id, limit=2, status="posted") == [
+        "Commit 2",
+        "Commit 1",
+        "Commit 0",
+    ]
+    assert _walk(history_user.id, limit=2, status="dead") == ["Commit 3"]
+    assert _walk(history_user.id, limit=2, status="unposted") == [
+        "Commit 6",
+        "Commit 5",
+        "Commit 4",
+        "Commit 3",
+    ]
+
+
+def test_invalid_cursor_and_status_are_rejected(history_user):
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor")
+    with pytest.raises(ValueError):
+        page_events(history_user.id, status="sideways")
+
+
+def test_commits_endpoint_returns_next_cursor(client, history_user):
+    client.set_cookie("SECRET_GITHUB_user_id", "historyuser")
+
+    first = client.get("/api/github/historyuser/commits?limit=4").get_json()
+    second = client.get(
+        f"/api/github/historyuser/commits?limit=4&cursor={first['next_cursor']}"
+    ).get_json()
+
+    assert [c["message"] for c in first["commits"]] == [
+        "Commit 6",
+        "Commit 5",
+        "Commit 4",
+        "Commit 3",
+    ]
+    assert [c["message"] for c in second["commits"]] == [
+        "Commit 2",
+        "Commit 1",
+        "Commit 0",
+    ]
+    assert second["next_cursor"] is None
+    assert client.get("/api/github/historyuser/commits?cursor=@@").status_code == 400
+
+
+def test_export_streams_ndjson_and_resumes_from_cursor(client, history_user):
+    client.set_cookie("SECRET_GITHUB_user_id", "historyuser")
+
+    response = client.get("/api/github/historyuser/commits/export")
+    assert response.mimetype == "application/x-ndjson"
+    assert response.is_streamed
+    rows = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert [r["message"] for r in rows] == [f"Commit {i}" for i in range(6, -1, -1)]
+
+    resumed = client.get(
+        f"/api/github/historyuser/commits/export?cursor={rows[2]['cursor']}"
+    )
+    lines = resumed.get_data(as_text=True).splitlines()
+    assert [json.loads(line)["message"] for line in lines] == [
+        "Commit 3",
+        "Commit 2",
+        "Commit 1",
+        "Commit 0",
+    ]
+
+
+def test_export_csv_applies_filters(client, history_user):
+    client.set_cookie("SECRET_GITHUB_user_id", "historyuser")
+
+    response = client.get(
+        "/api/github/historyuser/commits/export?format=csv&repo=repo-b"
+    )
+
+    assert response.mimetype == "text/csv"
+    rows = list(csv.DictReader(io.StringIO(response.get_data(as_text=True))))
+    assert [r["message"] for r in rows] == [
+        "Commit 6",
+        "Commit 4",
+        "Commit 2",
+        "Commit 0",
+    ]
+    assert [r["status"] for r in rows] == ["pending", "pending", "posted", "posted"]
+    assert (
+        client.get("/api/github/historyuser/commits/export?format=xml").status_code
+        == 400
+    )
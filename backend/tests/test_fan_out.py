@@ -0,0 +1,123 @@
+import json
+import time
+from unittest.mock import MagicMock, patch
+
+from backend.models import db, GitHubEvent, User
+from backend.services import fan_out, repo_routing
+
+REPOSITORY_ID = 515151
+
+
+def _subscribe(*names):
+    for name in names:
+        user = User(
+            SECRET_GITHUB_id=name,
+            SECRET_GITHUB_TOKEN="gh",
+            linkedin_id=f"li-{name}",
+            linkedin_token="li",
+        )
+        db.session.add(user)
+        db.session.commit()
+        repo_routing.subscribe(user, REPOSITORY_ID)
+
+
+def _push(client):
+    return client.post(
+        "/webhook/github",
+        data=json.dumps(
+            {
+                "ref": "refs/heads/main",
+                "repository": {
+                    "id": REPOSITORY_ID,
+                    "name": "platform",
+                    "owner": {"id": "acme-org"},
+                },
+                "head_commit": {"id": "f" * 40, "message": "Fan out"},
+            }
+        ),
+        headers={
+            "X-Hub-Signature-256": "sha256=ignored",
+            "X-GitHub-Event": "push",
+            "Content-Type": "application/json",
+        },
+    )
+
+
+def _linkedin(delays, failing=()):
+    """A post_to_linkedin stand-in that answers after a per-member delay."""
+
+    def post(user, repo, message, payload, post_text=None):
+        time.sleep(delays.get(user.SECRET_GITHUB_id, 0))
+        if user.SECRET_GITHUB_id in failing:
+            raise ValueError("Failed to post to LinkedIn: 500")
+        return MagicMock(json=lambda: {"id": f"urn:li:share:{user.SECRET_GITHUB_id}"})
+
+    return post
+
+
+def _statuses():
+    db.session.expire_all()
+    return {
+        event.user.SECRET_GITHUB_id: (event.status, event.linkedin_post_id)
+        for event in GitHubEvent.query.all()
+    }
+
+
+@patch("backend.routes.verifyGITHUB_signature", return_value=True)
+def test_posts_to_all_subscribers_concurrently(
+    mock_verify, app, client, patch_post_to_linkedin
+):
+    _subscribe("ann", "ben", "cat")
+    patch_post_to_linkedin.side_effect = _linkedin(
+        {"ann": 0.3, "ben": 0.3, "cat": 0.3}, failing={"cat"}
+    )
+
+    started = time.perf_counter()
+    response = _push(client)
+    elapsed = time.perf_counter() - started
+
+    assert response.status_code == 200
+    assert elapsed < 0.8
+    results = {d["user"]: d for d in response.get_json()["deliveries"]}
+    assert results["ann"]["linkedin_post_id"] == "urn:li:share:ann"
+    assert results["ben"]["status"] == "success"
+    assert results["cat"]["status"] == "retrying"
+    statuses = _statuses()
+    assert statuses["ann"] == ("posted", "urn:li:share:ann")
+    assert statuses["ben"] == ("posted", "urn:li:share:ben")
+    assert statuses["cat"][0] == "retrying"
+
+
+@patch("backend.routes.verifyGITHUB_signature", return_value=True)
+def test_slow_member_is_reported_pending_and_finishes_later(
+    mock_verify, app, client, patch_post_to_linkedin
+):
+    app.config["FANOUT_DEADLINE_SECONDS"] = 0.2
+    _subscribe("ann", "slow")
+    patch_post_to_linkedin.side_effect = _linkedin({"slow": 0.6})
+
+    started = time.perf_counter()
+    response = _push(client)
+
+    assert time.perf_counter() - started < 0.5
+    results = {d["user"]: d for d in response.get_json()["deliveries"]}
+    assert results["ann"]["status"] == "success"
+    assert results["slow"]["status"] == "pending"
+    assert results["slow"]["code"] == 202
+
+    fan_out.shutdown()
+    assert _statuses()["slow"] == ("posted", "urn:li:share:slow")
+
+
+def test_run_isolates_failures(app):
+    def boom():
+        raise RuntimeError("boom")
+
+    outcomes = fan_out.run([("ok", lambda: 1, ()), ("bad", boom, ())], deadline=1)
+
+    assert [(o.key, o.state) for o in outcomes] == [
+        ("ok", fan_out.DONE),
+        ("bad", fan_out.FAILED),
+    ]
+    assert outcomes[0].value == 1
+    assert isinstance(outcomes[1].value, RuntimeError)
@@ -0,0 +1,52 @@
+from unittest.mock import patch
+
+import pytest
+import requests_mock
+
+from backend.services import http_client
+
+
+@pytest.fixture(autouse=True)
+def fresh_session():
+    http_client.reset_session()
+    yield
+    http_client.reset_session()
+
+
+def test_session_is_reused_within_a_process():
+    assert http_client.get_session() is http_client.get_session()
+
+
+def test_session_is_rebuilt_after_fork(monkeypatch):
+    """A forked worker must not reuse its parent's pooled connections."""
+    parent_session = http_client.get_session()
+    monkeypatch.setattr(http_client.os, "getpid", lambda: -1)
+
+    assert http_client.get_session() is not parent_session
+
+
+def test_default_timeouts_are_applied_per_call():
+    with patch.object(http_client.get_session(), "request") as mock_request:
+        http_client.post("https://api.linkedin.com/v2/ugcPosts", json={})
+        http_client.get("https://api.github.com/user", timeout=1)
+
+    first, second = mock_request.call_args_list
+    assert first.kwargs["timeout"] == (
+        http_client.CONNECT_TIMEOUT,
+        http_client.READ_TIMEOUT,
+    )
+    assert second.kwargs["timeout"] == 1
+
+
+def test_cookies_are_not_shared_between_calls():
+    with requests_mock.Mocker() as m:
+        m.get(
+            "https://api.github.com/user",
+            json={},
+            headers={"Set-Cookie": "session=secret; Domain=api.github.com"},
+        )
+        http_client.get("https://api.github.com/user")
+        http_client.get("https://api.github.com/user")
+
+        assert "Cookie" not in m.request_history[1].headers
+    assert len(http_client.get_session().cookies) == 0
@@ -0,0 +1,116 @@
+import json
+from datetime import timedelta
+from unittest.mock import patch, MagicMock
+
+from backend.models import db, GitHubEvent, Job, User, utcnow
+from backend.services.job_queue import claim_next, enqueue, run_job, run_worker
+
+
+def _push_payload(message="Queue me"):
+    return {
+        "repository": {"name": "queued-repo", "owner": {"id": "queueuser"}},
+        "pusher": {"name": "queueuser"},
+        "head_commit": {
+            "id": "9f1c2d3e4b5a",
+            "message": message,
+            "url": "https://github.com/queueuser/queued-repo/commit/9f1c2d3e4b5a",
+            "author": {"name": "Queue User"},
+        },
+    }
+
+
+def _add_user():
+    user = User(
+        SECRET_GITHUB_id="queueuser",
+        SECRET_GITHUB_TOKEN="gh_token",
+        linkedin_token="li_token",
+        linkedin_id="123456789",
+    )
+    db.session.add(user)
+    db.session.commit()
+    return user
+
+
+@patch("backend.routes.verifyGITHUB_signature", return_value=True)
+def test_webhook_enqueues_job_when_async(
+    mock_verify, app, client, patch_post_to_linkedin
+):
+    """The webhook persists the event and returns 202 without calling LinkedIn."""
+    app.config["WEBHOOK_ASYNC"] = True
+    _add_user()
+
+    response = client.post(
+        "/webhook/github",
+        data=json.dumps(_push_payload()),
+        headers={
+            "X-Hub-Signature-256": "sha256=ignored",
+            "X-GitHub-Event": "push",
+            "Content-Type": "application/json",
+        },
+    )
+
+    assert response.status_code == 202, response.data
+    assert response.get_json()["status"] == "queued"
+    patch_post_to_linkedin.assert_not_called()
+
+    event = db.session.get(GitHubEvent, response.get_json()["event_id"])
+    assert event.status == "pending"
+
+    job = Job.query.filter_by(event_id=event.id).one()
+    assert job.kind == "post_event"
+    assert job.status == "queued"
+    assert job.payload["head_commit"]["message"] == "Queue me"
+    assert "pusher" not in job.payload
+
+
+def test_claim_next_skips_jobs_that_are_not_due(app):
+    """Jobs scheduled in the future stay queued."""
+    enqueue("post_event", run_at=utcnow() + timedelta(minutes=5))
+    due = enqueue("post_event")
+    db.session.commit()
+
+    job = claim_next("test-worker")
+
+    assert job.id == due.id
+    assert job.status == "running"
+    assert job.attempts == 1
+    assert job.locked_by == "test-worker"
+    assert claim_next("test-worker") is None
+
+
+def test_run_job_records_failure(app):
+    """A handler exception marks the job failed instead of crashing the worker."""
+    job = enqueue("no_such_kind")
+    db.session.commit()
+
+    run_job(claim_next("test-worker"))
+
+    job = db.session.get(Job, job.id)
+    assert job.status == "failed"
+    assert "No handler registered" in job.last_error
+
+
+@patch("backend.services.job_queue.send_post_to_linkedin")
+def test_run_worker_posts_queued_event(mock_send, app):
+    """The worker drains the queue and marks the event as posted."""
+    mock_send.return_value = MagicMock(
+        status_code=201, json=lambda: {"id": "urn:li:share:1"}
+    )
+    user = _add_user()
+    event = GitHubEvent(
+        user_id=user.id, repo_name="queued-repo", commit_message="Queue me"
+    )
+    db.session.add(event)
+    db.session.flush()
+    job = enqueue("post_event", payload=_push_payload(), event_id=event.id)
+    db.session.commit()
+    event_id, job_id = event.id, job.id
+
+    run_worker(app, concurrency=2, poll_interval=0.01, once=True)
+
+    db.session.expire_all()
+    event = db.session.get(GitHubEvent, event_id)
+    assert event.status == "posted"
+    assert event.linkedin_post_id == "urn:li:share:1"
+    assert db.session.get(Job, job_id).status == "done"
+    mock_send.assert_called_once()
@@ -0,0 +1,63 @@
+import json
+from collections import namedtuple
+from datetime import datetime
+from decimal import Decimal
+from unittest.mock import patch
+
+import pytest
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+from backend.services import json_provider
+from backend.services.json_provider import provider_class
+
+pytest.importorskip("orjson")
+
+Point = namedtuple("Point", ["x", "y"])
+
+
+@pytest.fixture
+def providers():
+    app = Flask(__name__)
+    return DefaultJSONProvider(app), json_provider.OrjsonProvider(app)
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        {"b": 1, "a": [1.5, None, True], "é": "✓"},
+        {"when": datetime(2025, 4, 24, 12, 0), "amount": Decimal("1.10")},
+        {"point": Point(1, 2), "big": 2**70},
+        {1: "int keys"},
+    ],
+)
+def test_orjson_output_matches_stdlib(providers, value):
+    stdlib, fast = providers
+
+    assert json.loads(fast.dumps(value)) == json.loads(stdlib.dumps(value))
+    # Keys stay sorted, as with Flask's default provider.
+    assert list(json.loads(fast.dumps(value))) == list(json.loads(stdlib.dumps(value)))
+
+
+def test_orjson_loads_and_keyword_fallback(providers):
+    _, fast = providers
+
+    assert fast.loads(b'{"a": [1, 2]}') == {"a": [1, 2]}
+    assert fast.dumps({"a": 1}, indent=2) == '{\n  "a": 1\n}'
+
+
+def test_app_uses_configured_codec(app, client):
+    assert isinstance(app.json, json_provider.OrjsonProvider)
+    response = client.get("/health")
+    assert response.get_json()["status"] in ("ok", "degraded")
+
+
+def test_provider_class_selection():
+    assert provider_class("stdlib") is DefaultJSONProvider
+    assert provider_class("auto") is json_provider.OrjsonProvider
+    with pytest.raises(ValueError):
+        provider_class("simplejson")
+    with patch.object(json_provider, "orjson", None):
+        assert provider_class("auto") is DefaultJSONProvider
+        with pytest.raises(ValueError):
+            provider_class("orjson")
@@ -0,0 +1,132 @@
+import json
+import time
+
+import anyio
+import httpx
+import pytest
+
+from backend.models import db, User
+from backend.services import circuit_breaker
+from backend.services.linkedin_async import AsyncLinkedInClient
+from backend.services.post_to_linkedin import PostDeferred, linkedin_post_url
+
+PAYLOAD = {
+    "repository": {"name": "repo"},
+    "head_commit": {"message": "Go async", "url": "https://github.com/o/r/commit/1"},
+}
+
+
+def _user(linkedin_id="12345", token="li-token", SECRET_GITHUB_id="async-user"):
+    user = User(
+        SECRET_GITHUB_id=SECRET_GITHUB_id,
+        SECRET_GITHUB_TOKEN="gh",
+        linkedin_id=linkedin_id,
+        linkedin_token=token,
+    )
+    db.session.add(user)
+    db.session.commit()
+    return user
+
+
+def _send(handler, user, post_text="Shipped"):
+    async def main():
+        async with AsyncLinkedInClient(
+            transport=httpx.MockTransport(handler)
+        ) as client:
+            return await client.send_post_to_linkedin(
+                user, "repo", "Go async", PAYLOAD, post_text=post_text
+            )
+
+    return anyio.run(main)
+
+
+def test_posts_with_normalized_author_urn(app):
+    seen = []
+
+    def handler(request):
+        seen.append(request)
+        return httpx.Response(201, json={"id": "urn:li:share:1"})
+
+    response = _send(handler, _user("12345"))
+
+    assert response.status_code == 201
+    assert response.json() == {"id": "urn:li:share:1"}
+    body = json.loads(seen[0].content)
+    assert body["author"] == "urn:li:member:12345"
+    assert body["specificContent"]["com.linkedin.ugc.ShareContent"][
+        "shareCommentary"
+    ] == {"text": "Shipped"}
+    assert seen[0].headers["Authorization"] == "Bearer li-token"
+    assert str(seen[0].url) == linkedin_post_url()
+
+
+def test_throttling_defers_the_member(app):
+    user = _user("urn:li:person:abc")
+
+    with pytest.raises(PostDeferred) as deferred:
+        _send(lambda request: httpx.Response(429, headers={"Retry-After": "120"}), user)
+    assert deferred.value.retry_after == 120
+
+    # The rate limiter now holds the member back without calling LinkedIn.
+    with pytest.raises(PostDeferred):
+        _send(lambda request: httpx.Response(201, json={}), user)
+
+
+@pytest.mark.parametrize("status", [401, 500, 503])
+def test_auth_and_server_errors_raise(app, status):
+    with pytest.raises(ValueError, match=str(status)):
+        _send(lambda request: httpx.Response(status, text="nope"), _user())
+
+
+def test_transport_errors_count_against_the_breaker(app):
+    app.config["BREAKER_FAILURE_THRESHOLD"] = 1
+
+    def handler(request):
+        raise httpx.ConnectError("refused")
+
+    with pytest.raises(httpx.ConnectError):
+        _send(handler, _user())
+
+    assert circuit_breaker.allow(linkedin_post_url()) > 0
+
+
+def test_missing_credentials_short_circuits(app):
+    def handler(request):
+        raise AssertionError("LinkedIn must not be called")
+
+    async def main():
+        async with AsyncLinkedInClient(
+            transport=httpx.MockTransport(handler)
+        ) as client:
+            return await client.post_to_linkedin(
+                _user(token=None), "repo", "msg", PAYLOAD
+            )
+
+    assert anyio.run(main).status_code == 400
+
+
+def test_post_many_keeps_posts_in_flight_concurrently(app):
+    app.config["RATE_LIMIT_APP_CAPACITY"] = 1000
+    users = [_user(f"member-{i}", SECRET_GITHUB_id=f"gh-{i}") for i in range(40)]
+
+    async def handler(request):
+        await anyio.sleep(0.2)
+        if json.loads(request.content)["author"] == "urn:li:member:member-3":
+            return httpx.Response(500)
+        return httpx.Response(201, json={"id": "urn:li:share:x"})
+
+    async def main():
+        async with AsyncLinkedInClient(
+            transport=httpx.MockTransport(handler)
+        ) as client:
+            return await client.post_many(
+                [(user, "repo", "msg", PAYLOAD, "text") for user in users],
+                concurrency=40,
+            )
+
+    started = time.perf_counter()
+    results = anyio.run(main)
+
+    assert time.perf_counter() - started < 2
+    assert isinstance(results[3], ValueError)
+    assert [r.status_code for i, r in enumerate(results) if i != 3] == [201] * 39
@@ -5,7 +5,7 @@ from backend.models import User, db
 from unittest.mock import patch
 
 
-@patch("requests.post")
+@patch("backend.services.http_client.post")
 def test_linkedin_callback_handles_id_token(mock_post, app, client):
     mock_post.return_value.status_code = 200
     mock_post.return_value.json.return_value = {
@@ -15,7 +15,7 @@ def get_linkedin_client_secret():
     )  # Added fallback
 
 
-@patch("requests.post")
+@patch("backend.services.http_client.post")
 def test_linkedin_callback_makes_token_request(
     mock_post, app, client, monkeypatch
 ):
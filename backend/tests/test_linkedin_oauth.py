@@ -39,8 +39,8 @@ def test_linkedin_auth_redirect(client):
     assert "scope=" in response.location
 
 
-@patch("backend.services.linkedin_oauth.requests.post")
-@patch("backend.services.linkedin_oauth.requests.get")
+@patch("backend.services.http_client.post")
+@patch("backend.services.http_client.get")
 def test_linkedin_callback_stores_token_and_urn(
     mock_get, mock_post, client, db_session, SECRET_GITHUB_user
 ):
@@ -102,7 +102,7 @@ def test_linkedin_status_endpoint(client, SECRET_GITHUB_user, db_session):
     assert data["linkedin_linked"] is True
 
 
-@patch("backend.services.linkedin_oauth.requests.post")
+@patch("backend.services.http_client.post")
 def test_linkedin_callback_token_exchange_fails(mock_post, client):
     mock_post.return_value.status_code = 400
     mock_post.return_value.json.return_value = {"error": "invalid_request"}
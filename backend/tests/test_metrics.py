@@ -0,0 +1,116 @@
+import json
+from unittest.mock import patch
+
+from prometheus_client import REGISTRY
+
+from backend.models import db, User
+from backend.services import metrics
+
+
+def _sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+def _push(client):
+    return client.post(
+        "/webhook/github",
+        data=json.dumps(
+            {
+                "repository": {"name": "repo", "owner": {"id": "metricsuser"}},
+                "head_commit": {"id": "e" * 40, "message": "Add metrics"},
+            }
+        ),
+        headers={
+            "X-Hub-Signature-256": "sha256=ignored",
+            "X-GitHub-Event": "push",
+            "Content-Type": "application/json",
+        },
+    )
+
+
+@patch("backend.routes.verifyGITHUB_signature", return_value=True)
+def test_webhook_records_stages_outcome_and_latency(mock_verify, app, client):
+    db.session.add(User(SECRET_GITHUB_id="metricsuser", SECRET_GITHUB_TOKEN="gh"))
+    db.session.commit()
+    app.config["WEBHOOK_ASYNC"] = True
+    queued = _sample("webhook_outcomes_total", outcome="queued")
+    parses = _sample("webhook_stage_duration_seconds_count", stage="parse_json")
+    requests = _sample(
+        "http_request_duration_seconds_count",
+        method="POST",
+        endpoint="/webhook/github",
+        status="202",
+    )
+
+    assert _push(client).status_code == 202
+
+    assert _sample("webhook_outcomes_total", outcome="queued") == queued + 1
+    assert (
+        _sample("webhook_stage_duration_seconds_count", stage="parse_json")
+        == parses + 1
+    )
+    assert (
+        _sample(
+            "http_request_duration_seconds_count",
+            method="POST",
+            endpoint="/webhook/github",
+            status="202",
+        )
+        == requests + 1
+    )
+
+
+def _outbound(outcome):
+    return _sample(
+        "outbound_request_duration_seconds_count", service="test", outcome=outcome
+    )
+
+
+def test_outbound_records_status_class_or_error():
+    ok, errors = _outbound("2xx"), _outbound("error")
+
+    with metrics.outbound("test") as call:
+        call.status = 201
+    try:
+        with metrics.outbound("test"):
+            raise ConnectionError("down")
+    except ConnectionError:
+        pass
+
+    assert _outbound("2xx") == ok + 1
+    assert _outbound("error") == errors + 1
+
+
+def test_metrics_endpoint_exposes_prometheus_text(client):
+    client.get("/health")
+
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.mimetype == "text/plain"
+    body = response.get_data(as_text=True)
+    assert "http_request_duration_seconds_bucket" in body
+    assert 'endpoint="/health"' in body
+
+
+def test_metrics_endpoint_requires_the_token_when_set(app, client):
+    app.config["METRICS_TOKEN"] = "scrape-me"
+
+    assert client.get("/metrics").status_code == 401
+    assert (
+        client.get("/metrics", headers={"Authorization": "Bearer wrong"}).status_code
+        == 401
+    )
+    response = client.get("/metrics", headers={"Authorization": "Bearer scrape-me"})
+    assert response.status_code == 200
+
+
+def test_multiprocess_registry_reads_shared_directory(client, tmp_path, monkeypatch):
+    monkeypatch.setenv("PROMETHEUS_MULTIPROC_DIR", str(tmp_path))
+
+    with patch.object(metrics.multiprocess, "MultiProcessCollector") as collector:
+        response = client.get("/metrics")
+
+    assert response.status_code == 200
+    collector.assert_called_once()
+    assert collector.call_args.args[0] is not REGISTRY
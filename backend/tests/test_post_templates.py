@@ -0,0 +1,143 @@
+from unittest.mock import patch, MagicMock
+
+import pytest
+
+from backend.models import db, GitHubEvent, Job, PostTemplate, User
+from backend.services import post_templates
+from backend.services.job_queue import claim_next, run_job
+from backend.services.post_generator import (
+    generate_post_from_webhook,
+    generate_preview_post,
+)
+from backend.services.post_templates import NormalizedEvent, TemplateError
+
+PAYLOAD = {
+    "repository": {
+        "name": "tmpl-repo",
+        "html_url": "https://github.com/tmpl/tmpl-repo",
+    },
+    "head_commit": {
+        "id": "abcdef1234567",
+        "message": "Add templates",
+        "author": {"name": "Tmpl User"},
+    },
+}
+
+
+@pytest.fixture
+def tmpl_user(app):
+    user = User(
+        SECRET_GITHUB_id="tmpluser",
+        SECRET_GITHUB_TOKEN="gh_token",
+        linkedin_token="li_token",
+        linkedin_id="123",
+    )
+    db.session.add(user)
+    db.session.commit()
+    return user
+
+
+def test_default_commit_template_matches_original_layout():
+    assert generate_post_from_webhook(PAYLOAD) == (
+        "Tmpl User just pushed to tmpl-repo!\n\n"
+        'Commit message: "Add templates"\n\n'
+        "Check it out: https://github.com/tmpl/tmpl-repo\n\n"
+    )
+
+
+def test_preview_of_many_commits_is_truncated():
+    commits = [{"message": f"m{i}", "url": f"u{i}"} for i in range(7)]
+
+    preview = generate_preview_post({"commits": commits, "repository": {"name": "R"}})
+
+    assert preview.startswith("Digest of updates in R:\n- m0 by Unknown Author (u0)\n")
+    assert preview.endswith(
+        "- m4 by Unknown Author (u4)\n...and 2 more commits!\n\nRepository: #\n\n"
+    )
+
+
+def test_preview_tags_only_rendered_commits():
+    commits = [{"message": f"m{i}", "url": f"u{i}"} for i in range(7)]
+
+    with patch(
+        "backend.services.post_templates.tag_message", return_value=[]
+    ) as tag_message:
+        generate_preview_post({"commits": commits, "repository": {"name": "R"}})
+
+    assert tag_message.call_count == 5
+
+
+def test_user_template_renders_fields_and_literal_braces(tmpl_user):
+    template = PostTemplate(
+        user_id=tmpl_user.id, kind="commit", body="{{{short_sha}}} {repo}: {message}"
+    )
+    db.session.add(template)
+    db.session.commit()
+
+    text = generate_post_from_webhook(PAYLOAD, template)
+
+    assert text == "{abcdef1} tmpl-repo: Add templates"
+
+
+@pytest.mark.parametrize(
+    "body", ["{message.__class__}", "{missing}", "{message", "oops }", "{0}"]
+)
+def test_unsafe_or_unknown_fields_are_rejected(body):
+    with pytest.raises(TemplateError):
+        post_templates.validate("commit", body)
+
+
+def test_compiled_templates_are_cached_by_version(tmpl_user):
+    template = PostTemplate(user_id=tmpl_user.id, kind="commit", body="v1 {repo}")
+    db.session.add(template)
+    db.session.commit()
+    event = NormalizedEvent.from_webhook(PAYLOAD)
+
+    with patch.object(
+        post_templates, "compile_template", wraps=post_templates.compile_template
+    ) as mock_compile:
+        assert post_templates.render_commit(event, template) == "v1 tmpl-repo"
+        assert post_templates.render_commit(event, template) == "v1 tmpl-repo"
+        assert mock_compile.call_count == 1
+
+        template.body, template.version = "v2 {repo}", 2
+        assert post_templates.render_commit(event, template) == "v2 tmpl-repo"
+        assert mock_compile.call_count == 2
+
+
+def test_template_routes_validate_and_bump_version(client, tmpl_user):
+    client.set_cookie("SECRET_GITHUB_user_id", "tmpluser")
+    url = "/api/github/tmpluser/templates/commit"
+
+    assert client.put(url, json={"body": "{nope}"}).status_code == 400
+    assert client.put(url, json={"body": "{repo}"}).get_json()["version"] == 1
+    assert client.put(url, json={"body": "{repo}!"}).get_json()["version"] == 2
+    assert (
+        client.put(
+            "/api/github/tmpluser/templates/digest", json={"body": "{groups}"}
+        ).status_code
+        == 400
+    )  # digest templates need an item template
+
+    listing = client.get("/api/github/tmpluser/templates").get_json()
+    assert [t["body"] for t in listing["templates"]] == ["{repo}!"]
+
+    assert client.delete(url).status_code == 200
+    assert PostTemplate.query.count() == 0
+
+
+@patch("backend.services.job_queue.send_post_to_linkedin")
+def test_worker_posts_with_the_users_template(mock_send, app, tmpl_user):
+    mock_send.return_value = MagicMock(status_code=201, json=lambda: {"id": "urn:1"})
+    db.session.add(PostTemplate(user_id=tmpl_user.id, kind="commit", body="{message}"))
+    event = GitHubEvent(
+        user_id=tmpl_user.id, repo_name="tmpl-repo", commit_message="Add templates"
+    )
+    db.session.add(event)
+    db.session.flush()
+    db.session.add(Job(kind="post_event", payload=PAYLOAD, event_id=event.id))
+    db.session.commit()
+
+    run_job(claim_next("test-worker"))
+
+    assert mock_send.call_args.kwargs["post_text"] == "Add templates"
@@ -0,0 +1,61 @@
+from unittest.mock import patch
+
+from backend.services import preview_cache
+
+PAYLOAD = {
+    "commits": [{"message": "Fix bug", "author": {"name": "Alice"}, "url": "u1"}],
+    "repository": {"name": "repo1", "url": "https://github.com/a/repo1"},
+}
+
+
+def test_key_ignores_key_order_but_not_content():
+    reordered = {"repository": PAYLOAD["repository"], "commits": PAYLOAD["commits"]}
+
+    assert preview_cache.preview_key("post", PAYLOAD) == preview_cache.preview_key(
+        "post", reordered
+    )
+    assert preview_cache.preview_key("post", PAYLOAD) != preview_cache.preview_key(
+        "digest", PAYLOAD
+    )
+    assert preview_cache.preview_key("post", PAYLOAD) != preview_cache.preview_key(
+        "post", {**PAYLOAD, "commits": []}
+    )
+
+
+def test_repeated_preview_is_rendered_once(client):
+    with patch(
+        "backend.routes.generate_preview_post", return_value="rendered"
+    ) as mock_render:
+        first = client.post("/api/preview_linkedin_post", json=PAYLOAD)
+        second = client.post("/api/preview_linkedin_post", json=PAYLOAD)
+
+    assert first.get_json() == second.get_json() == {"preview": "rendered"}
+    assert first.headers["ETag"] == second.headers["ETag"]
+    mock_render.assert_called_once()
+    assert preview_cache.stats()["hits"] == 1
+
+
+def test_if_none_match_returns_304(client):
+    etag = client.post("/api/preview_linkedin_post", json=PAYLOAD).headers["ETag"]
+
+    response = client.post(
+        "/api/preview_linkedin_post", json=PAYLOAD, headers={"If-None-Match": etag}
+    )
+
+    assert response.status_code == 304
+    assert response.headers["ETag"] == etag
+    assert response.data == b""
+
+
+def test_digest_preview_supports_etags(client):
+    payload = {"events": [{"repository": {"name": "repo1"}, "message": "Add tests"}]}
+
+    first = client.post("/api/preview_linkedin_digest", json=payload)
+    assert "repo1" in first.get_json()["preview"]
+
+    response = client.post(
+        "/api/preview_linkedin_digest",
+        json=payload,
+        headers={"If-None-Match": first.headers["ETag"]},
+    )
+    assert response.status_code == 304
@@ -0,0 +1,103 @@
+import json
+from unittest.mock import patch, MagicMock
+
+import pytest
+
+from backend.models import db, GitHubEvent, Job, RateLimitBucket, User
+from backend.services import rate_limiter
+from backend.services.post_to_linkedin import post_to_linkedin, PostDeferred
+
+
+def _add_user():
+    user = User(
+        SECRET_GITHUB_id="limituser",
+        SECRET_GITHUB_TOKEN="gh_token",
+        linkedin_token="li_token",
+        linkedin_id="123456789",
+    )
+    db.session.add(user)
+    db.session.commit()
+    return user
+
+
+def _push_payload():
+    return {
+        "repository": {"name": "limited-repo", "owner": {"id": "limituser"}},
+        "head_commit": {
+            "id": "a1b2c3d4e5f6",
+            "message": "Throttle me",
+            "url": "https://github.com/limituser/limited-repo/commit/a1b2c3d4e5f6",
+            "author": {"name": "Limit User"},
+        },
+    }
+
+
+def test_acquire_waits_once_the_member_bucket_is_empty(app):
+    app.config["RATE_LIMIT_MEMBER_CAPACITY"] = 2
+
+    assert rate_limiter.acquire("urn:li:member:1") == 0.0
+    assert rate_limiter.acquire("urn:li:member:1") == 0.0
+    wait = rate_limiter.acquire("urn:li:member:1")
+
+    assert wait > 0
+    # Other members still draw from their own buckets.
+    assert rate_limiter.acquire("urn:li:member:2") == 0.0
+
+
+def test_defer_blocks_a_bucket_until_retry_after(app):
+    rate_limiter.defer("urn:li:member:1", 120)
+
+    wait = rate_limiter.acquire("urn:li:member:1")
+
+    assert 110 < wait <= 120
+    bucket = db.session.get(RateLimitBucket, "member:urn:li:member:1")
+    assert bucket.blocked_until is not None
+
+
+def test_parse_retry_after_accepts_seconds_and_dates():
+    assert rate_limiter.parse_retry_after("30") == 30.0
+    assert rate_limiter.parse_retry_after(None, default=5) == 5
+    assert rate_limiter.parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+    assert rate_limiter.parse_retry_after("soon", default=7) == 7
+
+
+@patch("backend.services.http_client.post")
+def test_429_defers_the_member_bucket(mock_post, app):
+    mock_post.return_value = MagicMock(status_code=429, headers={"Retry-After": "90"})
+    user = _add_user()
+
+    with pytest.raises(PostDeferred) as excinfo:
+        post_to_linkedin(user, "limited-repo", "Throttle me", _push_payload())
+
+    assert excinfo.value.retry_after == 90.0
+    assert rate_limiter.acquire("urn:li:member:123456789") > 80
+    mock_post.assert_called_once()
+
+
+@patch("backend.routes.verifyGITHUB_signature", return_value=True)
+def test_webhook_defers_rate_limited_post_to_the_worker(
+    mock_verify, app, client, patch_post_to_linkedin
+):
+    """A throttled post is queued for later instead of failing the webhook."""
+    patch_post_to_linkedin.side_effect = PostDeferred("Throttled", retry_after=60)
+    _add_user()
+
+    response = client.post(
+        "/webhook/github",
+        data=json.dumps(_push_payload()),
+        headers={
+            "X-Hub-Signature-256": "sha256=ignored",
+            "X-GitHub-Event": "push",
+            "Content-Type": "application/json",
+        },
+    )
+
+    assert response.status_code == 202, response.data
+    body = response.get_json()
+    assert body["status"] == "deferred"
+
+    event = db.session.get(GitHubEvent, body["event_id"])
+    assert event.status == "pending"
+    job = Job.query.filter_by(event_id=event.id).one()
+    assert job.kind == "post_event"
+    assert job.run_at > event.timestamp
@@ -0,0 +1,211 @@
+import json
+from datetime import timedelta
+from unittest.mock import MagicMock, patch
+
+from backend.models import db, GitHubEvent, Job, RepositorySubscription, User, utcnow
+from backend.services import repo_routing
+
+REPOSITORY_ID = 424242
+
+
+def _user(SECRET_GITHUB_id):
+    user = User(
+        SECRET_GITHUB_id=SECRET_GITHUB_id,
+        SECRET_GITHUB_TOKEN="gh",
+        linkedin_id=f"li-{SECRET_GITHUB_id}",
+        linkedin_token="li",
+    )
+    db.session.add(user)
+    db.session.commit()
+    return user
+
+
+def _github(status=200, full_name="acme/platform"):
+    """Stand-in for GitHub's repository endpoint."""
+    return patch(
+        "backend.services.repo_routing.http_client.get",
+        return_value=MagicMock(
+            status_code=status, json=lambda: {"full_name": full_name}
+        ),
+    )
+
+
+def _push(client, ref="refs/heads/main", sha="a" * 40, owner="acme-org"):
+    return client.post(
+        "/webhook/github",
+        data=json.dumps(
+            {
+                "ref": ref,
+                "repository": {
+                    "id": REPOSITORY_ID,
+                    "name": "platform",
+                    "owner": {"id": owner},
+                },
+                "head_commit": {"id": sha, "message": "Ship routing"},
+            }
+        ),
+        headers={
+            "X-Hub-Signature-256": "sha256=ignored",
+            "X-GitHub-Event": "push",
+            "X-GitHub-Delivery": f"delivery-{sha[:8]}",
+            "Content-Type": "application/json",
+        },
+    )
+
+
+def test_map_loads_once_then_picks_up_changes_incrementally(app):
+    app.config["ROUTING_REFRESH_INTERVAL"] = 0
+    alice, bob = _user("alice"), _user("bob")
+    repo_routing.subscribe(alice, REPOSITORY_ID, "acme/platform")
+
+    assert [r.SECRET_GITHUB_id for r in repo_routing.targets(REPOSITORY_ID)] == [
+        "alice"
+    ]
+
+    # Written by another process: only visible through the refresh.
+    db.session.add(
+        RepositorySubscription(
+            repository_id=REPOSITORY_ID, user_id=bob.id, settings={"branches": ["main"]}
+        )
+    )
+    db.session.commit()
+    routes = repo_routing.targets(REPOSITORY_ID)
+    assert {r.SECRET_GITHUB_id for r in routes} == {"alice", "bob"}
+    assert [r.settings for r in routes if r.user_id == bob.id] == [
+        {"branches": ["main"]}
+    ]
+
+    subscription = RepositorySubscription.query.filter_by(user_id=bob.id).one()
+    subscription.active = False
+    subscription.updated_at = utcnow() + timedelta(seconds=1)
+    db.session.commit()
+    assert [r.SECRET_GITHUB_id for r in repo_routing.targets(REPOSITORY_ID)] == [
+        "alice"
+    ]
+
+
+def test_map_is_not_reloaded_within_the_interval(app):
+    app.config["ROUTING_REFRESH_INTERVAL"] = 3600
+    alice = _user("alice")
+    assert repo_routing.targets(REPOSITORY_ID) == ()
+
+    db.session.add(
+        RepositorySubscription(repository_id=REPOSITORY_ID, user_id=alice.id)
+    )
+    db.session.commit()
+
+    with patch.object(db.session, "query") as query:
+        assert repo_routing.targets(REPOSITORY_ID) == ()
+    query.assert_not_called()
+
+
+def test_warm_loads_the_map_before_the_first_webhook(app):
+    app.config["ROUTING_REFRESH_INTERVAL"] = 3600
+    repo_routing.subscribe(_user("alice"), REPOSITORY_ID)
+    repo_routing.clear()
+
+    repo_routing.warm(app)
+
+    with patch.object(db.session, "query") as query:
+        routes = repo_routing.targets(REPOSITORY_ID)
+    query.assert_not_called()
+    assert [r.SECRET_GITHUB_id for r in routes] == ["alice"]
+
+
+@patch("backend.routes.verifyGITHUB_signature", return_value=True)
+def test_push_fans_out_to_every_subscriber(mock_verify, app, client):
+    app.config["WEBHOOK_ASYNC"] = True
+    for name in ("alice", "bob"):
+        repo_routing.subscribe(_user(name), REPOSITORY_ID, "acme/platform")
+
+    response = _push(client)
+
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body["status"] == "fanned_out"
+    assert sorted((d["user"], d["status"]) for d in body["deliveries"]) == [
+        ("alice", "queued"),
+        ("bob", "queued"),
+    ]
+    assert GitHubEvent.query.count() == 2
+    assert Job.query.filter_by(kind="post_event").count() == 2
+
+    # A redelivery is redundant for each subscriber.
+    redelivered = _push(client).get_json()["deliveries"]
+    assert {d["message"] for d in redelivered} == {"Redundant event"}
+    assert GitHubEvent.query.count() == 2
+
+
+@patch("backend.routes.verifyGITHUB_signature", return_value=True)
+def test_branch_setting_filters_pushes(mock_verify, app, client):
+    app.config["WEBHOOK_ASYNC"] = True
+    repo_routing.subscribe(
+        _user("alice"), REPOSITORY_ID, settings={"branches": ["main"]}
+    )
+
+    response = _push(client, ref="refs/heads/experiment")
+
+    assert response.status_code == 200
+    assert response.get_json() == {"message": "No subscriber for this push"}
+    assert GitHubEvent.query.count() == 0
+
+    assert _push(client, ref="refs/heads/main").get_json()["status"] == "queued"
+
+
+@patch("backend.routes.verifyGITHUB_signature", return_value=True)
+def test_owner_keeps_receiving_alongside_subscribers(mock_verify, app, client):
+    app.config["WEBHOOK_ASYNC"] = True
+    _user("owner")
+    repo_routing.subscribe(
+        _user("alice"), REPOSITORY_ID, settings={"branches": ["main"]}
+    )
+
+    body = _push(client, owner="owner").get_json()
+    assert sorted(d["user"] for d in body["deliveries"]) == ["alice", "owner"]
+
+    # The owner is not subject to a subscriber's branch filter.
+    response = _push(client, ref="refs/heads/experiment", sha="b" * 40, owner="owner")
+    assert response.get_json()["status"] == "queued"
+    assert GitHubEvent.query.count() == 3
+
+
+def test_subscription_api(client):
+    _user("alice")
+    client.set_cookie("SECRET_GITHUB_user_id", "alice")
+    url = f"/api/github/alice/subscriptions/{REPOSITORY_ID}"
+
+    response = client.put(
+        url, json={"repo_full_name": "acme/platform", "settings": {"branches": "main"}}
+    )
+    assert response.status_code == 400
+
+    with _github() as github:
+        response = client.put(
+            url,
+            json={"repo_full_name": "spoofed/name", "settings": {"branches": ["main"]}},
+        )
+    assert response.status_code == 200
+    assert github.call_args.args[0].endswith(f"/repositories/{REPOSITORY_ID}")
+    assert github.call_args.kwargs["headers"]["Authorization"] == "token gh"
+    assert response.get_json()["settings"] == {"branches": ["main"]}
+    listed = client.get("/api/github/alice/subscriptions").get_json()
+    assert [s["repo_full_name"] for s in listed["subscriptions"]] == ["acme/platform"]
+
+    assert client.delete(url).status_code == 204
+    assert client.delete(url).status_code == 404
+    assert repo_routing.targets(REPOSITORY_ID) == ()
+    assert client.get("/api/github/alice/subscriptions").get_json() == {
+        "subscriptions": []
+    }
+
+
+def test_subscribing_requires_access_on_github(client):
+    _user("mallory")
+    client.set_cookie("SECRET_GITHUB_user_id", "mallory")
+
+    with _github(status=404):
+        response = client.put(f"/api/github/mallory/subscriptions/{REPOSITORY_ID}")
+
+    assert response.status_code == 403
+    assert RepositorySubscription.query.count() == 0
+    assert repo_routing.targets(REPOSITORY_ID) == ()
@@ -0,0 +1,145 @@
+import json
+from datetime import timedelta
+from unittest.mock import patch
+
+import pytest
+
+from backend.models import db, GitHubEvent, Job, User, utcnow
+from backend.services.job_queue import claim_next, run_job
+from backend.services.retry import (
+    compute_backoff,
+    dispatch_due_retries,
+    schedule_retry,
+)
+
+
+@pytest.fixture
+def retry_user(app):
+    user = User(
+        SECRET_GITHUB_id="retryuser",
+        SECRET_GITHUB_TOKEN="gh_token",
+        linkedin_token="li_token",
+        linkedin_id="123456789",
+    )
+    db.session.add(user)
+    db.session.commit()
+    return user
+
+
+def _add_event(user, **kwargs):
+    event = GitHubEvent(
+        user_id=user.id, repo_name="retry-repo", commit_message="Retry me", **kwargs
+    )
+    db.session.add(event)
+    db.session.commit()
+    return event
+
+
+def test_compute_backoff_grows_exponentially_up_to_the_cap(app):
+    for _ in range(50):
+        assert 10 <= compute_backoff(1, base=10, cap=100) <= 10
+        assert 10 <= compute_backoff(3, base=10, cap=100) <= 40
+        assert 10 <= compute_backoff(10, base=10, cap=100) <= 100
+
+
+def test_schedule_retry_moves_event_to_dead_after_max_attempts(app, retry_user):
+    app.config["RETRY_MAX_ATTEMPTS"] = 2
+    event = _add_event(retry_user)
+
+    assert schedule_retry(event, ValueError("boom")) > utcnow()
+    assert event.status == "retrying"
+    assert schedule_retry(event, ValueError("boom again")) is None
+    assert event.status == "dead"
+    assert event.attempts == 2
+    assert event.last_error == "boom again"
+
+
+def test_schedule_retry_gives_up_on_old_events(app, retry_user):
+    app.config["RETRY_MAX_AGE_SECONDS"] = 60
+    event = _add_event(retry_user, timestamp=utcnow() - timedelta(minutes=5))
+
+    assert schedule_retry(event, "stale") is None
+    assert event.status == "dead"
+
+
+def test_dispatch_due_retries_requeues_only_due_events(app, retry_user):
+    payload = {"repository": {"name": "retry-repo"}}
+    due = _add_event(
+        retry_user,
+        status="retrying",
+        next_attempt_at=utcnow() - timedelta(seconds=1),
+        retry_payload=payload,
+    )
+    later = _add_event(
+        retry_user, status="retrying", next_attempt_at=utcnow() + timedelta(hours=1)
+    )
+
+    assert dispatch_due_retries() == 1
+    assert dispatch_due_retries() == 0
+
+    assert db.session.get(GitHubEvent, due.id).status == "pending"
+    assert db.session.get(GitHubEvent, later.id).status == "retrying"
+    job = Job.query.filter_by(event_id=due.id, status="queued").one()
+    assert job.payload == payload
+
+
+@patch("backend.services.job_queue.send_post_to_linkedin")
+def test_failed_job_schedules_a_retry(mock_send, app, retry_user):
+    mock_send.side_effect = ValueError("Failed to post to LinkedIn: 503")
+    event = _add_event(retry_user)
+    db.session.add(Job(kind="post_event", payload={}, event_id=event.id))
+    db.session.commit()
+
+    run_job(claim_next("test-worker"))
+
+    event = db.session.get(GitHubEvent, event.id)
+    assert event.status == "retrying"
+    assert event.attempts == 1
+    assert event.next_attempt_at > utcnow()
+    assert event.retry_payload == {}
+    assert Job.query.filter_by(event_id=event.id).one().status == "failed"
+
+
+@patch("backend.routes.verifyGITHUB_signature", return_value=True)
+def test_webhook_failure_is_persisted_for_retry(
+    mock_verify, app, client, retry_user, patch_post_to_linkedin
+):
+    patch_post_to_linkedin.side_effect = ValueError("Failed to post to LinkedIn: 500")
+    payload = {
+        "repository": {"name": "retry-repo", "owner": {"id": "retryuser"}},
+        "head_commit": {
+            "id": "0badc0de",
+            "message": "Retry me",
+            "url": "https://github.com/retryuser/retry-repo/commit/0badc0de",
+            "author": {"name": "Retry User"},
+        },
+    }
+
+    with patch("time.sleep") as mock_sleep:
+        response = client.post(
+            "/webhook/github",
+            data=json.dumps(payload),
+            headers={
+                "X-Hub-Signature-256": "sha256=ignored",
+                "X-GitHub-Event": "push",
+                "Content-Type": "application/json",
+            },
+        )
+
+    assert response.status_code == 202, response.data
+    assert response.get_json()["status"] == "retrying"
+    mock_sleep.assert_not_called()
+
+    event = db.session.get(GitHubEvent, response.get_json()["event_id"])
+    assert event.status == "retrying"
+    assert "500" in event.last_error
+    assert event.retry_payload["head_commit"]["author"] == {"name": "Retry User"}
+    # No job ran, so none is recorded until the retry is dispatched.
+    assert Job.query.count() == 0
+
+    event.next_attempt_at = utcnow() - timedelta(seconds=1)
+    db.session.commit()
+    assert dispatch_due_retries() == 1
+    job = Job.query.filter_by(event_id=event.id).one()
+    assert job.status == "queued"
+    assert job.payload["head_commit"]["author"] == {"name": "Retry User"}
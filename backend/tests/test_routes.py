@@ -54,8 +54,8 @@ def test_linkedin_auth_redirect(client):
     assert "https://www.linkedin.com/oauth/v2/authorization" in response.location
 
 
-@patch("requests.get")
-@patch("requests.post")
+@patch("backend.services.http_client.get")
+@patch("backend.services.http_client.post")
 def test_linkedin_callback_success(mock_post, mock_get, client):
     """Test LinkedIn OAuth callback"""
     # Mock token exchange
@@ -189,8 +189,8 @@ def testGITHUB_status_returns_user_info(client):
     }
 
 
-@patch("requests.post")
-@patch("requests.get")
+@patch("backend.services.http_client.post")
+@patch("backend.services.http_client.get")
 def testGITHUB_login_redirect(mock_get, mock_post, client):
     """Test that the GitHub login route redirects to GitHub's OAuth URL."""
     response = client.get("/auth/github")
@@ -201,8 +201,8 @@ def testGITHUB_login_redirect(mock_get, mock_post, client):
     assert "scope=repo" in response.location
 
 
-@patch("requests.post")
-@patch("requests.get")
+@patch("backend.services.http_client.post")
+@patch("backend.services.http_client.get")
 def testGITHUB_callback_valid_code(mock_get, mock_post, client, app):
     """Test that the GitHub callback route handles a valid code."""
     # Mock token exchange response
@@ -231,7 +231,7 @@ def testGITHUB_callback_valid_code(mock_get, mock_post, client, app):
         assert user.SECRET_GITHUB_TOKEN == "mocked_token"
 
 
-@patch("requests.post")
+@patch("backend.services.http_client.post")
 def testGITHUB_callback_invalid_code(mock_post, client):
     """Test that the GitHub callback route handles an invalid code."""
     # Mock token exchange failure
@@ -243,8 +243,8 @@ def testGITHUB_callback_invalid_code(mock_post, client):
     assert "Failed to obtain GitHub access token" in response.get_data(as_text=True)
 
 
-@patch("requests.post")
-@patch("requests.get")
+@patch("backend.services.http_client.post")
+@patch("backend.services.http_client.get")
 def testGITHUB_callback_duplicate_user(mock_get, mock_post, client, app):
     """Test that the GitHub callback route handles duplicate users."""
     # Mock token exchange response
@@ -0,0 +1,91 @@
+import json
+
+import pytest
+from sqlalchemy import literal, select
+
+from backend.models import db
+from backend.services import tagger
+from backend.services.post_generator import generate_digest_post
+from backend.services.tagger import Tagger
+
+RULES = {
+    "#feature": {"conventional": ["feat"]},
+    "#bugfix": {"keywords": ["fix", "bug"], "conventional": ["fix"]},
+    "#perf": {"patterns": [r"\bspeed(?:s|ed)? up\b", r"\bfaster\b"]},
+    "#docs": {"conventional": ["docs"]},
+}
+
+
+def test_default_rules_match_original_substring_tagging():
+    t = Tagger(tagger.DEFAULT_TAG_RULES)
+
+    assert t.tag("Hotfix: REFACTOR the latest tests") == [
+        "#bugfix",
+        "#refactor",
+        "#testing",
+    ]
+    assert t.tag("Add feature") == []
+    assert t.tag("") == []
+
+
+def test_keywords_are_found_when_they_overlap():
+    t = Tagger(
+        {
+            "#a": {"keywords": ["test", "xtes"]},
+            "#b": {"keywords": ["testing"]},
+            "#c": {"keywords": ["fix"]},
+        }
+    )
+
+    # "fixtesting" holds fix, xtes, test and testing, each overlapping another.
+    assert t.tag("FIXTESTING") == ["#a", "#b", "#c"]
+    assert t.tag("testing") == ["#a", "#b"]
+    assert t.tag("tes") == []
+
+
+def test_empty_keywords_are_rejected():
+    with pytest.raises(ValueError):
+        Tagger({"#all": {"keywords": [""]}})
+
+
+def test_conventional_prefixes_keywords_and_patterns():
+    t = Tagger(RULES)
+
+    assert t.tag("feat(api)!: make uploads faster") == ["#feature", "#perf"]
+    assert t.tag("docs: explain bug triage") == ["#bugfix", "#docs"]
+    # Conventional types only count as a prefix at the start of the message.
+    assert t.tag("update docs: wording") == []
+    assert t.tag("Speeds up the worker") == ["#perf"]
+
+
+def test_sql_conditions_match_like_the_tagger(app):
+    t = Tagger(RULES)
+    messages = ["feat(api)!: add X", "Fix 50% of bugs", "docs: typo", "speed up", "x"]
+    for message in messages:
+        conditions = t.sql_conditions(literal(message))
+        row = db.session.execute(select(*conditions.values())).one()
+        found = {tag for tag, matched in zip(conditions, row) if matched}
+        # Pattern-only tags have no SQL form.
+        assert found == set(t.tag(message)) - {"#perf"}
+
+
+def test_patterns_with_capturing_groups_are_rejected():
+    with pytest.raises(ValueError):
+        Tagger({"#perf": {"patterns": [r"(fast|quick)"]}})
+
+
+def test_digest_uses_configured_rules(app, tmp_path):
+    path = tmp_path / "tags.json"
+    path.write_text(json.dumps(RULES))
+    app.config["TAG_RULES_FILE"] = str(path)
+
+    result = generate_digest_post(
+        [
+            {"message": "feat: new digest", "repository": {"name": "repo1"}},
+            {"message": "fix: typo", "repository": {"name": "repo1"}},
+        ],
+        return_as_string=False,
+    )
+
+    assert result["repo1"]["tags"] == ["#feature", "#bugfix"]
+    assert tagger.get_tagger() is tagger.get_tagger()
@@ -0,0 +1,77 @@
+from unittest.mock import patch
+
+from backend.models import db, User
+from backend.services import user_cache
+
+
+def _add_user(**kwargs):
+    user = User(
+        SECRET_GITHUB_id="cacheuser",
+        SECRET_GITHUB_username="cacheuser",
+        SECRET_GITHUB_TOKEN="gh_token",
+        **kwargs,
+    )
+    db.session.add(user)
+    db.session.commit()
+    return user
+
+
+def test_get_user_is_served_from_cache_after_first_lookup(app):
+    _add_user(linkedin_token="li_token", linkedin_id="123")
+
+    first = user_cache.get_user("cacheuser")
+    with patch.object(User, "query") as mock_query:
+        second = user_cache.get_user("cacheuser")
+        mock_query.filter_by.assert_not_called()
+
+    assert second is first
+    assert second.has_valid_linkedin_token()
+    assert not hasattr(second, "linkedin_token")
+    assert user_cache.stats() == {"hits": 1, "misses": 1, "size": 1}
+
+
+def test_missing_users_are_not_cached(app):
+    assert user_cache.get_user("cacheuser") is None
+    _add_user()
+
+    assert user_cache.get_user("cacheuser") is not None
+
+
+def test_entries_expire_after_ttl(app, monkeypatch):
+    _add_user()
+    monkeypatch.setattr(user_cache._cache, "ttl", 0)
+
+    user_cache.get_user("cacheuser")
+    user_cache.get_user("cacheuser")
+
+    assert user_cache.stats()["hits"] == 0
+    assert user_cache.stats()["misses"] == 2
+
+
+def test_lru_evicts_least_recently_used():
+    cache = user_cache.TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == (1, 3)
+
+
+def test_link_linkedin_account_invalidates_cached_user(app, client):
+    _add_user()
+    client.set_cookie("SECRET_GITHUB_user_id", "cacheuser")
+
+    status = client.get("/api/github/cacheuser/status").get_json()
+    assert status["linked"] is False
+
+    response = client.post(
+        "/api/github/cacheuser/link_linkedin",
+        json={"linkedin_token": "li_token", "linkedin_id": "123"},
+    )
+    assert response.status_code == 200
+
+    status = client.get("/api/github/cacheuser/status").get_json()
+    assert status["linked"] is True
+    assert status["linkedin_id"] == "123"
@@ -0,0 +1,136 @@
+import io
+import json
+import hmac
+import hashlib
+from unittest.mock import patch
+
+import pytest
+
+from backend.services import verify_signature
+from backend.services.verify_signature import (
+    PayloadTooLarge,
+    read_signed_body,
+    verifyGITHUB_signature,
+)
+
+BODY = json.dumps({"zen": "Keep it logically awesome.", "pad": "x" * 5000}).encode()
+
+
+def _signature(body, secret="test-secret"):
+    return "sha256=" + hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+
+
+def _post(client, event="push", body=BODY, **headers):
+    return client.post(
+        "/webhook/github",
+        data=body,
+        headers={
+            "Content-Type": "application/json",
+            "X-GitHub-Event": event,
+            "X-Hub-Signature-256": "sha256=ignored",
+            **headers,
+        },
+    )
+
+
+@pytest.mark.parametrize("event", ["star", "issues", "workflow_run"])
+def test_unsupported_event_is_rejected_before_reading_body(client, event):
+    with patch("backend.routes.read_signed_body") as read, patch(
+        "backend.routes.verifyGITHUB_signature"
+    ) as verify:
+        response = _post(client, event=event)
+
+    assert response.status_code == 400
+    assert response.get_json() == {"error": "Unsupported event type"}
+    read.assert_not_called()
+    verify.assert_not_called()
+
+
+def test_oversized_content_length_is_rejected(app, client):
+    app.config["WEBHOOK_MAX_CONTENT_LENGTH"] = 1024
+
+    with patch("backend.routes.read_signed_body") as read:
+        response = _post(client)
+
+    assert response.status_code == 413
+    read.assert_not_called()
+
+
+@patch("backend.routes.verifyGITHUB_signature", return_value=False)
+def test_only_allowed_hook_ids_are_verified(mock_verify, app, client):
+    app.config["WEBHOOK_ALLOWED_HOOK_IDS"] = "101, 202"
+
+    assert _post(client, **{"X-GitHub-Hook-ID": "303"}).status_code == 403
+    mock_verify.assert_not_called()
+
+    # An allowed hook gets as far as the signature check.
+    assert _post(client, **{"X-GitHub-Hook-ID": "202"}).status_code == 403
+    mock_verify.assert_called_once()
+
+
+def test_missing_signature_is_checked_before_event_type(client):
+    response = client.post(
+        "/webhook/github", data=BODY, headers={"Content-Type": "application/json"}
+    )
+
+    assert response.status_code == 403
+
+
+def test_streamed_hmac_matches_whole_body(monkeypatch):
+    monkeypatch.setenv("SECRET_GITHUB_WEBHOOK_SECRET", "test-secret")
+
+    body = read_signed_body(io.BytesIO(BODY), len(BODY), chunk_size=1000)
+
+    assert bytes(body.data) == BODY
+    assert verifyGITHUB_signature(body, _signature(BODY))
+    assert not verifyGITHUB_signature(body, _signature(BODY, "other"))
+
+
+def test_body_without_length_is_read_to_eof_within_limit(monkeypatch):
+    monkeypatch.setenv("SECRET_GITHUB_WEBHOOK_SECRET", "test-secret")
+
+    body = read_signed_body(io.BytesIO(BODY), chunk_size=1000)
+    assert verifyGITHUB_signature(body, _signature(BODY))
+
+    with pytest.raises(PayloadTooLarge):
+        read_signed_body(io.BytesIO(BODY), max_length=2000, chunk_size=1000)
+
+
+def test_signed_request_reaches_the_handler(monkeypatch, client):
+    monkeypatch.setenv("SECRET_GITHUB_WEBHOOK_SECRET", "test-secret")
+
+    response = _post(
+        client,
+        event="pull_request",
+        **{"X-Hub-Signature-256": _signature(BODY)},
+    )
+
+    assert response.status_code == 204
+
+
+def test_rotation_accepts_every_active_secret_and_reports_the_key(monkeypatch):
+    monkeypatch.setenv("SECRET_GITHUB_WEBHOOK_SECRET", "new-secret")
+    monkeypatch.setenv("SECRET_GITHUB_WEBHOOK_SECRETS", "old-secret, new-secret")
+    new_id, old_id = verify_signature.keyring().key_ids
+
+    for secret, expected in (("new-secret", new_id), ("old-secret", old_id)):
+        body = read_signed_body(io.BytesIO(BODY), len(BODY))
+        assert verifyGITHUB_signature(body, _signature(BODY, secret))
+        assert body.key_id == expected
+        signature = _signature(BODY, secret)
+        assert verify_signature.match_signature(BODY, signature) == expected
+
+    assert verify_signature.match_signature(BODY, _signature(BODY, "retired")) is None
+    assert verify_signature.match_signature(BODY, "sha1=" + "0" * 40) is None
+
+
+def test_secrets_are_loaded_once(monkeypatch):
+    monkeypatch.setenv("SECRET_GITHUB_WEBHOOK_SECRET", "test-secret")
+    keys = verify_signature.keyring()
+
+    monkeypatch.setenv("SECRET_GITHUB_WEBHOOK_SECRET", "changed")
+    assert verify_signature.keyring() is keys
+    assert verifyGITHUB_signature(BODY, _signature(BODY))
+
+    verify_signature.reset()
+    assert not verifyGITHUB_signature(BODY, _signature(BODY))
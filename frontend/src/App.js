@@ -8,7 +8,7 @@ import Cookies from "js-cookie"; // Install with `npm install js-cookie`
 import CryptoJS from "crypto-js"; // Install with `npm install crypto-js`
 import AuthSection from "./components/AuthSection";
 import CommitActions from "./components/CommitActions";
-import { previewLinkedInDigest } from "./apiService"; // Import the digest preview function
+import { fetchGitHubCommits, previewLinkedInDigest } from "./apiService";
 const SECRET_KEY = "your-secure-key"; // Replace with a securely managed key
 
 function App() {
@@ -59,15 +59,10 @@ function App() {
         })
         .catch((err) => console.error("Error fetching user status:", err)); // Debug log
 
-      fetch(`/api/github/${githubUserIdFromCookie}/commits`)
-        .then((res) => res.json())
-        .then((data) => {
-          console.log("Fetched commits:", data.commits); // Debug log
-          if (data.commits) {
-            setCommits(data.commits);
-          } else {
-            console.error("No commits found:", data); // Debug log
-          }
+      fetchGitHubCommits(githubUserIdFromCookie)
+        .then((fetched) => {
+          console.log("Fetched commits:", fetched); // Debug log
+          setCommits(fetched);
         })
         .catch((err) => console.error("Error fetching commits:", err)); // Debug log
     } else {
@@ -108,15 +103,10 @@ function App() {
         })
         .catch((err) => console.error("Error fetching user status:", err)); // Debug log;
 
-      fetch(`/api/github/${storedId}/commits`)
-        .then((res) => res.json())
-        .then((data) => {
-          console.log("Fetched commits:", data.commits); // Debug log
-          if (data.commits) {
-            setCommits(data.commits);
-          } else {
-            console.error("No unposted commits found:", data); // Debug log
-          }
+      fetchGitHubCommits(storedId)
+        .then((fetched) => {
+          console.log("Fetched commits:", fetched); // Debug log
+          setCommits(fetched);
         })
         .catch((err) => console.error("Error fetching commits:", err)); // Debug log
     }
@@ -12,10 +12,19 @@ export const fetchGitHubStatus = async (userId) => {
   }
 };
 
+// Follows `next_cursor` until the last page, so every commit is returned.
 export const fetchGitHubCommits = async (userId) => {
   try {
-    const response = await axios.get(`${API_BASE_URL}/${userId}/commits`);
-    return response.data.commits;
+    const commits = [];
+    let cursor = null;
+    do {
+      const response = await axios.get(`${API_BASE_URL}/${userId}/commits`, {
+        params: { limit: 200, ...(cursor && { cursor }) },
+      });
+      commits.push(...response.data.commits);
+      cursor = response.data.next_cursor;
+    } while (cursor);
+    return commits;
   } catch (error) {
     console.error("Error fetching GitHub commits:", error);
     throw error;
@@ -1,5 +1,11 @@
 # wsgi.py
 
 from backend.app import create_app
+from backend.services import repo_routing
 
 app = create_app()
+
+# Only the web server routes webhooks; CLI commands (``flask db upgrade``,
+# the worker) build the app without touching the routing map.
+if app.config.get("ROUTING_WARM_ON_START"):
+    repo_routing.warm(app)